@@ -0,0 +1,113 @@
+"""
+快取壓縮編碼效能比較
+
+比較原始資料與 CacheCodec 壓縮編碼的快取文件：BSON 文件大小、依學生數推估的 MongoDB 工作集大小，
+以及寫入（序列化為 BSON）與讀取（自 BSON 還原）的 CPU 時間。
+
+使用方式（於專案根目錄）:
+    python -m benchmarks.cache_codec_benchmark [學生數]
+"""
+import json
+import sys
+import time
+
+import bson
+
+from src.utils.cache_codec import CacheCodec
+
+CODEC = CacheCodec(["timetable", "graduation"])
+
+
+def make_timetable():
+    return {
+        "type": 1,
+        "name": "王小明",
+        "academicYear": 113,
+        "semester": "1",
+        "updateDate": "2024/09/01",
+        "departmentId": "CS",
+        "deptTitleShort": "資工系",
+        "deptTitle": "資訊工程學系",
+        "schoolSystemId": "B",
+        "schoolSystemTitle": "大學日間部",
+        "schedule": [
+            {
+                "scheduleName": f"資料結構與演算法 {n}",
+                "abbScheduleName": f"資結 {n}",
+                "courseId": f"{n:06d}",
+                "courseCode": f"CS{n:04d}",
+                "week": n % 5 + 1,
+                "period": n % 9 + 1,
+                "classroom": f"行政大樓 {n % 7 + 1}0{n % 4 + 1}",
+                "teacher": [{"id": f"T{n % 11:03d}", "name": "陳大文"}],
+            }
+            for n in range(30)
+        ],
+    }
+
+
+def make_graduation():
+    return {
+        "data": [
+            {
+                "id": f"{n:05d}",
+                "title": f"通識教育核心課程 {n}",
+                "score": str(60 + n % 40),
+                "issuer": "通識教育中心",
+                "t": {"smye": 110 + n % 4, "smty": n % 2 + 1},
+            }
+            for n in range(80)
+        ],
+        "passable": {"title": "畢業學分審核", "result": "尚未通過"},
+    }
+
+
+def make_document(collection_name, data):
+    stored, codec = CODEC.encode(collection_name, data)
+    return {"_id": "f1000000", "updated_timestamp": 1700000000, "cache_duration": 259200, "codec": codec, "data": stored}
+
+
+def raw_write(collection_name, data):
+    return bson.encode(make_document("raw", json.loads(json.dumps(data))))
+
+
+def encoded_write(collection_name, data):
+    return bson.encode(make_document(collection_name, data))
+
+
+def read(collection_name, payload):
+    return CODEC.decode(bson.decode(payload))["data"]
+
+
+def measure(func, *args, rounds: int = 200):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    for collection_name, data in (("timetable", make_timetable()), ("graduation", make_graduation())):
+        raw = raw_write(collection_name, data)
+        encoded = encoded_write(collection_name, data)
+
+        # 編碼不得改變資料內容
+        assert read(collection_name, encoded) == read(collection_name, raw) == json.loads(json.dumps(data))
+
+        print(f"{collection_name}, best of 200 rounds")
+        print(f"  document size      raw {len(raw):8d} B   encoded {len(encoded):8d} B   "
+              f"({len(encoded) / len(raw):.1%})")
+        print(f"  working set ({students} students)  raw {len(raw) * students / 2 ** 20:8.1f} MiB   "
+              f"encoded {len(encoded) * students / 2 ** 20:8.1f} MiB")
+        print(f"  write              raw {measure(raw_write, collection_name, data) * 1e6:8.1f} us   "
+              f"encoded {measure(encoded_write, collection_name, data) * 1e6:8.1f} us")
+        print(f"  read               raw {measure(read, collection_name, raw) * 1e6:8.1f} us   "
+              f"encoded {measure(read, collection_name, encoded) * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
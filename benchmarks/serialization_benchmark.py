@@ -0,0 +1,115 @@
+"""
+回應序列化效能比較
+
+比較未宣告 response_model 時 FastAPI 使用的 jsonable_encoder 路徑，以及宣告回應模型後由 pydantic-core
+驗證及序列化的路徑（與 FastAPI serialize_response 相同的呼叫方式），另列出直接輸出 JSON 的 model_dump_json 供參考。
+
+使用方式（於專案根目錄）:
+    python -m benchmarks.serialization_benchmark [課程筆數]
+"""
+import json
+import sys
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.models.response_data import DataResponse
+from src.models.student import CourseAttendance, DormRecord
+
+ATTENDANCE_RESPONSE = TypeAdapter(DataResponse[CourseAttendance])
+DORM_RESPONSE = TypeAdapter(DataResponse[List[DormRecord]])
+
+
+def make_attendance(count: int):
+    return {
+        "year": "113",
+        "sem": "1",
+        "all_data": {
+            "total": {"attend": 120, "late": 2, "leave_early": 0, "absent": 1, "take_leave": 3, "attendence": 96},
+            "course_list": [
+                {
+                    "subject_code": f"CS{n:04d}",
+                    "subject_name": f"課程 {n}",
+                    "attend": 16,
+                    "late": n % 2,
+                    "leave_early": 0,
+                    "absent": n % 3,
+                    "take_leave": 1,
+                    "attendence": 94,
+                    "detail": {
+                        "sum_roll_call": 18,
+                        "data": [
+                            {"date": f"2024/09/{day + 1:02d}", "day": day % 7 + 1, "period": day % 9 + 1, "attend_state": 1}
+                            for day in range(18)
+                        ]
+                    }
+                }
+                for n in range(count)
+            ]
+        }
+    }
+
+
+def make_dorm(count: int):
+    return [
+        {
+            "dorm_space": "學一宿舍",
+            "dorm_id": f"{n:04d}-A",
+            "dorm_no": 4,
+            "dorm_money": 12000,
+            "t": {"smye": 100 + n % 14, "smty": n % 2 + 1}
+        }
+        for n in range(count)
+    ]
+
+
+def encoder_path(content, adapter):
+    return json.dumps(jsonable_encoder(content))
+
+
+def response_model_path(content, adapter):
+    value = adapter.validate_python(content)
+    return json.dumps(adapter.dump_python(value, mode="json", exclude_unset=True, by_alias=True))
+
+
+def dump_json_path(content, adapter):
+    value = adapter.validate_python(content)
+    return adapter.dump_json(value, exclude_unset=True, by_alias=True)
+
+
+def measure(func, content, adapter, rounds: int = 50):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(content, adapter)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    payloads = (
+        (f"attendance ({count} courses)", {"data": make_attendance(count)}, ATTENDANCE_RESPONSE),
+        (f"dorm ({count} records)", {"data": make_dorm(count)}, DORM_RESPONSE),
+    )
+    candidates = (
+        ("jsonable_encoder", encoder_path),
+        ("response_model", response_model_path),
+        ("model dump_json", dump_json_path),
+    )
+
+    for title, content, adapter in payloads:
+        # 回應模型不得改變輸出內容
+        assert json.loads(encoder_path(content, adapter)) == json.loads(response_model_path(content, adapter))
+
+        print(f"{title}, best of 50 rounds")
+        for name, func in candidates:
+            elapsed = measure(func, content, adapter)
+            print(f"  {name:<18} {elapsed * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
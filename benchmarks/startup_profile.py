@@ -0,0 +1,161 @@
+"""
+啟動時間分析
+
+以 python -X importtime 於新行程匯入 src.app，依套件彙總匯入時間並列出累計耗時最多的模組；
+再於另一個新行程匯入應用程式並直接送出第一個請求（不執行 lifespan，不連線 MongoDB），量測至首個回應的時間。
+
+使用方式（於專案根目錄）:
+    python -m benchmarks.startup_profile [列出模組數]
+"""
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 延後至第一次使用才載入的模組，匯入 src.app 後不應已載入
+DEFERRED_MODULES = (
+    "jinja2",
+    "sis.course.leave.modals.leave_form_data.course_leave_form_data",
+    "sis.modals.course",
+)
+
+# import time: self [us] | cumulative | imported package
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+FIRST_REQUEST = """
+import asyncio
+import time
+
+started = time.perf_counter()
+from src.app import app
+imported = time.perf_counter()
+
+
+async def first_request():
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8000),
+    }, receive, send)
+
+    return messages[0]["status"]
+
+
+status = asyncio.run(first_request())
+responded = time.perf_counter()
+print(imported - started, responded - imported, status)
+"""
+
+
+def profile_imports():
+    """
+    Returns:
+        (依頂層套件彙總的自身匯入時間, [(累計時間, 模組)])，單位為微秒
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.app"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    packages = defaultdict(int)
+    modules = []
+
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if not match:
+            continue
+
+        own, cumulative, _, module = match.groups()
+        packages[module.split(".")[0]] += int(own)
+        modules.append((int(cumulative), module))
+
+    return packages, sorted(modules, reverse=True)
+
+
+def profile_first_request():
+    """
+    Returns:
+        (匯入秒數, 第一個請求秒數, 回應狀態碼)
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imported, responded, status = result.stdout.split()
+
+    return float(imported), float(responded), int(status)
+
+
+def loaded_deferred_modules():
+    """
+    Returns:
+        匯入 src.app 後已被載入的延後載入模組
+    """
+    result = subprocess.run(
+        [
+            sys.executable, "-c",
+            f"import sys, src.app; print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    return result.stdout.split()
+
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    packages, modules = profile_imports()
+    total = sum(packages.values())
+
+    print(f"import src.app: {total / 1000:.1f} ms (self time, summed)")
+    print("by package:")
+    for package, elapsed in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {package:<24} {elapsed / 1000:8.1f} ms  {elapsed / total:6.1%}")
+
+    print(f"top {top} modules by cumulative time:")
+    for elapsed, module in modules[:top]:
+        print(f"  {module:<48} {elapsed / 1000:8.1f} ms")
+
+    loaded = loaded_deferred_modules()
+    if loaded:
+        print(f"deferred modules already loaded by import src.app: {', '.join(loaded)}")
+    else:
+        print("deferred modules: none loaded by import src.app")
+
+    imported, responded, status = profile_first_request()
+    print(f"time to first request: {(imported + responded) * 1000:.1f} ms "
+          f"(import {imported * 1000:.1f} ms, first request {responded * 1000:.1f} ms, status {status})")
+
+
+if __name__ == "__main__":
+    main()
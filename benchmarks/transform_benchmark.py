@@ -0,0 +1,91 @@
+"""
+紀錄轉換效能比較
+
+比較原本逐筆手寫的 year/sem → t 轉換迴圈、逐筆解讀規格的通用轉換，以及編譯後的 RecordTransformer。
+
+使用方式（於專案根目錄）:
+    python -m benchmarks.transform_benchmark [紀錄筆數]
+"""
+import sys
+import time
+import tracemalloc
+
+from src.utils.transform import RecordTransformer
+
+SCHOLARSHIP_RECORD = RecordTransformer(
+    nest={"t": {"smye": "year", "smty": "sem"}},
+    drops=("ship_pay",)
+)
+
+
+def hand_rolled(data):
+    for i in data:
+        year = i['year']
+        sem = i['sem']
+        del i['sem']
+        del i['year']
+        i['t'] = {
+            "smye": year,
+            "smty": sem
+        }
+        del i['ship_pay']
+    return data
+
+
+def interpreted(data, nest={"t": {"smye": "year", "smty": "sem"}}, drops=("ship_pay",)):
+    for i in data:
+        for target, fields in nest.items():
+            i[target] = {key: i.pop(source) for key, source in fields.items()}
+        for field in drops:
+            i.pop(field, None)
+    return data
+
+
+def make_records(count: int):
+    return [
+        {
+            "ship_name": f"獎學金 {n}",
+            "ship_amount": 5000 + n,
+            "ship_pay": "Y",
+            "year": str(100 + n % 14),
+            "sem": str(n % 2 + 1),
+        }
+        for n in range(count)
+    ]
+
+
+def measure(func, count: int, rounds: int = 20):
+    best = float("inf")
+    for _ in range(rounds):
+        records = make_records(count)
+        started = time.perf_counter()
+        func(records)
+        best = min(best, time.perf_counter() - started)
+
+    records = make_records(count)
+    tracemalloc.start()
+    func(records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    assert hand_rolled(make_records(10)) == SCHOLARSHIP_RECORD(make_records(10))
+
+    print(f"{count} records, best of 20 rounds")
+    candidates = (
+        ("hand-rolled loop", hand_rolled),
+        ("interpreted spec", interpreted),
+        ("RecordTransformer", SCHOLARSHIP_RECORD),
+    )
+    for name, func in candidates:
+        elapsed, peak = measure(func, count)
+        print(f"{name:<20} {elapsed * 1000:8.3f} ms  {elapsed / count * 1e9:8.1f} ns/record  peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
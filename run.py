@@ -1,4 +1,38 @@
+import argparse
+
 import uvicorn
 
+from src.config import settings
+
+APP = "src.app:app"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="啟動 Ohin1 API 伺服器")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="worker 行程數量")
+    parser.add_argument("--reload", action="store_true", help="開發模式，程式碼變更時自動重新載入（單一行程）")
+    args = parser.parse_args()
+
+    if args.reload:
+        uvicorn.run(APP, host=args.host, port=args.port, reload=True)
+        return
+
+    # 於主行程預先載入應用程式，設定或匯入錯誤時於產生 worker 前即失敗
+    from src.app import app
+
+    uvicorn.run(
+        # 單一 worker 直接使用已載入的應用程式；多個 worker 各自於子行程重新載入，
+        # MongoDB 連線及背景工作不可跨行程共用
+        app if args.workers == 1 else APP,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        # 收到 SIGTERM 後停止接受新連線，等待進行中的請求完成後再執行 lifespan 關閉流程
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+
+
 if __name__ == "__main__":
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    main()
@@ -3,14 +3,17 @@ from contextlib import asynccontextmanager
 import fastapi.openapi.utils as fu
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response, RedirectResponse
+from starlette.responses import Response, RedirectResponse, JSONResponse
 from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
-from src.config import TERMS_COOKIE_NAME
-from src.database import init_indexes
-from src.routes import auth, student, leave, pdf, terms
+from src.config import TERMS_COOKIE_NAME, settings
+from src.database import init_indexes, cache_manager, close
+from src.routes import auth, student, leave, pdf, terms, health
+from src.services.refresh_scheduler import refresh_scheduler
 
 
 class CharsetAndAuthMiddleware(BaseHTTPMiddleware):
@@ -36,6 +39,74 @@ class CharsetAndAuthMiddleware(BaseHTTPMiddleware):
 
         return response
 
+class RequestBodyLimitMiddleware:
+    """
+    限制請求本文大小
+
+    於解析本文之前檢查 Content-Length，並於接收串流時累計大小，超過上限即中止接收並回傳 413，
+    避免過大的上傳在被拒絕前已整個緩衝至記憶體。
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+
+            if exceeded:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # 以斷線通知應用程式停止讀取，回應改由下方送出
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+
+            if exceeded and not response_started:
+                return
+
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+
+        if exceeded and not response_started:
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse(
+            {"detail": f"Request body must be less than {self.max_body_size} bytes."},
+            status_code=413
+        )
+        await response(scope, receive, send)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -46,11 +117,30 @@ async def lifespan(app: FastAPI):
     """
     # 啟動時執行
     await init_indexes()
+
+    if cache_manager.invalidation_bus is not None:
+        await cache_manager.invalidation_bus.start()
+
+    if cache_manager.write_behind is not None:
+        cache_manager.write_behind.start()
+
+    if settings.REFRESH_ENABLED:
+        refresh_scheduler.start()
     
     yield
     
     # 關閉時執行
-    # 目前沒有需要清理的資源
+    await refresh_scheduler.stop()
+
+    # 寫入佇列中剩餘的快取，寫入後發出的失效通知由 invalidation_bus 關閉時送出
+    if cache_manager.write_behind is not None:
+        await cache_manager.write_behind.stop(settings.WRITE_BEHIND_SHUTDOWN_TIMEOUT)
+
+    if cache_manager.invalidation_bus is not None:
+        await cache_manager.invalidation_bus.stop()
+
+    # 背景工作皆已停止後才關閉 MongoDB 連線
+    close()
 
 version = "v1"
 des = """
@@ -82,6 +172,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(CharsetAndAuthMiddleware, terms_cookie_name=TERMS_COOKIE_NAME)
+app.add_middleware(RequestBodyLimitMiddleware, max_body_size=settings.MAX_REQUEST_BODY_SIZE)
 
 # 路由註冊
 app.include_router(auth.router, prefix=f"/api/{version}/auth", tags=["Authentication"])
@@ -89,6 +180,7 @@ app.include_router(student.router, prefix=f"/api/{version}/student", tags=["Pers
 app.include_router(leave.router, prefix=f"/api/{version}/leave", tags=["Leave Management"])
 app.include_router(pdf.router, prefix=f"/api/{version}/pdf", tags=["PDF file generation"])
 app.include_router(terms.router, tags=["Terms"])
+app.include_router(health.router, prefix=f"/api/{version}/health", tags=["Health"])
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -1,8 +1,12 @@
 from pathlib import Path
+from typing import Dict, List
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
+from src.models.academic_calendar import CalendarWindow
+from src.models.collection import Collection
+
 # 取得專案根目錄
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -12,9 +16,22 @@ load_dotenv(BASE_DIR / ".env")
 TERMS_COOKIE_NAME = "terms_accepted"
 
 class Settings(BaseSettings):
+    # 伺服器設定（run.py）
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_GRACEFUL_SHUTDOWN_TIMEOUT: int = 30  # 關閉時等待進行中請求完成的秒數
+
     # MongoDB 設定
     MONGODB_URL: str
     DB_NAME: str
+    MONGODB_MAX_POOL_SIZE: int = 100  # 每個伺服器的連線池上限
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int = 300000  # 閒置連線 5 分鐘後關閉
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 5000  # 連線池已滿時等待可用連線的時間
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 5000
+    MONGODB_SOCKET_TIMEOUT_MS: int = 10000
     
     # JWT 設定
     JWT_SECRET_KEY: str
@@ -23,6 +40,151 @@ class Settings(BaseSettings):
     
     # 快取設定
     CACHE_DURATION: int
+    NEGATIVE_CACHE_DURATION: int = 21600  # 上游查無資料時，空結果快取 6 小時
+    ATTENDANCE_CACHE_DURATION: int = 3600  # 出缺勤變動頻繁，快取 1 小時
+    LEAVE_COURSE_CACHE_DURATION: int = 604800  # 學期內每日課程固定，快取 7 天
+    LEAVE_PENDING_CACHE_DURATION: int = 600  # 每日課程的請假狀態（審核中、已請假），快取 10 分鐘
+    LEAVE_HISTORY_CACHE_DURATION: int = 300  # 請假紀錄及詳細資訊，快取 5 分鐘
+
+    # 各節次的上下課時間，供課表索引查詢今日課程及下一堂課
+    TIMETABLE_PERIOD_TIMES: Dict[int, str] = {
+        1: "08:10-09:00",
+        2: "09:10-10:00",
+        3: "10:10-11:00",
+        4: "11:10-12:00",
+        5: "12:10-13:00",
+        6: "13:10-14:00",
+        7: "14:10-15:00",
+        8: "15:10-16:00",
+        9: "16:10-17:00",
+        10: "17:10-18:00",
+        11: "18:30-19:20",
+        12: "19:25-20:15",
+        13: "20:20-21:10",
+        14: "21:15-22:05",
+    }
+
+    # 學年曆快取設定，列出的集合於變動期間使用較短的快取時間，其餘時間較長；過去學期的資料使用極長的快取時間
+    CALENDAR_ENABLED: bool = True
+    CALENDAR_FALL_START: str = "08-01"  # 上學期開始月日
+    CALENDAR_SPRING_START: str = "02-01"  # 下學期開始月日
+    CALENDAR_PAST_SEMESTER_GRACE_DAYS: int = 45  # 下一學期開始 45 天後，前一學期才視為過去學期
+    CALENDAR_WINDOW_CACHE_DURATION: int = 21600  # 變動期間內快取 6 小時
+    CALENDAR_STEADY_CACHE_DURATION: int = 1209600  # 變動期間外最多快取 14 天，且不超過下一個變動期間
+    CALENDAR_PAST_SEMESTER_CACHE_DURATION: int = 31536000  # 過去學期快取 1 年
+    IMMUTABLE_CACHE_MAX_AGE: int = 31536000  # 過去學期的課表、出缺勤及成績回應允許用戶端快取 1 年
+    CALENDAR_WINDOWS: List[CalendarWindow] = [
+        CalendarWindow(
+            name="上學期加退選",
+            start="08-20",
+            end="10-10",
+            collections=[Collection.COURSE_TIMETABLE, Collection.STUDENT_SEMESTER, Collection.PROOF_OF_ENROLLMENT]
+        ),
+        CalendarWindow(
+            name="下學期加退選",
+            start="01-20",
+            end="03-15",
+            collections=[Collection.COURSE_TIMETABLE, Collection.STUDENT_SEMESTER, Collection.PROOF_OF_ENROLLMENT]
+        ),
+        CalendarWindow(
+            name="上學期期中預警",
+            start="10-25",
+            end="12-05",
+            collections=[Collection.COURSE_WARNING]
+        ),
+        CalendarWindow(
+            name="下學期期中預警",
+            start="04-05",
+            end="05-15",
+            collections=[Collection.COURSE_WARNING]
+        ),
+        CalendarWindow(
+            name="上學期成績公布",
+            start="12-20",
+            end="02-20",
+            collections=[Collection.ANNUAL_GRADE, Collection.ANNUAL_GRADE_SEMESTER, Collection.GRADUATION]
+        ),
+        CalendarWindow(
+            name="下學期成績公布",
+            start="06-01",
+            end="07-31",
+            collections=[Collection.ANNUAL_GRADE, Collection.ANNUAL_GRADE_SEMESTER, Collection.GRADUATION]
+        ),
+    ]
+
+    # 以壓縮編碼儲存資料的集合，僅適合整份讀取、不使用分頁的集合
+    CACHE_COMPRESSED_COLLECTIONS: List[Collection] = [
+        Collection.COURSE_TIMETABLE,
+        Collection.COURSE_ATTENDANCE,
+        Collection.GRADUATION,
+        Collection.GRADUATION_WORKPLACE,
+        Collection.GRADUATION_ENGLISH,
+        Collection.GRADUATION_CHINESE,
+        Collection.GRADUATION_COMPUTER,
+    ]
+    CACHE_COMPRESSION_LEVEL: int = 6
+
+    # 行程內 L1 快取設定，多個 worker 間以 cache_invalidations 集合同步失效
+    LOCAL_CACHE_ENABLED: bool = True
+    LOCAL_CACHE_MAX_ENTRIES: int = 5000
+    LOCAL_CACHE_TTL: int = 60  # 漏接失效通知時，過時資料最多存在的時間
+    CACHE_INVALIDATION_COLLECTION_SIZE: int = 1024 * 1024  # capped 集合大小 (bytes)
+
+    # 快取延後寫入設定，快取寫入不佔用回應時間
+    WRITE_BEHIND_ENABLED: bool = True
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 0.5
+    WRITE_BEHIND_BATCH_SIZE: int = 500
+    WRITE_BEHIND_MAX_PENDING: int = 10000  # 佇列已滿時改為直接寫入
+    WRITE_BEHIND_MAX_ATTEMPTS: int = 5  # 同一筆快取連續寫入失敗達此次數即捨棄
+    WRITE_BEHIND_SHUTDOWN_TIMEOUT: float = 10  # 關閉時寫入剩餘快取的時間上限
+
+    # 請求本文大小上限，請假證明上限 2MB 加上表單欄位
+    MAX_REQUEST_BODY_SIZE: int = 3 * 1024 * 1024
+
+    # 上游服務保護設定
+    UPSTREAM_TIMEOUT: float = 15
+    UPSTREAM_MIN_CONCURRENCY: int = 2
+    UPSTREAM_MAX_CONCURRENCY: int = 16
+    UPSTREAM_LATENCY_THRESHOLD: float = 5
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: int = 30
+    SESSION_LIVENESS_FRESHNESS: int = 120  # session 存活紀錄可直接採用的時間
+    SESSION_LIVENESS_MAX_ENTRIES: int = 10000
+
+    # 登入後快取預熱設定
+    WARMUP_ENABLED: bool = False
+    WARMUP_CONCURRENCY: int = 3
+    WARMUP_COLLECTIONS: List[Collection] = [
+        Collection.STUDENT_PROFILE,
+        Collection.STUDENT_SEMESTER,
+        Collection.COURSE_TIMETABLE,
+        Collection.ANNUAL_GRADE,
+        Collection.GRADUATION,
+    ]
+
+    # 校園時區 (Asia/Taipei)，無日光節約時間，以固定時差表示
+    CAMPUS_UTC_OFFSET_HOURS: int = 8
+
+    # 背景批次更新設定
+    REFRESH_ENABLED: bool = False
+    REFRESH_CHECK_INTERVAL: int = 600  # 10 分鐘
+    REFRESH_AHEAD: int = 86400  # 提前更新 1 天內將過期的快取
+    REFRESH_ACTIVE_WINDOW: int = 604800  # 7 天內活躍的學生
+    REFRESH_OFF_PEAK_START_HOUR: int = 1
+    REFRESH_OFF_PEAK_END_HOUR: int = 6
+    REFRESH_RATE_PER_SECOND: float = 2
+    REFRESH_RATE_BURST: int = 5
+    REFRESH_COLLECTIONS: List[Collection] = [
+        Collection.STUDENT_PROFILE,
+        Collection.STUDENT_SEMESTER,
+        Collection.ANNUAL_GRADE,
+        Collection.GRADUATION,
+        Collection.PROOF_OF_ENROLLMENT,
+        Collection.PRINTER_POINTS,
+    ]
+    ACTIVITY_TOUCH_INTERVAL: int = 300  # 同一 session 5 分鐘內僅記錄一次活動
+    ACTIVITY_MAX_ENTRIES: int = 10000  # 行程內記錄最近活動時間的學生數上限
+    REFRESH_LEASE_DURATION: int = 600  # 排程租約時間，執行期間每半個租約時間續約一次
     
     class Config:
         env_file = str(BASE_DIR / ".env")
@@ -1,20 +1,86 @@
+import time
+from typing import Any, Dict
+
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure
 
 from src.config import settings
 from src.models.collection import Collection
+from src.utils.activity import ActivityTracker, ACTIVE_SESSION_COLLECTION
+from src.utils.academic_calendar import AcademicCalendar
 from src.utils.cache import CacheManager
+from src.utils.cache_codec import CacheCodec
+from src.utils.local_cache import LocalCache
+from src.utils.pool_monitor import PoolMonitor
 
 try:
-    # 建立 MongoDB 連線
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    pool_monitor = PoolMonitor()
+
+    # 建立 MongoDB 連線，建立時不會連線，第一次操作時才連線
+    client = AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=settings.MONGODB_SOCKET_TIMEOUT_MS,
+        event_listeners=[pool_monitor],
+    )
     
     # 選擇資料庫
     db = client[settings.DB_NAME]
 
     cache_collections = {collection: db[collection.value] for collection in Collection}
 
-    cache_manager = CacheManager(db)
+    # 以學年學期區分的快取集合
+    semester_collections = (
+        Collection.COURSE_TIMETABLE,
+        Collection.COURSE_TIMETABLE_INDEX,
+        Collection.ANNUAL_GRADE_SEMESTER,
+        Collection.COURSE_ATTENDANCE,
+    )
+
+    # 以鍵值（例如日期）區分的快取集合
+    keyed_collections = (
+        Collection.LEAVE_COURSE,
+        Collection.LEAVE_PENDING,
+        Collection.LEAVE_DETAIL,
+    )
+
+    cache_manager = CacheManager(
+        db,
+        LocalCache(
+            settings.LOCAL_CACHE_MAX_ENTRIES,
+            settings.LOCAL_CACHE_TTL
+        ) if settings.LOCAL_CACHE_ENABLED else None,
+        settings.CACHE_INVALIDATION_COLLECTION_SIZE,
+        settings.NEGATIVE_CACHE_DURATION,
+        CacheCodec(
+            [collection.value for collection in settings.CACHE_COMPRESSED_COLLECTIONS],
+            settings.CACHE_COMPRESSION_LEVEL
+        ),
+        AcademicCalendar(
+            settings.CALENDAR_WINDOWS,
+            settings.CALENDAR_WINDOW_CACHE_DURATION,
+            settings.CALENDAR_STEADY_CACHE_DURATION,
+            settings.CALENDAR_PAST_SEMESTER_CACHE_DURATION,
+            settings.CALENDAR_FALL_START,
+            settings.CALENDAR_SPRING_START,
+            settings.CALENDAR_PAST_SEMESTER_GRACE_DAYS
+        ) if settings.CALENDAR_ENABLED else None
+    )
+
+    if settings.WRITE_BEHIND_ENABLED:
+        cache_manager.enable_write_behind(
+            settings.WRITE_BEHIND_FLUSH_INTERVAL,
+            settings.WRITE_BEHIND_BATCH_SIZE,
+            settings.WRITE_BEHIND_MAX_PENDING,
+            settings.WRITE_BEHIND_MAX_ATTEMPTS
+        )
+
+    activity_tracker = ActivityTracker(db)
 
     # 建立索引
     async def init_indexes():
@@ -22,6 +88,38 @@ try:
             await collection.insert_one({"init": True})
             await collection.delete_one({"init": True})
 
+        for collection in semester_collections:
+            await cache_collections[collection].create_index(
+                [("student_id", 1), ("year", 1), ("semester", 1)]
+            )
+
+        for collection in keyed_collections:
+            await cache_collections[collection].create_index([("student_id", 1), ("key", 1)])
+
+        await db[ACTIVE_SESSION_COLLECTION].create_index("last_active_timestamp")
+
+    async def check_health() -> Dict[str, Any]:
+        """
+        檢查 MongoDB 連線狀態
+
+        Returns:
+            {"round_trip_ms": ping 往返時間, "pool": 連線池使用狀況}
+
+        Raises:
+            pymongo.errors.PyMongoError: 無法連線至 MongoDB
+        """
+        started = time.perf_counter()
+        await client.admin.command("ping")
+        round_trip = time.perf_counter() - started
+
+        return {
+            "round_trip_ms": round(round_trip * 1000, 2),
+            "pool": pool_monitor.stats(settings.MONGODB_MAX_POOL_SIZE),
+        }
+
+    def close():
+        client.close()
+
 except ConnectionFailure as e:
     print(f"Could not connect to MongoDB: {e}")
     raise 
\ No newline at end of file
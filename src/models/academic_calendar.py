@@ -0,0 +1,13 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from src.models.collection import Collection
+
+
+class CalendarWindow(BaseModel):
+    """學年曆中資料可能變動的期間，每年重複"""
+    name: str = Field(description="期間名稱")
+    start: str = Field(pattern=r"^\d{2}-\d{2}$", description="開始月日 (MM-DD)")
+    end: str = Field(pattern=r"^\d{2}-\d{2}$", description="結束月日 (MM-DD)，早於開始月日時表示跨年")
+    collections: List[Collection] = Field(description="此期間內資料可能變動的集合")
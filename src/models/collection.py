@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict
 
 
 class Collection(Enum):
@@ -6,9 +7,12 @@ class Collection(Enum):
     STUDENT_PROFILE = "student_profile"
     STUDENT_SEMESTER = "student_semester"
     COURSE_TIMETABLE = "course_timetable"
+    COURSE_TIMETABLE_INDEX = "course_timetable_index"
     COURSE_WARNING = "course_warning"
+    COURSE_ATTENDANCE = "course_attendance"
     PERFORMANCE_GRADE = "performance_grade"
     ANNUAL_GRADE = "annual_grade"
+    ANNUAL_GRADE_SEMESTER = "annual_grade_semester"
     MILITARY = "military"
     INJURY = "injury"
     ADVISORS = "advisors"
@@ -22,7 +26,22 @@ class Collection(Enum):
     GRADUATION_ENGLISH = "graduation_english"
     GRADUATION_CHINESE = "graduation_chinese"
     GRADUATION_COMPUTER = "graduation_computer"
+    LEAVE_COURSE = "leave_course"
+    LEAVE_PENDING = "leave_pending"
+    LEAVE_HISTORY = "leave_history"
+    LEAVE_DETAIL = "leave_detail"
 
     def __str__(self) -> str:
         """返回集合名稱字符串"""
-        return self.value 
\ No newline at end of file
+        return self.value
+
+    @property
+    def schema_version(self) -> int:
+        """快取資料格式版本"""
+        return SCHEMA_VERSIONS.get(self, 1)
+
+
+# 快取資料格式版本，未列出者為 1。修改服務中的資料轉換（例如 t 欄位的結構、移除的欄位）後遞增對應集合的版本，
+# 版本不符的快取視為過期，於下次請求或背景批次更新時逐一重新抓取，不必清除整個集合
+SCHEMA_VERSIONS: Dict[Collection, int] = {}
+ 
\ No newline at end of file
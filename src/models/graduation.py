@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Dict, Optional, List, Type
+
+from src.models.GraduationType import GraduationType
+from src.models.response_data import ResponseModel, Semester, Text, Integer
 
 class GraduationRequirement(BaseModel):
     student_id: str
@@ -10,4 +13,56 @@ class GraduationRequirement(BaseModel):
     total_credits: int
     required_credits: int
     elective_credits: int
-    is_qualified: bool 
\ No newline at end of file
+    is_qualified: bool
+
+class GraduationRecord(ResponseModel):
+    id: Optional[Text] = Field(None, description="資料識別碼")
+    title: Optional[Text] = Field(None, description="檢定項目名稱")
+    score: Optional[Text] = Field(None, description="得分")
+    issuer: Optional[Text] = Field(None, description="簽發者")
+    t: Optional[Semester] = None
+
+class GraduationTermRecord(ResponseModel):
+    """未經學年學期轉換的畢業門檻紀錄"""
+    id: Optional[Text] = Field(None, description="資料識別碼")
+    title: Optional[Text] = Field(None, description="項目名稱")
+    score: Optional[Text] = Field(None, description="得分或時數")
+    issuer: Optional[Text] = Field(None, description="簽發者")
+    year: Optional[Integer] = Field(None, description="學年")
+    semester: Optional[Integer] = Field(None, description="學期")
+
+class GraduationPassable(ResponseModel):
+    title: Optional[Text] = Field(None, description="畢業門檻名稱")
+    result: Optional[Text] = Field(None, description="達成結果")
+
+class GraduationInfo(ResponseModel):
+    data: Optional[List[GraduationRecord]] = None
+    passable: Optional[GraduationPassable] = None
+
+class GraduationEnglish(GraduationInfo):
+    """英文畢業門檻"""
+
+class GraduationChinese(GraduationInfo):
+    """中文畢業門檻"""
+
+class GraduationComputer(GraduationInfo):
+    """資訊畢業門檻"""
+
+class GraduationWorkplace(ResponseModel):
+    """職場體驗畢業門檻"""
+    data: Optional[List[GraduationTermRecord]] = None
+    passable: Optional[GraduationPassable] = None
+
+class GraduationOverview(ResponseModel):
+    """修課學分畢業門檻"""
+    data: Optional[List[GraduationTermRecord]] = None
+    passable: Optional[GraduationPassable] = None
+
+# 各畢業門檻類型的回應模型
+GRADUATION_MODELS: Dict[GraduationType, Type[ResponseModel]] = {
+    GraduationType.OVERVIEW: GraduationOverview,
+    GraduationType.WORKPLACE_EXP: GraduationWorkplace,
+    GraduationType.ENGLISH: GraduationEnglish,
+    GraduationType.CHINESE: GraduationChinese,
+    GraduationType.COMPUTER: GraduationComputer,
+}
@@ -1,12 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime, date
-from typing import Optional, List, BinaryIO
+from typing import Optional, List, BinaryIO, Any
 
 from sis.course.leave.constant.departments import Department
 from sis.course.leave.constant.leave_type import LeaveType
-from sis.course.leave.modals.leave_form_data.course_leave_form_data import CourseLeaveFormData
-from sis.modals.course import Course
 
+from src.models.response_data import ResponseModel, Text, Integer, Flag
 from src.models.student import CourseInfo
 
 
@@ -19,4 +18,52 @@ class LeaveRequest(BaseModel):
 class CourseLeaveData(BaseModel):
     id : str
     date : date
-    period : int
\ No newline at end of file
+    period : int
+
+class LeaveOptionLocale(ResponseModel):
+    en: Optional[Text] = Field(None, description="英文假別名稱")
+    zh_tw: Optional[Text] = Field(None, description="中文假別名稱")
+
+class LeaveOption(ResponseModel):
+    id: Optional[Text] = Field(None, description="請假類型代碼")
+    locale: Optional[LeaveOptionLocale] = None
+
+class LeaveCourseTeacher(ResponseModel):
+    teacher_id: Optional[Text] = Field(None, description="教師編號")
+    teacher_name: Optional[Text] = Field(None, description="教師姓名")
+
+class LeaveCourse(ResponseModel):
+    course_id: Optional[Text] = Field(None, description="課程編號")
+    course_period: Optional[Integer] = Field(None, description="課程節次")
+    course_name: Optional[Text] = Field(None, description="課程名稱")
+    course_teacher: Optional[LeaveCourseTeacher] = None
+    location: Optional[Text] = Field(None, description="上課地點")
+    course_date: Optional[Text] = Field(None, description="上課日期")
+    course_weekday: Optional[Integer] = Field(None, description="星期幾上課（1=星期一，2=星期二，依此類推）")
+    course_pending: Optional[Flag] = Field(None, description="是否已請過")
+
+class LeaveHistoryRecord(ResponseModel):
+    id: Optional[Text] = Field(None, description="請假編號")
+    category: Optional[Text] = Field(None, description="請假分類")
+    leave_type: Optional[Text] = Field(None, description="請假類型")
+    reason: Optional[Text] = Field(None, description="請假原因")
+    leave_status: Optional[Text] = Field(None, description="審核狀態")
+    has_message: Optional[Flag] = Field(None, description="是否有審核訊息")
+    date: Optional[Text] = Field(None, description="請假日期，格式為 YYYY-MM-DD")
+    document_link: Optional[Text] = Field(None, description="相關證明文件連結")
+    details: Optional[Any] = Field(None, description="請假詳細資訊，若無為 null")
+
+class LeaveDetail(ResponseModel):
+    course_name: Optional[Text] = Field(None, description="課程名稱")
+    status: Optional[Text] = Field(None, description="審核結果狀態（例如：准假、不准假）")
+    status_description: Optional[Text] = Field(None, description="狀態說明（例如：完成、審核中、取消請假）")
+    period: Optional[Text] = Field(None, description="課程節次")
+    reviewer_name: Optional[Text] = Field(None, description="審核人姓名")
+    reviewer_relationship: Optional[Text] = Field(None, description="審核人與學生的關係（例如：任課老師、導師）")
+    message: Optional[Text] = Field(None, description="審核回覆訊息，若無為 null")
+    meeting_name: Optional[Text] = Field(None, description="重大集會請假名稱，若無為 null")
+    dorm_meeting_name: Optional[Text] = Field(None, description="宿舍防災演練請假名稱，若無為 null")
+
+class LeaveOperationResult(ResponseModel):
+    success: Optional[Flag] = Field(None, description="操作是否成功")
+    message: Optional[Text] = Field(None, description="操作結果訊息")
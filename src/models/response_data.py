@@ -1,5 +1,70 @@
-from pydantic import BaseModel
+from typing import Annotated, Any, Generic, Optional, TypeVar
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, ValidationError, WrapSerializer, WrapValidator
+
+T = TypeVar("T")
+
+
+
+def _blank_to_none(value: Any) -> Any:
+    """上游以空字串表示無資料"""
+    return None if isinstance(value, str) and not value.strip() else value
+
+
+def _lenient(value: Any, handler) -> Any:
+    """無法轉換為宣告型別的值原樣保留，不因上游格式變動而回應錯誤"""
+    try:
+        return handler(value)
+    except ValidationError:
+        return value
+
+
+def _raw_unless(kind: type) -> WrapSerializer:
+    """原樣保留的值直接輸出，避免序列化時對型別不符的值發出警告"""
+    def serialize(value: Any, handler) -> Any:
+        return handler(value) if value is None or isinstance(value, kind) else value
+
+    return WrapSerializer(serialize)
+
+
+# 上游回傳的型別並不一致（例如學年可能為字串或數字），回應模型盡量轉換為文件標示的型別；
+# 數字轉為字串由 ResponseModel 的 coerce_numbers_to_str 處理，數值及布林欄位的空字串視為 null，
+# 無法轉換的值（例如點數 92.5、"95%"）原樣回傳
+Text = Annotated[str, WrapValidator(_lenient), _raw_unless(str)]
+Integer = Annotated[Optional[int], WrapValidator(_lenient), BeforeValidator(_blank_to_none), _raw_unless(int)]
+Number = Annotated[Optional[float], WrapValidator(_lenient), BeforeValidator(_blank_to_none), _raw_unless(float)]
+Flag = Annotated[Optional[bool], WrapValidator(_lenient), BeforeValidator(_blank_to_none), _raw_unless(bool)]
 
 
 class ResponseData(BaseModel):
-    data: dict = None
\ No newline at end of file
+    data: dict = None
+
+
+class ResponseModel(BaseModel):
+    """
+    回應資料模型基底
+
+    欄位皆為選填，搭配 response_model_exclude_unset 使用時，回應僅包含上游有提供的欄位；
+    欄位盡量轉換為宣告的型別，未宣告的欄位原樣回傳，不改變既有用戶端收到的資料。
+    """
+    model_config = ConfigDict(
+        extra="allow",
+        from_attributes=True,
+        populate_by_name=True,
+        coerce_numbers_to_str=True
+    )
+
+
+class DataResponse(BaseModel, Generic[T]):
+    """API 回應格式 {"data": ...}"""
+    data: Optional[T] = None
+
+
+class PageResponse(DataResponse[T], Generic[T]):
+    """分頁回應格式 {"data": [...], "next_cursor": ...}，未分頁時不含 next_cursor"""
+    next_cursor: Optional[int] = Field(None, description="下一頁的 cursor，已無下一頁時為 null")
+
+
+class Semester(ResponseModel):
+    smye: Optional[Integer] = Field(None, description="學年度")
+    smty: Optional[Integer] = Field(None, description="學期 (1:上學期, 2:下學期)")
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+
+from src.models.response_data import ResponseModel, Semester, Text, Integer, Number, Flag
 from datetime import datetime
 
 class CourseInfo(BaseModel):
@@ -15,4 +17,257 @@ class StudentInfo(BaseModel):
     department: str
     grade: int
     class_name: str
-    courses: List[CourseInfo] = [] 
\ No newline at end of file
+    courses: List[CourseInfo] = []
+
+class StudentProfileReligion(ResponseModel):
+    id: Optional[Text] = Field(None, description="宗教信仰")
+    other: Optional[Text] = Field(None, description="其他宗教信仰說明")
+
+class StudentProfileDisabilities(ResponseModel):
+    id: Optional[Text] = Field(None, description="身心障礙狀況")
+    other: Optional[Text] = Field(None, description="其他身心障礙說明")
+
+class StudentProfileHealthHistory(ResponseModel):
+    disease: Optional[Text] = Field(None, description="健康狀況")
+    other: Optional[Text] = Field(None, description="其他健康狀況說明")
+
+class StudentProfileEmergencyContact(ResponseModel):
+    name: Optional[Text] = Field(None, description="緊急聯絡人姓名")
+    relation: Optional[Text] = Field(None, description="與學生關係")
+    phone: Optional[Text] = Field(None, description="緊急聯絡人電話")
+
+class StudentProfileClass(ResponseModel):
+    id: Optional[Text] = Field(None, description="班級")
+    teacher: Optional[Text] = Field(None, description="班導師")
+
+class StudentProfileEducation(ResponseModel):
+    program: Optional[Text] = Field(None, description="就讀學制")
+    department: Optional[Text] = Field(None, description="系所名稱")
+    class_: Optional[StudentProfileClass] = Field(None, alias="class")
+    mentor: Optional[Text] = Field(None, description="指導教授")
+    previous_school: Optional[Text] = Field(None, description="畢業學校")
+    graduation_date: Optional[Text] = Field(None, description="畢業日期")
+
+class StudentProfileContactInfo(ResponseModel):
+    mailing_address: Optional[Text] = Field(None, description="通訊地址")
+    permanent_address: Optional[Text] = Field(None, description="戶籍地址")
+    telephone: Optional[Text] = Field(None, description="家庭電話")
+    mobile: Optional[Text] = Field(None, description="手機")
+
+class StudentProfileDormitory(ResponseModel):
+    status: Optional[Text] = Field(None, description="住宿狀況")
+    room_number: Optional[Text] = Field(None, description="房間號碼")
+    address: Optional[Text] = Field(None, description="住宿地址")
+
+class StudentProfileEmail(ResponseModel):
+    campus: Optional[Text] = Field(None, description="校園信箱")
+    personal: Optional[Text] = Field(None, description="個人信箱")
+
+class StudentProfile(ResponseModel):
+    student_id: Optional[Text] = Field(None, description="學號")
+    name: Optional[Text] = Field(None, description="學生姓名")
+    gender: Optional[Text] = Field(None, description="性別")
+    id: Optional[Text] = Field(None, description="身分證字號")
+    birth_date: Optional[Text] = Field(None, description="生日")
+    economic_status: Optional[Text] = Field(None, description="經濟狀況")
+    identity_type: Optional[Text] = Field(None, description="學生身分")
+    marital_status: Optional[Text] = Field(None, description="婚姻狀況")
+    spouse_name: Optional[Text] = Field(None, description="配偶姓名")
+    religion: Optional[StudentProfileReligion] = None
+    disabilities: Optional[StudentProfileDisabilities] = None
+    health_history: Optional[StudentProfileHealthHistory] = None
+    emergency_contact: Optional[StudentProfileEmergencyContact] = None
+    education: Optional[StudentProfileEducation] = None
+    contact_info: Optional[StudentProfileContactInfo] = None
+    dormitory: Optional[StudentProfileDormitory] = None
+    email: Optional[StudentProfileEmail] = None
+
+class ScheduleTeacher(ResponseModel):
+    id: Optional[Text] = Field(None, description="教師ID")
+    name: Optional[Text] = Field(None, description="教師姓名")
+
+class ScheduleEntry(ResponseModel):
+    scheduleName: Optional[Text] = Field(None, description="課程名稱")
+    abbScheduleName: Optional[Text] = Field(None, description="課程簡稱")
+    courseId: Optional[Text] = Field(None, description="課程ID")
+    courseCode: Optional[Text] = Field(None, description="課程代碼")
+    week: Optional[Integer] = Field(None, description="星期幾 (1-7)")
+    period: Optional[Integer] = Field(None, description="第幾節課")
+    classroom: Optional[Text] = Field(None, description="教室")
+    teacher: Optional[List[ScheduleTeacher]] = None
+
+class CourseTimetable(ResponseModel):
+    type: Optional[Integer] = Field(None, description="課表類型")
+    name: Optional[Text] = Field(None, description="學生姓名")
+    academicYear: Optional[Integer] = Field(None, description="學年度")
+    semester: Optional[Text] = Field(None, description="學期")
+    updateDate: Optional[Text] = Field(None, description="更新日期")
+    departmentId: Optional[Text] = Field(None, description="系所編號")
+    deptTitleShort: Optional[Text] = Field(None, description="系所簡稱")
+    deptTitle: Optional[Text] = Field(None, description="系所全名")
+    schoolSystemId: Optional[Text] = Field(None, description="學制代碼")
+    schoolSystemTitle: Optional[Text] = Field(None, description="學制名稱")
+    schedule: Optional[List[ScheduleEntry]] = None
+
+class TimetableSlot(ResponseModel):
+    week: Optional[Integer] = Field(None, description="星期幾 (1-7)")
+    periods: Optional[List[Integer]] = Field(None, description="連續的節次")
+    start: Optional[Text] = Field(None, description="上課時間 (HH:MM)")
+    end: Optional[Text] = Field(None, description="下課時間 (HH:MM)")
+    scheduleName: Optional[Text] = Field(None, description="課程名稱")
+    abbScheduleName: Optional[Text] = Field(None, description="課程簡稱")
+    courseId: Optional[Text] = Field(None, description="課程ID")
+    courseCode: Optional[Text] = Field(None, description="課程代碼")
+    classroom: Optional[Text] = Field(None, description="教室")
+    teacher: Optional[List[ScheduleTeacher]] = None
+
+class NextCourse(TimetableSlot):
+    days_ahead: Optional[Integer] = Field(None, description="距今天數，0 為今天")
+
+class DayTimetable(ResponseModel):
+    week: Optional[Integer] = Field(None, description="星期幾 (1-7)")
+    courses: Optional[List[TimetableSlot]] = Field(None, description="當日課程，依節次排序")
+    free_periods: Optional[List[Integer]] = Field(None, description="空堂節次")
+
+class AttendanceSummary(ResponseModel):
+    attend: Optional[Integer] = Field(None, description="出席次數")
+    late: Optional[Integer] = Field(None, description="遲到次數")
+    leave_early: Optional[Integer] = Field(None, description="早退次數")
+    absent: Optional[Integer] = Field(None, description="缺席次數")
+    take_leave: Optional[Integer] = Field(None, description="請假次數")
+    attendence: Optional[Integer] = Field(None, description="出席率百分比")
+
+class AttendanceRoll(ResponseModel):
+    date: Optional[Text] = Field(None, description="日期")
+    day: Optional[Integer] = Field(None, description="星期幾")
+    period: Optional[Integer] = Field(None, description="節次")
+    attend_state: Optional[Integer] = Field(None, description="出席狀態碼")
+
+class AttendanceDetail(ResponseModel):
+    sum_roll_call: Optional[Integer] = Field(None, description="點名總次數")
+    data: Optional[List[AttendanceRoll]] = None
+
+class CourseAttendanceItem(ResponseModel):
+    subject_code: Optional[Text] = Field(None, description="課程代碼")
+    subject_name: Optional[Text] = Field(None, description="課程名稱")
+    attend: Optional[Integer] = Field(None, description="出席次數")
+    late: Optional[Integer] = Field(None, description="遲到次數")
+    leave_early: Optional[Integer] = Field(None, description="早退次數")
+    absent: Optional[Integer] = Field(None, description="缺席次數")
+    take_leave: Optional[Integer] = Field(None, description="請假次數")
+    attendence: Optional[Integer] = Field(None, description="出席率百分比")
+    detail: Optional[AttendanceDetail] = None
+
+class CourseAttendanceData(ResponseModel):
+    total: Optional[AttendanceSummary] = None
+    course_list: Optional[List[CourseAttendanceItem]] = None
+
+class CourseAttendance(ResponseModel):
+    year: Optional[Text] = Field(None, description="學年度")
+    sem: Optional[Text] = Field(None, description="學期")
+    all_data: Optional[CourseAttendanceData] = None
+
+class CourseWarning(ResponseModel):
+    course_id: Optional[Text] = Field(None, description="課程代碼")
+    course_name: Optional[Text] = Field(None, description="課程名稱")
+    is_required: Optional[Flag] = Field(None, description="是否必修")
+    teacher_name: Optional[Text] = Field(None, description="授課教師")
+    is_warning: Optional[Flag] = Field(None, description="是否有警告")
+    warning_message: Optional[Text] = Field(None, description="警告訊息")
+    credit: Optional[Integer] = Field(None, description="學分數")
+    comment: Optional[Text] = Field(None, description="評論")
+
+class AnnualGradeCourse(ResponseModel):
+    title: Optional[Text] = Field(None, description="課程名稱")
+    enTitle: Optional[Text] = Field(None, description="英文課程名稱")
+    codeNum: Optional[Text] = Field(None, description="課號")
+    cla: Optional[Text] = Field(None, description="課程代碼")
+    compulsory: Optional[Text] = Field(None, description="必/選修")
+    credit: Optional[Integer] = Field(None, description="學分數")
+    score: Optional[Text] = Field(None, description="成績")
+    note: Optional[Text] = Field(None, description="備註")
+
+class AnnualGradeComplex(ResponseModel):
+    totalAverage: Optional[Number] = Field(None, description="總平均")
+    conductGrade: Optional[Integer] = Field(None, description="操行成績")
+    earnCredit: Optional[Integer] = Field(None, description="實得學分")
+    credit: Optional[Integer] = Field(None, description="修課學分")
+    classRank: Optional[Integer] = Field(None, description="班排名")
+    classPeopleNum: Optional[Integer] = Field(None, description="班級人數")
+    semRank: Optional[Integer] = Field(None, description="系排名")
+    semPeopleNum: Optional[Integer] = Field(None, description="系人數")
+
+class AnnualGrade(ResponseModel):
+    course: Optional[List[AnnualGradeCourse]] = None
+    complex: Optional[AnnualGradeComplex] = None
+    t: Optional[Semester] = None
+
+class InjuryRecord(ResponseModel):
+    heal_time: Optional[Text] = Field(None, description="就醫時間")
+    heal_campus: Optional[Text] = Field(None, description="就醫地點類型")
+    heal_name: Optional[Text] = Field(None, description="傷病名稱")
+    heal_place: Optional[Text] = Field(None, description="受傷地點")
+    heal_wound: Optional[Text] = Field(None, description="受傷部位")
+    heal_process: Optional[Text] = Field(None, description="處理過程")
+    t: Optional[Semester] = None
+
+class MilitaryRecord(ResponseModel):
+    mil_status: Optional[Text] = Field(None, description="兵役狀態")
+    grad_date: Optional[Text] = Field(None, description="預計畢業日期")
+    t: Optional[Semester] = None
+
+class Advisor(ResponseModel):
+    teno: Optional[Text] = Field(None, description="教師編號")
+    epno: Optional[Text] = Field(None, description="教師代碼")
+    tutor_status: Optional[Text] = Field(None, description="導師狀態碼")
+    t: Optional[Semester] = None
+
+class AdvisorInfo(ResponseModel):
+    teno: Optional[Text] = Field(None, description="教師編號")
+    epno: Optional[Text] = Field(None, description="教師代碼")
+    name: Optional[Text] = Field(None, description="教師姓名")
+    unit: Optional[Text] = Field(None, description="所屬單位")
+    title: Optional[Text] = Field(None, description="職稱")
+    email: Optional[Text] = Field(None, description="電子郵件")
+    tel: Optional[Text] = Field(None, description="聯絡電話")
+    ext: Optional[Text] = Field(None, description="分機")
+    office: Optional[Text] = Field(None, description="辦公室")
+    img: Optional[Text] = Field(None, description="大頭照（base64），空值表示無照片資料")
+
+class RewardPenaltyRecord(ResponseModel):
+    trueday: Optional[Text] = Field(None, description="獎懲日期（格式為 YYYY/MM/DD）")
+    rewold: Optional[Text] = Field(None, description="獎懲類別（如嘉獎、小功等）")
+    frequency: Optional[Integer] = Field(None, description="獎懲次數")
+    reason: Optional[Text] = Field(None, description="獎懲原因")
+    t: Optional[Semester] = Field(None, description="學期資訊")
+
+class EnrollmentRecord(ResponseModel):
+    showItem: Optional[Text] = Field(None, description="未知")
+    stno: Optional[Text] = Field(None, description="學號")
+    stno_encode: Optional[Text] = Field(None, description="編碼後的學號")
+    status: Optional[Text] = Field(None, description="在學狀態代碼")
+    delay: Optional[Text] = Field(None, description="是否延畢代碼")
+    isPay: Optional[Integer] = Field(None, description="是否已繳費（1 表示是）")
+    pay_msg: Optional[Text] = Field(None, description="繳費訊息（若無則為空）")
+    isPrint: Optional[Integer] = Field(None, description="是否可列印（1 表示可列印）")
+    edu: Optional[Text] = Field(None, description="學制名稱")
+    dept: Optional[Text] = Field(None, description="系所名稱")
+    group_name: Optional[Text] = Field(None, description="組別名稱")
+    class_: Optional[Text] = Field(None, alias="class", description="班級名稱")
+    pdf: Optional[Text] = Field(None, description="PDF 證明文件連結")
+    t: Optional[Semester] = Field(None, description="學期資訊")
+
+class ScholarshipRecord(ResponseModel):
+    ship_name: Optional[Text] = Field(None, description="獎助學金名稱")
+    ship_amount: Optional[Integer] = Field(None, description="金額（單位：元）")
+    t: Optional[Semester] = Field(None, description="學期資訊")
+
+class PrinterPoint(ResponseModel):
+    point: Optional[Integer] = Field(None, description="獲得的獎懲點數總計")
+
+class DormRecord(ResponseModel):
+    dorm_space: Optional[Text] = Field(None, description="宿舍名稱")
+    dorm_id: Optional[Text] = Field(None, description="宿舍房間代碼")
+    dorm_no: Optional[Integer] = Field(None, description="寢室人數")
+    dorm_money: Optional[Integer] = Field(None, description="住宿費金額")
+    t: Optional[Semester] = None
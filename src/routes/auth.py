@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Response, Depends, HTTPException, Form
+from typing import Optional
+
+from fastapi import APIRouter, Response, Depends, HTTPException, Form, BackgroundTasks
 from sis.exception import EmptyInputException, InvalidStudentIDException, InvalidPasswordException, \
     HTTPRequestException, ConnectionException, RedirectException, UnexpectedResponseException, AuthenticationException
 from starlette import status
@@ -7,6 +9,7 @@ from src.models.auth import LoginRequest, LoginSuccessResponse
 from src.models.response_data import ResponseData
 from src.services.auth_service import AuthService
 from src.utils.auth import verify_jwt_token
+from src.utils.exception import UpstreamUnavailableException, CredentialsRequiredException
 
 router = APIRouter()
 
@@ -50,10 +53,11 @@ router = APIRouter()
     """
 )
 async def login(
+        background_tasks: BackgroundTasks,
         login_data: LoginRequest = Form(...),
 ):
     try:
-        result = await AuthService.login(login_data)
+        result = await AuthService.login(login_data, background_tasks)
         return result
     except UnexpectedResponseException:
         raise HTTPException(
@@ -95,6 +99,99 @@ async def login(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Login redirect exception."
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+@router.post(
+    "/refresh",
+    responses={
+        200: {
+            "description": "回傳新的 access_token，格式與登入相同，舊的 access_token 仍可使用至過期為止。",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "access_token": {
+                                "type": "string",
+                                "description": "JWT Token"
+                            },
+                            "token_type": {
+                                "type": "string",
+                                "description": "JWT Token 類型"
+                            },
+                            "expires_in": {
+                                "type": "integer",
+                                "description": "JWT Token 過期時間"
+                            }
+                        },
+                        "required": ["access_token", "token_type", "expires_in"]
+                    }
+                }
+            }
+        },
+    },
+    summary="以目前的 JWT Token 換發新的 JWT Token，並更新已失效的校園系統 session",
+    description="""
+    以目前仍有效的 JWT Token 換發新的 JWT Token。校園系統的 session 皆有效時不需帳號密碼，沿用原本的 session 並延長 JWT Token 的有效期限。
+
+    校園系統的 session 只能以帳號密碼重新登入，而本服務不保存密碼，因此無法自動重新登入：
+    當請求回傳 403 remote server session error 時，請於此路徑一併提供帳號密碼（取代完整的重新登入），
+    僅會重新登入 session 已失效的系統（學生資訊系統或 iCloud），仍有效的 session 會沿用。
+    有 session 失效但未提供帳號密碼時回傳 401。
+    """
+)
+async def refresh(
+        username: Optional[str] = Form(None, description="校園資訊系統帳號，session 皆有效時可省略"),
+        password: Optional[str] = Form(None, description="校園資訊系統密碼，session 皆有效時可省略"),
+        token: dict = Depends(verify_jwt_token)
+):
+    try:
+        login_data = LoginRequest(username=username, password=password) if username and password else None
+        return await AuthService.refresh(token, login_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
+    except CredentialsRequiredException as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except AuthenticationException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong username or password."
+        )
+    except EmptyInputException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The username and password cannot be empty."
+        )
+    except InvalidStudentIDException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong username format."
+        )
+    except InvalidPasswordException:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wrong password format."
+        )
+    except RedirectException:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login redirect exception."
+        )
 
 @router.get(
     "/logout",
@@ -194,5 +291,10 @@ async def logged_status(token: dict = Depends(verify_jwt_token)):
     try:
         is_logged = await AuthService.test_login_status(token)
         return ResponseData(data=is_logged)
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
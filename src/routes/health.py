@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException
+from starlette import status
+
+from src.database import check_health
+
+router = APIRouter()
+
+@router.get(
+    "/ready",
+    responses={
+        200: {
+            "content": {
+                "application/json": {
+                    "example": {
+                        "data": {
+                            "mongodb": {
+                                "round_trip_ms": 1.23,
+                                "pool": {
+                                    "localhost:27017": {
+                                        "connections": 12,
+                                        "checked_out": 3,
+                                        "waiting": 0,
+                                        "check_out_failures": 0,
+                                        "utilization": 0.03
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        503: {"description": "無法連線至 MongoDB"}
+    },
+    summary="服務就緒檢查",
+    description="檢查 MongoDB 連線，回傳 ping 往返時間及各伺服器連線池使用率 (使用中連線數 / MONGODB_MAX_POOL_SIZE)。"
+)
+async def readiness():
+    try:
+        mongodb = await check_health()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"MongoDB unavailable: {e}"
+        )
+
+    return {
+        "data": {
+            "mongodb": mongodb
+        }
+    }
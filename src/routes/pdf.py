@@ -6,7 +6,7 @@ from starlette import status
 from ..services.pdf_service import PDFService
 from ..utils.auth import verify_jwt_token
 from ..utils.connect_parser import ConnectionParser
-from ..utils.exception import StudentInfoNotFoundException
+from ..utils.exception import StudentInfoNotFoundException, UpstreamUnavailableException
 
 router = APIRouter(prefix="")
 
@@ -52,6 +52,11 @@ async def get_graduation_overview_pdf(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -107,6 +112,11 @@ async def get_course_list_pdf(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -162,6 +172,11 @@ async def get_proof_or_enrollment_pdf(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -216,6 +231,11 @@ async def get_course_timetable(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
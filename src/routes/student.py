@@ -1,22 +1,41 @@
 from pickle import FALSE
-from typing import Optional
+from typing import Optional, List, Union
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from icloud.personal.constants.lang import Lang
 from starlette import status
 
+from src.config import settings
 from src.models.GraduationType import GraduationType
-from src.models.student import StudentInfo
+from src.models.collection import Collection
+from src.models.graduation import GRADUATION_MODELS, GraduationOverview, GraduationWorkplace, GraduationEnglish, \
+    GraduationChinese, GraduationComputer
+from src.models.response_data import DataResponse, PageResponse, Semester
+from src.models.student import StudentInfo, StudentProfile, CourseTimetable, CourseAttendance, CourseWarning, \
+    AnnualGrade, InjuryRecord, MilitaryRecord, Advisor, AdvisorInfo, RewardPenaltyRecord, EnrollmentRecord, \
+    ScholarshipRecord, PrinterPoint, DormRecord, DayTimetable, NextCourse, TimetableSlot
 from src.services.graduation_service import GraduationService
 from src.services.student_service import StudentService
 from src.utils.auth import verify_jwt_token
 from src.utils.connect_parser import ConnectionParser
-from src.utils.exception import StudentInfoNotFoundException, NotFoundException, InvalidFormatException
+from src.utils.exception import StudentInfoNotFoundException, NotFoundException, InvalidFormatException, \
+    UpstreamUnavailableException
+from src.utils.field_selection import selectable_fields, select_fields
+from src.utils.pagination import RecordPageQuery
+from src.utils.semester_manager import SemesterManager
 
 router = APIRouter(prefix="")
 
+
+async def set_immutable_cache_control(response: Response, icloud_conn, year: Optional[str], semester: Optional[str]):
+    """過去學期的資料不再變動，允許用戶端長期快取"""
+    if await SemesterManager.is_immutable_semester(icloud_conn, year, semester):
+        response.headers["Cache-Control"] = f"private, max-age={settings.IMMUTABLE_CACHE_MAX_AGE}, immutable"
+
 @router.get(
     "",
+    response_model=DataResponse[StudentProfile],
+    response_model_exclude_unset=True,
     summary="取得個人資訊",
     description="""
     從 [學生資訊系統](https://sis.dyu.edu.tw/) 取得。
@@ -25,96 +44,6 @@ router = APIRouter(prefix="")
         200: {
             "content": {
                 "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "object",
-                                "properties": {
-                                    "student_id": {"type": "string", "description": "學號"},
-                                    "name": {"type": "string", "description": "學生姓名"},
-                                    "gender": {"type": "string", "description": "性別"},
-                                    "id": {"type": "string", "description": "身分證字號"},
-                                    "birth_date": {"type": "string", "description": "生日"},
-                                    "economic_status": {"type": "string", "description": "經濟狀況"},
-                                    "identity_type": {"type": "string", "description": "學生身分"},
-                                    "marital_status": {"type": "string", "description": "婚姻狀況"},
-                                    "spouse_name": {"type": "string", "description": "配偶姓名"},
-                                    "religion": {
-                                        "type": "object",
-                                        "properties": {
-                                            "id": {"type": "string", "description": "宗教信仰"},
-                                            "other": {"type": "string", "description": "其他宗教信仰說明"}
-                                        }
-                                    },
-                                    "disabilities": {
-                                        "type": "object",
-                                        "properties": {
-                                            "id": {"type": "string", "description": "身心障礙狀況"},
-                                            "other": {"type": "string", "description": "其他身心障礙說明"}
-                                        }
-                                    },
-                                    "health_history": {
-                                        "type": "object",
-                                        "properties": {
-                                            "disease": {"type": "string", "description": "健康狀況"},
-                                            "other": {"type": "string", "description": "其他健康狀況說明"}
-                                        }
-                                    },
-                                    "emergency_contact": {
-                                        "type": "object",
-                                        "properties": {
-                                            "name": {"type": "string", "description": "緊急聯絡人姓名"},
-                                            "relation": {"type": "string", "description": "與學生關係"},
-                                            "phone": {"type": "string", "description": "緊急聯絡人電話"}
-                                        }
-                                    },
-                                    "education": {
-                                        "type": "object",
-                                        "properties": {
-                                            "program": {"type": "string", "description": "就讀學制"},
-                                            "department": {"type": "string", "description": "系所名稱"},
-                                            "class": {
-                                                "type": "object",
-                                                "properties": {
-                                                    "id": {"type": "string", "description": "班級"},
-                                                    "teacher": {"type": "string", "description": "班導師"}
-                                                }
-                                            },
-                                            "mentor": {"type": "string", "description": "指導教授"},
-                                            "previous_school": {"type": "string", "description": "畢業學校"},
-                                            "graduation_date": {"type": "string", "description": "畢業日期"}
-                                        }
-                                    },
-                                    "contact_info": {
-                                        "type": "object",
-                                        "properties": {
-                                            "mailing_address": {"type": "string", "description": "通訊地址"},
-                                            "permanent_address": {"type": "string", "description": "戶籍地址"},
-                                            "telephone": {"type": "string", "description": "家庭電話"},
-                                            "mobile": {"type": "string", "description": "手機"}
-                                        }
-                                    },
-                                    "dormitory": {
-                                        "type": "object",
-                                        "properties": {
-                                            "status": {"type": "string", "description": "住宿狀況"},
-                                            "room_number": {"type": "string", "description": "房間號碼"},
-                                            "address": {"type": "string", "description": "住宿地址"}
-                                        }
-                                    },
-                                    "email": {
-                                        "type": "object",
-                                        "properties": {
-                                            "campus": {"type": "string", "description": "校園信箱"},
-                                            "personal": {"type": "string", "description": "個人信箱"}
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    },
                     "example": {
                         "data": {
                             "student_id": "A0000000",
@@ -179,15 +108,16 @@ router = APIRouter(prefix="")
 )
 async def get_student_info(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(StudentProfile)),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         sis_conn = ConnectionParser.parse_connection(token, False)
 
-        info = await StudentService.get_student_info(sis_conn, refresh)
+        info = await StudentService.get_student_info(sis_conn, refresh, fields=fields)
 
         return {
-            "data": info
+            "data": select_fields(info, fields)
         }
     except KeyError as e:
         raise HTTPException(
@@ -199,6 +129,11 @@ async def get_student_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -208,34 +143,12 @@ async def get_student_info(
 
 @router.get(
     "/semester",
+    response_model=DataResponse[List[Semester]],
+    response_model_exclude_unset=True,
     responses={
         200: {
             "content": {
                 "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "smye": {
-                                            "type": "integer",
-                                            "description": "學年度"
-                                        },
-                                        "smty": {
-                                            "type": "integer",
-                                            "description": "學期 (1:上學期, 2:下學期)"
-                                        }
-                                    },
-                                    "required": ["smye", "smty"]
-                                },
-                                "description": "學期列表"
-                            }
-                        },
-                        "required": ["data"]
-                    },
                     "example": {
                         "data": [
                             {"smye": 113, "smty": 2},
@@ -255,6 +168,7 @@ async def get_student_info(
 )
 async def get_student_semester(
         refresh: bool = Query(False, description="強制更新快取"),
+        fields: Optional[List[str]] = Depends(selectable_fields(Semester)),
         token: dict = Depends(verify_jwt_token),
 ):
 
@@ -264,10 +178,11 @@ async def get_student_semester(
         data = await StudentService.get_student_semester(
             icloud_conn,
             refresh,
+            fields=fields
         )
 
         return {
-            "data": data
+            "data": select_fields(data, fields)
         }
 
     except KeyError as e:
@@ -280,6 +195,11 @@ async def get_student_semester(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -288,125 +208,19 @@ async def get_student_semester(
 
 @router.get(
     "/course",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "object",
-                                "properties": {
-                                    "type": {
-                                        "type": "integer",
-                                        "description": "課表類型"
-                                    },
-                                    "name": {
-                                        "type": "string",
-                                        "description": "學生姓名"
-                                    },
-                                    "academicYear": {
-                                        "type": "integer",
-                                        "description": "學年度"
-                                    },
-                                    "semester": {
-                                        "type": "string",
-                                        "description": "學期"
-                                    },
-                                    "updateDate": {
-                                        "type": "string",
-                                        "description": "更新日期"
-                                    },
-                                    "departmentId": {
-                                        "type": "string",
-                                        "description": "系所編號"
-                                    },
-                                    "deptTitleShort": {
-                                        "type": "string",
-                                        "description": "系所簡稱"
-                                    },
-                                    "deptTitle": {
-                                        "type": "string",
-                                        "description": "系所全名"
-                                    },
-                                    "schoolSystemId": {
-                                        "type": "string",
-                                        "description": "學制代碼"
-                                    },
-                                    "schoolSystemTitle": {
-                                        "type": "string",
-                                        "description": "學制名稱"
-                                    },
-                                    "schedule": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "object",
-                                            "properties": {
-                                                "scheduleName": {
-                                                    "type": "string",
-                                                    "description": "課程名稱"
-                                                },
-                                                "abbScheduleName": {
-                                                    "type": "string",
-                                                    "description": "課程簡稱"
-                                                },
-                                                "courseId": {
-                                                    "type": "string",
-                                                    "description": "課程ID"
-                                                },
-                                                "courseCode": {
-                                                    "type": "string",
-                                                    "description": "課程代碼"
-                                                },
-                                                "week": {
-                                                    "type": "integer",
-                                                    "description": "星期幾 (1-7)"
-                                                },
-                                                "period": {
-                                                    "type": "integer",
-                                                    "description": "第幾節課"
-                                                },
-                                                "classroom": {
-                                                    "type": "string",
-                                                    "description": "教室"
-                                                },
-                                                "teacher": {
-                                                    "type": "array",
-                                                    "items": {
-                                                        "type": "object",
-                                                        "properties": {
-                                                            "id": {
-                                                                "type": "string",
-                                                                "description": "教師ID"
-                                                            },
-                                                            "name": {
-                                                                "type": "string",
-                                                                "description": "教師姓名"
-                                                            }
-                                                        }
-                                                    }
-                                                }
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }},
+    response_model=DataResponse[CourseTimetable],
+    response_model_exclude_unset=True,
     summary="取得指定學期課表",
     description="""
     取得指定學期課表，若未指定，預設則為取得當學期課表。
     """
 )
 async def get_course_info(
+    response: Response,
     refresh: bool = Query(False, description="強制更新快取"),
     year: Optional[str] = Query(None, description="學年"),
     semester: Optional[str] = Query(None, description="學期"),
+    fields: Optional[List[str]] = Depends(selectable_fields(CourseTimetable)),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
@@ -415,10 +229,12 @@ async def get_course_info(
             icloud_conn,
             refresh,
             year=year,
-            seme=semester
+            seme=semester,
+            fields=fields
         )
+        await set_immutable_cache_control(response, icloud_conn, year, semester)
         return {
-            "data" : data
+            "data" : select_fields(data, fields)
         }
     except KeyError as e:
         raise HTTPException(
@@ -430,6 +246,130 @@ async def get_course_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get(
+    "/course/today",
+    response_model=DataResponse[DayTimetable],
+    response_model_exclude_unset=True,
+    summary="取得今日課程",
+    description="""
+    由當學期課表索引取得今日（或指定星期）的課程及空堂，連續節次的同一課程合併為一筆。
+    """
+)
+async def get_today_courses(
+    week: Optional[int] = Query(None, ge=1, le=7, description="星期 (1-7)，預設為今天"),
+    refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(DayTimetable)),
+    token: dict = Depends(verify_jwt_token)
+):
+    try:
+        icloud_conn = ConnectionParser.parse_connection(token, True)
+        data = await StudentService.get_today_courses(icloud_conn, week, refresh)
+        return {"data" : select_fields(data, fields)}
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str("remote server session error. check: " + str(e))
+        )
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get(
+    "/course/next",
+    response_model=DataResponse[NextCourse],
+    response_model_exclude_unset=True,
+    summary="取得下一堂課",
+    description="""
+    由當學期課表索引取得下一堂課，今日已無課程時往後查詢，days_ahead 為距今天數。
+    """
+)
+async def get_next_course(
+    refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(NextCourse)),
+    token: dict = Depends(verify_jwt_token)
+):
+    try:
+        icloud_conn = ConnectionParser.parse_connection(token, True)
+        data = await StudentService.get_next_course(icloud_conn, refresh)
+        return {"data" : select_fields(data, fields)}
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str("remote server session error. check: " + str(e))
+        )
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get(
+    "/course/classroom",
+    response_model=DataResponse[List[TimetableSlot]],
+    response_model_exclude_unset=True,
+    summary="取得指定教室的課程",
+    description="""
+    由當學期課表索引取得於指定教室上課的課程。
+    """
+)
+async def get_classroom_courses(
+    classroom: str = Query(..., description="教室"),
+    refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(TimetableSlot)),
+    token: dict = Depends(verify_jwt_token)
+):
+    try:
+        icloud_conn = ConnectionParser.parse_connection(token, True)
+        data = await StudentService.get_classroom_courses(icloud_conn, classroom, refresh)
+        return {"data" : select_fields(data, fields)}
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str("remote server session error. check: " + str(e))
+        )
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -438,96 +378,17 @@ async def get_course_info(
 
 @router.get(
     "/course/attendance",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "object",
-                                "properties": {
-                                    "year": {
-                                        "type": "string",
-                                        "description": "學年度"
-                                    },
-                                    "sem": {
-                                        "type": "string",
-                                        "description": "學期"
-                                    },
-                                    "all_data": {
-                                        "type": "object",
-                                        "properties": {
-                                            "total": {
-                                                "type": "object",
-                                                "properties": {
-                                                    "attend": {"type": "integer", "description": "出席次數"},
-                                                    "late": {"type": "integer", "description": "遲到次數"},
-                                                    "leave_early": {"type": "integer", "description": "早退次數"},
-                                                    "absent": {"type": "integer", "description": "缺席次數"},
-                                                    "take_leave": {"type": "integer", "description": "請假次數"},
-                                                    "attendence": {"type": "integer", "description": "出席率百分比"}
-                                                }
-                                            },
-                                            "course_list": {
-                                                "type": "array",
-                                                "items": {
-                                                    "type": "object",
-                                                    "properties": {
-                                                        "subject_code": {"type": "string", "description": "課程代碼"},
-                                                        "subject_name": {"type": "string", "description": "課程名稱"},
-                                                        "attend": {"type": "integer", "description": "出席次數"},
-                                                        "late": {"type": "integer", "description": "遲到次數"},
-                                                        "leave_early": {"type": "integer", "description": "早退次數"},
-                                                        "absent": {"type": "integer", "description": "缺席次數"},
-                                                        "take_leave": {"type": "integer", "description": "請假次數"},
-                                                        "attendence": {"type": "integer",
-                                                                       "description": "出席率百分比"},
-                                                        "detail": {
-                                                            "type": "object",
-                                                            "properties": {
-                                                                "sum_roll_call": {"type": "integer",
-                                                                                  "description": "點名總次數"},
-                                                                "data": {
-                                                                    "type": "array",
-                                                                    "items": {
-                                                                        "type": "object",
-                                                                        "properties": {
-                                                                            "date": {"type": "string",
-                                                                                     "description": "日期"},
-                                                                            "day": {"type": "integer",
-                                                                                    "description": "星期幾"},
-                                                                            "period": {"type": "integer",
-                                                                                       "description": "節次"},
-                                                                            "attend_state": {"type": "integer",
-                                                                                             "description": "出席狀態碼"}
-                                                                        }
-                                                                    }
-                                                                }
-                                                            }
-                                                        }
-                                                    }
-                                                }
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[CourseAttendance],
+    response_model_exclude_unset=True,
     summary="取得指定學期課程出席率",
     description="取得指定學期課程出席率，若為指定，預設則為取得當前學年度課程出席率。"
 )
 async def get_course_attendance_info(
+        response: Response,
         refresh: bool = Query(False, description="強制更新快取"),
         year: Optional[str] = Query(None, description="學年"),
         semester: Optional[str] = Query(None, description="學期"),
+        fields: Optional[List[str]] = Depends(selectable_fields(CourseAttendance)),
         token: dict = Depends(verify_jwt_token)
 ):
         try:
@@ -536,16 +397,23 @@ async def get_course_attendance_info(
                 icloud_conn,
                 refresh,
                 year=year,
-                semester=semester
+                semester=semester,
+                fields=fields
             )
+            await set_immutable_cache_control(response, icloud_conn, year, semester)
             return {
-                "data": data
+                "data": select_fields(data, fields)
             }
         except NotFoundException as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=str(e)
             )
+        except UpstreamUnavailableException as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -554,37 +422,8 @@ async def get_course_attendance_info(
 
 @router.get(
     "/course/warning",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "course_id": {"type": "string", "description": "課程代碼"},
-                                        "course_name": {"type": "string", "description": "課程名稱"},
-                                        "is_required": {"type": "boolean", "description": "是否必修"},
-                                        "teacher_name": {"type": "string", "description": "授課教師"},
-                                        "is_warning": {"type": "boolean", "description": "是否有警告"},
-                                        "warning_message": {"type": "string", "description": "警告訊息"},
-                                        "credit": {"type": "integer", "description": "學分數"},
-                                        "comment": {"type": "string", "description": "評論"}
-                                    },
-                                    "required": ["course_id", "course_name", "is_required", "teacher_name", "is_warning", "warning_message", "credit", "comment"]
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[List[CourseWarning]],
+    response_model_exclude_unset=True,
     summary="取得課程預警",
     description="""
     取得課程預警，因來源資料只能取得當前學年度資料，因此無法指定取得其他學年度資料。
@@ -592,6 +431,7 @@ async def get_course_attendance_info(
 )
 async def get_course_warning(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(CourseWarning)),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
@@ -599,10 +439,11 @@ async def get_course_warning(
 
         data = await StudentService.get_course_warning(
             sis_conn,
-            refresh
+            refresh,
+            fields=fields
         )
 
-        return {"data" : data}
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -613,6 +454,11 @@ async def get_course_warning(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -621,77 +467,24 @@ async def get_course_warning(
 
 @router.get(
     "/course/grade",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "course": {
-                                            "type": "array",
-                                            "items": {
-                                                "type": "object",
-                                                "properties": {
-                                                    "title": {"type": "string", "description": "課程名稱"},
-                                                    "enTitle": {"type": "string", "description": "英文課程名稱"},
-                                                    "codeNum": {"type": "string", "description": "課號"},
-                                                    "cla": {"type": "string", "description": "課程代碼"},
-                                                    "compulsory": {"type": "string", "description": "必/選修"},
-                                                    "credit": {"type": "integer", "description": "學分數"},
-                                                    "score": {"type": "string", "description": "成績"},
-                                                    "note": {"type": "string", "description": "備註"}
-                                                }
-                                            }
-                                        },
-                                        "complex": {
-                                            "type": "object",
-                                            "properties": {
-                                                "totalAverage": {"type": "number", "description": "總平均"},
-                                                "conductGrade": {"type": "integer", "description": "操行成績"},
-                                                "earnCredit": {"type": "integer", "description": "實得學分"},
-                                                "credit": {"type": "integer", "description": "修課學分"},
-                                                "classRank": {"type": "integer", "description": "班排名"},
-                                                "classPeopleNum": {"type": "integer", "description": "班級人數"},
-                                                "semRank": {"type": "integer", "description": "系排名"},
-                                                "semPeopleNum": {"type": "integer", "description": "系人數"}
-                                            }
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "properties": {
-                                                "smye": {"type": "integer", "description": "學年"},
-                                                "smty": {"type": "integer", "description": "學期"}
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[Union[List[AnnualGrade], AnnualGrade]],
+    response_model_exclude_unset=True,
     summary="取得指定學年度課程成績",
     description="取得指定學期課程成績，若為指定則將取得上一學期課程成績。"
 )
 async def get_grade(
+    response: Response,
     year: Optional[str] = Query(None, description="學年 (例如: 112)"),
     semester: Optional[str] = Query(None, description="學期 (1 或 2)"),
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(AnnualGrade)),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
         data = await StudentService.get_annual_grade(icloud_conn, year, semester, refresh)
-        return {"data" : data}
+        await set_immutable_cache_control(response, icloud_conn, year, semester)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -702,6 +495,11 @@ async def get_grade(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -711,25 +509,8 @@ async def get_grade(
 # 其他個人資訊路由
 @router.get(
     "/barcode",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "string",
-                                "description": "Base64編碼的圖片資料",
-                                "format": "byte"
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[str],
+    response_model_exclude_unset=True,
     summary="取得個人學生證證件學號條碼照片",
     description="取得個人學生證證件學號條碼照片，以 Base64 編碼呈現。"
 )
@@ -750,6 +531,11 @@ async def get_barcode(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -759,25 +545,8 @@ async def get_barcode(
 
 @router.get(
     "/image",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "string",
-                                "description": "Base64編碼的圖片資料",
-                                "format": "byte"
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[str],
+    response_model_exclude_unset=True,
     summary="取得個人學生證證件個人大頭照照片",
     description="取得個人學生證證件個人大頭照照片，以 Base64 編碼呈現。"
 )
@@ -798,6 +567,11 @@ async def get_image(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -806,64 +580,11 @@ async def get_image(
 
 @router.get(
     "/injury",
+    response_model=PageResponse[List[InjuryRecord]],
+    response_model_exclude_unset=True,
     responses={
         200: {
-            "description": "成功獲取學生健康紀錄資料",
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "heal_time": {
-                                            "type": "string",
-                                            "description": "就醫時間"
-                                        },
-                                        "heal_campus": {
-                                            "type": "string",
-                                            "description": "就醫地點類型"
-                                        },
-                                        "heal_name": {
-                                            "type": "string",
-                                            "description": "傷病名稱"
-                                        },
-                                        "heal_place": {
-                                            "type": "string",
-                                            "description": "受傷地點"
-                                        },
-                                        "heal_wound": {
-                                            "type": "string",
-                                            "description": "受傷部位"
-                                        },
-                                        "heal_process": {
-                                            "type": "string",
-                                            "description": "處理過程"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期"
-                                                }
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
+            "description": "成功獲取學生健康紀錄資料"
         }
     },
     summary="取得個人在校受傷紀錄",
@@ -871,12 +592,27 @@ async def get_image(
 )
 async def get_injury(
         refresh: bool = Query(False, description="強制更新快取"),
+        fields: Optional[List[str]] = Depends(selectable_fields(InjuryRecord)),
+        page: RecordPageQuery = Depends(),
         token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_injury(icloud_conn, refresh)
-        return {"data" : data}
+
+        if page.is_requested:
+            result = await StudentService.get_record_page(
+                Collection.INJURY,
+                lambda: StudentService.get_injury(icloud_conn, refresh),
+                icloud_conn.student_id,
+                page,
+                refresh,
+                fields
+            )
+            result["data"] = select_fields(result["data"], fields)
+            return result
+
+        data = await StudentService.get_injury(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -887,6 +623,11 @@ async def get_injury(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -895,48 +636,11 @@ async def get_injury(
 
 @router.get(
     "/military",
+    response_model=PageResponse[List[MilitaryRecord]],
+    response_model_exclude_unset=True,
     responses={
         200: {
-            "description": "成功獲取學生兵役資料",
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "mil_status": {
-                                            "type": "string",
-                                            "description": "兵役狀態"
-                                        },
-                                        "grad_date": {
-                                            "type": "string",
-                                            "description": "預計畢業日期"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期"
-                                                }
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
+            "description": "成功獲取學生兵役資料"
         }
     },
     summary="取得個人兵役紀錄",
@@ -944,12 +648,27 @@ async def get_injury(
 )
 async def get_military(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(MilitaryRecord)),
+    page: RecordPageQuery = Depends(),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_military(icloud_conn, refresh)
-        return {"data" : data}
+
+        if page.is_requested:
+            result = await StudentService.get_record_page(
+                Collection.MILITARY,
+                lambda: StudentService.get_military(icloud_conn, refresh),
+                icloud_conn.student_id,
+                page,
+                refresh,
+                fields
+            )
+            result["data"] = select_fields(result["data"], fields)
+            return result
+
+        data = await StudentService.get_military(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -960,6 +679,11 @@ async def get_military(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -968,52 +692,11 @@ async def get_military(
 
 @router.get(
     "/advisor",
+    response_model=DataResponse[List[Advisor]],
+    response_model_exclude_unset=True,
     responses={
         200: {
-            "description": "成功獲取學生導師資料",
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "teno": {
-                                            "type": "string",
-                                            "description": "教師編號"
-                                        },
-                                        "epno": {
-                                            "type": "string",
-                                            "description": "教師代碼"
-                                        },
-                                        "tutor_status": {
-                                            "type": "string",
-                                            "description": "導師狀態碼"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期"
-                                                }
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
+            "description": "成功獲取學生導師資料"
         }
     },
     summary="取得個人導師列表",
@@ -1021,12 +704,13 @@ async def get_military(
 )
 async def get_advisors(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(Advisor)),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_advisors(icloud_conn, refresh)
-        return {"data" : data}
+        data = await StudentService.get_advisors(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1037,6 +721,11 @@ async def get_advisors(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1045,56 +734,8 @@ async def get_advisors(
 
 @router.get(
     "/advisor/{advisor_id}",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "teno": {
-                                            "type": "string",
-                                            "description": "教師編號"
-                                        },
-                                        "epno": {
-                                            "type": "string",
-                                            "description": "教師代碼"
-                                        },
-                                        "tutor_status": {
-                                            "type": "string",
-                                            "description": "導師類型"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "description": "指導學年",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年（如 112）"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期（1 或 2）"
-                                                }
-                                            },
-                                            "required": ["smye", "smty"]
-                                        }
-                                    },
-                                    "required": ["teno", "epno", "tutor_status", "t"]
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[AdvisorInfo],
+    response_model_exclude_unset=True,
     summary="取得指定導師聯絡資訊及大頭照",
     description="取得指定導師聯絡資訊及大頭照，img 若為空值表示無照片資料。"
 )
@@ -1116,6 +757,11 @@ async def get_advisor_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1124,71 +770,34 @@ async def get_advisor_info(
 
 @router.get(
     "/rewards-and-penalties",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "trueday": {
-                                            "type": "string",
-                                            "description": "獎懲日期（格式為 YYYY/MM/DD）"
-                                        },
-                                        "rewold": {
-                                            "type": "string",
-                                            "description": "獎懲類別（如嘉獎、小功等）"
-                                        },
-                                        "frequency": {
-                                            "type": "integer",
-                                            "description": "獎懲次數"
-                                        },
-                                        "reason": {
-                                            "type": "string",
-                                            "description": "獎懲原因"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "description": "學期資訊",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年（如 113）"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期（1 或 2）"
-                                                }
-                                            },
-                                            "required": ["smye", "smty"]
-                                        }
-                                    },
-                                    "required": ["trueday", "rewold", "frequency", "reason", "t"]
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=PageResponse[List[RewardPenaltyRecord]],
+    response_model_exclude_unset=True,
     summary="取得個人獎懲紀錄",
     description="取得個人獎懲紀錄"
 )
 async def get_rewards_and_penalties(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(RewardPenaltyRecord)),
+    page: RecordPageQuery = Depends(),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_rewards_and_penalties(icloud_conn, refresh)
-        return {"data" : data}
+
+        if page.is_requested:
+            result = await StudentService.get_record_page(
+                Collection.REWARDS_AND_PENALTIES,
+                lambda: StudentService.get_rewards_and_penalties(icloud_conn, refresh),
+                icloud_conn.student_id,
+                page,
+                refresh,
+                fields
+            )
+            result["data"] = select_fields(result["data"], fields)
+            return result
+
+        data = await StudentService.get_rewards_and_penalties(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1199,6 +808,11 @@ async def get_rewards_and_penalties(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1207,123 +821,35 @@ async def get_rewards_and_penalties(
 
 @router.get(
     "/enrollment",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "showItem": {
-                                            "type": "string",
-                                            "description": "未知"
-                                        },
-                                        "stno": {
-                                            "type": "string",
-                                            "description": "學號"
-                                        },
-                                        "stno_encode": {
-                                            "type": "string",
-                                            "description": "編碼後的學號"
-                                        },
-                                        "status": {
-                                            "type": "string",
-                                            "description": "在學狀態代碼"
-                                        },
-                                        "delay": {
-                                            "type": "string",
-                                            "description": "是否延畢代碼"
-                                        },
-                                        "isPay": {
-                                            "type": "integer",
-                                            "description": "是否已繳費（1 表示是）"
-                                        },
-                                        "pay_msg": {
-                                            "type": "string",
-                                            "description": "繳費訊息（若無則為空）"
-                                        },
-                                        "isPrint": {
-                                            "type": "integer",
-                                            "description": "是否可列印（1 表示可列印）"
-                                        },
-                                        "edu": {
-                                            "type": "string",
-                                            "description": "學制名稱"
-                                        },
-                                        "dept": {
-                                            "type": "string",
-                                            "description": "系所名稱"
-                                        },
-                                        "group_name": {
-                                            "type": "string",
-                                            "description": "組別名稱"
-                                        },
-                                        "class": {
-                                            "type": "string",
-                                            "description": "班級名稱"
-                                        },
-                                        "pdf": {
-                                            "type": "string",
-                                            "description": "PDF 證明文件連結"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "description": "學期資訊",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年（如 113）"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期（1 或 2）"
-                                                }
-                                            },
-                                            "required": ["smye", "smty"]
-                                        }
-                                    },
-                                    "required": [
-                                        "showItem",
-                                        "stno",
-                                        "stno_encode",
-                                        "status",
-                                        "delay",
-                                        "isPay",
-                                        "pay_msg",
-                                        "isPrint",
-                                        "edu",
-                                        "dept",
-                                        "group_name",
-                                        "class",
-                                        "pdf",
-                                        "t"
-                                    ]
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=PageResponse[List[EnrollmentRecord]],
+    response_model_exclude_unset=True,
     summary="取得個人註冊證明",
     description="取得個人註冊證明，可選擇語言 zh-TW、zh-CN 以及 en，其中中文不分正體以及簡體。"
 )
 async def get_enrollment(
     lang : Lang = Lang.ZH_TW,
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(EnrollmentRecord)),
+    page: RecordPageQuery = Depends(),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_enrollment(icloud_conn, lang, refresh)
-        return {"data" : data}
+
+        if page.is_requested:
+            result = await StudentService.get_record_page(
+                Collection.PROOF_OF_ENROLLMENT,
+                lambda: StudentService.get_enrollment(icloud_conn, lang, refresh),
+                icloud_conn.student_id,
+                page,
+                refresh,
+                fields
+            )
+            result["data"] = select_fields(result["data"], fields)
+            return result
+
+        data = await StudentService.get_enrollment(icloud_conn, lang, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1334,6 +860,11 @@ async def get_enrollment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1342,63 +873,34 @@ async def get_enrollment(
 
 @router.get(
     "/scholarship",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "ship_name": {
-                                            "type": "string",
-                                            "description": "獎助學金名稱"
-                                        },
-                                        "ship_amount": {
-                                            "type": "integer",
-                                            "description": "金額（單位：元）"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "description": "學期資訊",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年（如 113）"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期（1 或 2）"
-                                                }
-                                            },
-                                            "required": ["smye", "smty"]
-                                        }
-                                    },
-                                    "required": ["ship_name", "ship_amount", "t"]
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=PageResponse[List[ScholarshipRecord]],
+    response_model_exclude_unset=True,
     summary="取得獎學金紀錄",
     description="取得獎學金紀錄"
 )
 async def get_scholarship(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(ScholarshipRecord)),
+    page: RecordPageQuery = Depends(),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_scholarship(icloud_conn, refresh)
-        return {"data" : data}
+
+        if page.is_requested:
+            result = await StudentService.get_record_page(
+                Collection.SCHOLARSHIP,
+                lambda: StudentService.get_scholarship(icloud_conn, refresh),
+                icloud_conn.student_id,
+                page,
+                refresh,
+                fields
+            )
+            result["data"] = select_fields(result["data"], fields)
+            return result
+
+        data = await StudentService.get_scholarship(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1409,6 +911,11 @@ async def get_scholarship(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1418,41 +925,20 @@ async def get_scholarship(
 
 @router.get(
     "/printer-point",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "object",
-                                "properties": {
-                                    "point": {
-                                        "type": "integer",
-                                        "description": "獲得的獎懲點數總計"
-                                    }
-                                },
-                                "required": ["point"]
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[PrinterPoint],
+    response_model_exclude_unset=True,
     summary="取得個人列印點數",
     description="取得個人列印點數"
 )
 async def get_printer_point(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(PrinterPoint)),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_printer_point(icloud_conn, refresh)
-        return {"data" : data}
+        data = await StudentService.get_printer_point(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1463,6 +949,11 @@ async def get_printer_point(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1471,92 +962,25 @@ async def get_printer_point(
 
 @router.get(
     "/graduation",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "object",
-                                "properties": {
-                                    "data": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "object",
-                                            "properties": {
-                                                "id": {
-                                                    "type": "string",
-                                                    "description": "資料識別碼"
-                                                },
-                                                "title": {
-                                                    "type": "string",
-                                                    "description": "檢定項目名稱"
-                                                },
-                                                "score": {
-                                                    "type": "string",
-                                                    "description": "得分"
-                                                },
-                                                "issuer": {
-                                                    "type": ["string", "null"],
-                                                    "description": "簽發者"
-                                                },
-                                                "t": {
-                                                    "type": "object",
-                                                    "properties": {
-                                                        "smye": {
-                                                            "type": "integer",
-                                                            "description": "學年"
-                                                        },
-                                                        "smty": {
-                                                            "type": "integer",
-                                                            "description": "學期"
-                                                        }
-                                                    },
-                                                    "required": ["smye", "smty"]
-                                                }
-                                            },
-                                            "required": ["id", "title", "score", "issuer", "t"]
-                                        }
-                                    },
-                                    "passable": {
-                                        "type": "object",
-                                        "properties": {
-                                            "title": {
-                                                "type": "string",
-                                                "description": "畢業門檻名稱"
-                                            },
-                                            "result": {
-                                                "type": "string",
-                                                "description": "達成結果"
-                                            }
-                                        },
-                                        "required": ["title", "result"]
-                                    }
-                                },
-                                "required": ["data", "passable"]
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=DataResponse[Union[
+        GraduationOverview, GraduationWorkplace, GraduationEnglish, GraduationChinese, GraduationComputer
+    ]],
+    response_model_exclude_unset=True,
     summary="取得畢業門檻資訊",
     description="取得畢業門檻資訊，可選擇取得 chinese 中文畢業門檻、english 英文畢業門檻、computer 資訊畢業門檻、workplace_exp 職場體驗畢業門檻、overview 修課學分畢業門檻。"
 )
 async def get_graduation_info(
     graduation_type: GraduationType,
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(*GRADUATION_MODELS.values())),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         sis_conn = ConnectionParser.parse_connection(token, False)
-        data = await GraduationService.get_graduation(sis_conn, graduation_type, refresh)
+        data = await GraduationService.get_graduation(sis_conn, graduation_type, refresh, fields=fields)
 
-        return {"data" : data}
+        # 各類型的欄位相同但紀錄格式不同，依類型指定回應模型
+        return {"data" : GRADUATION_MODELS[graduation_type].model_validate(select_fields(data, fields))}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1572,6 +996,11 @@ async def get_graduation_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1580,70 +1009,34 @@ async def get_graduation_info(
 
 @router.get(
     "/dorm",
-    responses={
-        200: {
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "dorm_space": {
-                                            "type": "string",
-                                            "description": "宿舍名稱"
-                                        },
-                                        "dorm_id": {
-                                            "type": "string",
-                                            "description": "宿舍房間代碼"
-                                        },
-                                        "dorm_no": {
-                                            "type": "integer",
-                                            "description": "寢室人數"
-                                        },
-                                        "dorm_money": {
-                                            "type": "integer",
-                                            "description": "住宿費金額"
-                                        },
-                                        "t": {
-                                            "type": "object",
-                                            "properties": {
-                                                "smye": {
-                                                    "type": "integer",
-                                                    "description": "學年"
-                                                },
-                                                "smty": {
-                                                    "type": "integer",
-                                                    "description": "學期"
-                                                }
-                                            },
-                                            "required": ["smye", "smty"]
-                                        }
-                                    },
-                                    "required": ["dorm_space", "dorm_id", "dorm_no", "dorm_money", "t"]
-                                }
-                            }
-                        },
-                        "required": ["data"]
-                    }
-                }
-            }
-        }
-    },
+    response_model=PageResponse[List[DormRecord]],
+    response_model_exclude_unset=True,
     summary="取得住宿紀錄",
     description="取得住宿紀錄"
 )
 async def get_dorm(
     refresh: bool = Query(False, description="強制更新快取"),
+    fields: Optional[List[str]] = Depends(selectable_fields(DormRecord)),
+    page: RecordPageQuery = Depends(),
     token: dict = Depends(verify_jwt_token)
 ):
     try:
         icloud_conn = ConnectionParser.parse_connection(token, True)
-        data = await StudentService.get_dorm(icloud_conn, refresh)
-        return {"data" : data}
+
+        if page.is_requested:
+            result = await StudentService.get_record_page(
+                Collection.DORM,
+                lambda: StudentService.get_dorm(icloud_conn, refresh),
+                icloud_conn.student_id,
+                page,
+                refresh,
+                fields
+            )
+            result["data"] = select_fields(result["data"], fields)
+            return result
+
+        data = await StudentService.get_dorm(icloud_conn, refresh, fields=fields)
+        return {"data" : select_fields(data, fields)}
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1654,6 +1047,11 @@ async def get_dorm(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except UpstreamUnavailableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,15 +1,22 @@
 import secrets
+from functools import lru_cache
 
 from fastapi import APIRouter, Query
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
-from starlette.templating import Jinja2Templates
 
 from src.config import TERMS_COOKIE_NAME
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory="templates")
+
+@lru_cache(maxsize=None)
+def get_templates():
+    """Jinja2 僅條款頁面使用，於第一次請求時才載入"""
+    from starlette.templating import Jinja2Templates
+
+    return Jinja2Templates(directory="templates")
+
 
 # 接受條款的端點
 @router.post(
@@ -43,7 +50,7 @@ async def accept_terms(
 async def terms_page(
         request: Request,
 ):
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "terms.html",
         {"request": request}
     )
@@ -1,5 +1,8 @@
-from typing import Union
+import asyncio
+import hashlib
+from typing import Union, Optional, Dict, Tuple
 
+from fastapi import BackgroundTasks
 from icloud.icloud import iCloud
 from sis.connection import Connection as SISConn
 from sis.exception import (
@@ -16,23 +19,31 @@ from sis.student_information_system import StudentInformationSystem as SIS
 from starlette import status
 
 from src.config import settings
+from src.database import activity_tracker
 from src.models.api_response import APIResponse
 from src.models.auth import LoginRequest, JWTPayload, Connection, LoginSuccessResponse
+from src.services.warmup_service import WarmupService
 from src.utils.auth import create_jwt_token
 from src.utils.connect_parser import ConnectionParser
+from src.utils.exception import CredentialsRequiredException
 from src.utils.time_unit import TimeUnit
+from src.utils.upstream import Upstream, call_upstream, session_liveness
 
 
 class AuthService:
+    # 進行中的 session 更新，相同學生及密碼的並行請求共用同一結果
+    _pending_refreshes: Dict[Tuple[str, str], asyncio.Future] = {}
+
     @staticmethod
     async def login(
             login_data: LoginRequest,
+            background_tasks: Optional[BackgroundTasks] = None,
     ) -> Union[LoginSuccessResponse, APIResponse]:
-        # login to Sis
-        sis_conn = SIS.login(login_data.username, login_data.password)
-
-        # login to iCloud
-        icloud_conn = iCloud.login(login_data.username, login_data.password)
+        # 同時登入 SIS 及 iCloud，經由上游保護於執行緒池執行
+        sis_conn, icloud_conn = await asyncio.gather(
+            call_upstream(Upstream.SIS, SIS.login, login_data.username, login_data.password),
+            call_upstream(Upstream.ICLOUD, iCloud.login, login_data.username, login_data.password)
+        )
 
         payload = JWTPayload(
             s_id=login_data.username.upper(),
@@ -46,7 +57,104 @@ class AuthService:
             )
         )
 
-        token = create_jwt_token(payload.model_dump())
+        token_data = payload.model_dump()
+        token = create_jwt_token(token_data)
+        if settings.REFRESH_ENABLED:
+            activity_tracker.touch(token_data)
+
+        # 以新的 session 於背景預先抓取常用資料
+        if settings.WARMUP_ENABLED and background_tasks is not None:
+            background_tasks.add_task(
+                WarmupService.warm_up,
+                ConnectionParser.parse_connection(token_data, False),
+                ConnectionParser.parse_connection(token_data, True)
+            )
+
+        return LoginSuccessResponse(
+            access_token=token,
+            token_type="Bearer",
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * TimeUnit.MINUTE
+        )
+
+    @staticmethod
+    async def refresh(
+            payload: dict,
+            login_data: Optional[LoginRequest] = None,
+    ) -> LoginSuccessResponse:
+        """
+        重新簽發 JWT，並僅重新登入已失效的上游 session
+
+        校園系統的 session 只能以帳號密碼重新登入，本服務不保存密碼，因此無法自動重新登入：
+        上游 session 皆有效時不需帳號密碼，僅延長 JWT 有效期限；有 session 失效時需由用戶端提供帳號密碼。
+
+        Args:
+            payload: 目前的 JWT payload
+            login_data: 校園系統帳號密碼，帳號需與 JWT 相同；未提供時僅能更新 session 仍有效的 JWT
+
+        Raises:
+            CredentialsRequiredException: 有 session 失效且未提供帳號密碼
+        """
+        student_id = ConnectionParser.parse_student_id(payload)
+
+        if login_data is not None and login_data.username.upper() != student_id:
+            raise ValueError("Username does not match the token.")
+
+        password_hash = hashlib.sha256(login_data.password.encode()).hexdigest() if login_data else None
+        key = (student_id, password_hash)
+        future = AuthService._pending_refreshes.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(AuthService.__refresh_sessions(payload, login_data))
+            AuthService._pending_refreshes[key] = future
+            future.add_done_callback(lambda _: AuthService._pending_refreshes.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    @staticmethod
+    async def __refresh_sessions(
+            payload: dict,
+            login_data: Optional[LoginRequest],
+    ) -> LoginSuccessResponse:
+        logged_in = await AuthService.test_login_status(payload)
+
+        relogins = [
+            (key, upstream, login)
+            for key, upstream, login in (
+                ("sis", Upstream.SIS, SIS.login),
+                ("ic", Upstream.ICLOUD, iCloud.login),
+            )
+            if not logged_in[key]
+        ]
+
+        if relogins and login_data is None:
+            raise CredentialsRequiredException(
+                f"Session expired for: {', '.join(key for key, _, _ in relogins)}. "
+                "Username and password are required to log in again."
+            )
+
+        # 重新登入已失效的系統，並同時進行
+        connections = await asyncio.gather(*(
+            call_upstream(upstream, login, login_data.username, login_data.password)
+            for _, upstream, login in relogins
+        ))
+
+        token_data = {
+            "s_id": payload["s_id"],
+            "sis": payload["sis"],
+            "ic": payload["ic"],
+        }
+
+        for (key, upstream, _), conn in zip(relogins, connections):
+            token_data[key] = Connection(
+                session_id=conn.php_session_id,
+                login_timestamp=conn.last_login_timestamp
+            ).model_dump()
+            session_liveness.mark(upstream, conn.php_session_id, True)
+
+        token = create_jwt_token(token_data)
+        if settings.REFRESH_ENABLED:
+            activity_tracker.touch(token_data)
+
         return LoginSuccessResponse(
             access_token=token,
             token_type="Bearer",
@@ -55,24 +163,50 @@ class AuthService:
 
     @staticmethod
     async def logout(payload: dict):
+        await activity_tracker.remove(ConnectionParser.parse_student_id(payload))
+
         # 從 Sis 登出
-        SIS.logout(
+        await call_upstream(
+            Upstream.SIS,
+            SIS.logout,
             ConnectionParser.parse_connection(payload, False)
         )
 
         # 從 iCloud 登出
-        iCloud.logout(
+        await call_upstream(
+            Upstream.ICLOUD,
+            iCloud.logout,
             ConnectionParser.parse_connection(payload, True)
         )
 
+        session_liveness.mark(Upstream.SIS, payload["sis"]["session_id"], False)
+        session_liveness.mark(Upstream.ICLOUD, payload["ic"]["session_id"], False)
+
     @staticmethod
     async def test_login_status(
             payload: dict
     ) -> dict:
-        sis_conn = ConnectionParser.parse_connection(payload, False)
-        icloud_conn = ConnectionParser.parse_connection(payload, True)
+        checks = {
+            "sis": (Upstream.SIS, SIS.is_logged_in, ConnectionParser.parse_connection(payload, False)),
+            "ic": (Upstream.ICLOUD, iCloud.is_logged_in, ConnectionParser.parse_connection(payload, True)),
+        }
+
+        # 近期有成功（或失效）的上游呼叫時直接採用紀錄
+        logged_in = {
+            key: session_liveness.get(upstream, conn.php_session_id)
+            for key, (upstream, _, conn) in checks.items()
+        }
+        stale = [key for key, alive in logged_in.items() if alive is None]
+
+        # 僅向上游確認紀錄已過期的系統，並同時進行
+        results = await asyncio.gather(*(
+            call_upstream(checks[key][0], checks[key][1], checks[key][2])
+            for key in stale
+        ))
+
+        for key, result in zip(stale, results):
+            upstream, _, conn = checks[key]
+            logged_in[key] = bool(result)
+            session_liveness.mark(upstream, conn.php_session_id, logged_in[key])
 
-        return {
-            "sis" : SIS.is_logged_in(sis_conn),
-            "ic" : iCloud.is_logged_in(icloud_conn)
-        }
\ No newline at end of file
+        return logged_in
\ No newline at end of file
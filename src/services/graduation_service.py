@@ -1,15 +1,22 @@
-from typing import Optional
+from typing import Optional, List
 
 from sis.connection import Connection
 
 from src.database import cache_manager
 from src.models.api_response import APIResponse
 from src.models.collection import Collection
-from src.routes.student import GraduationType
+from src.models.GraduationType import GraduationType
 
 from sis.student_information_system import StudentInformationSystem as SIS
 
 from src.utils.exception import InvalidFormatException
+from src.utils.upstream import Upstream, call_upstream
+from src.utils.transform import RecordTransformer
+
+GRADUATION_RECORD = RecordTransformer(
+    nest={"t": {"smye": "year", "smty": "semester"}},
+    casts={"year": int, "semester": int}
+)
 
 
 class GraduationService:
@@ -29,15 +36,16 @@ class GraduationService:
     async def get_graduation(
             sis_conn: Connection,
             graduation_type: GraduationType,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
 
         collection = GraduationService.__get_collection_by_type(graduation_type)
 
         # 嘗試從快取獲取資料
-        cache_data = await cache_manager.get_cache(collection, sis_conn.student_id, refresh=refresh)
+        cache_data = await cache_manager.get_cache(collection, sis_conn.student_id, refresh=refresh, fields=fields)
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 使用字典映射來選擇對應的函數
@@ -53,23 +61,23 @@ class GraduationService:
         if not fetch_function:
             raise InvalidFormatException("Invalid graduation type")
 
+        async def fetch():
+            data = await call_upstream(Upstream.SIS, fetch_function, sis_conn)
+
+            if data and ( graduation_type == GraduationType.COMPUTER
+                          or graduation_type == GraduationType.CHINESE
+            or graduation_type == GraduationType.ENGLISH):
+                GRADUATION_RECORD(data['data'])
 
-        data = fetch_function(sis_conn)
-        if data and ( graduation_type == GraduationType.COMPUTER
-                      or graduation_type == GraduationType.CHINESE
-        or graduation_type == GraduationType.ENGLISH):
-            for i in data['data']:
-                year = i['year']
-                sem = i['semester']
-                del i['year']
-                del i['semester']
-                i['t'] = {
-                    "smye": int(year),
-                    "smty": int(sem)
-                }
 
+            # 更新快取
+            await cache_manager.set_cache(collection, sis_conn.student_id, data)
 
-        # 更新快取
-        await cache_manager.set_cache(collection, sis_conn.student_id, data)
+            return data
 
-        return data
\ No newline at end of file
+        return await cache_manager.with_stale_fallback(
+            collection,
+            sis_conn.student_id,
+            fetch,
+            fields=fields
+        )
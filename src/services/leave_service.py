@@ -1,29 +1,27 @@
-import contextlib
 import json
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from io import BytesIO
 from pathlib import Path
-from typing import List, Optional, Any, Coroutine
+from typing import List, Optional, Any, Coroutine, Iterable, Tuple
 
-import aiofiles
 from fastapi import UploadFile
+from fastapi.encoders import jsonable_encoder
 from pydantic import ValidationError
 from sis.connection import Connection
 from sis.course.leave.constant.departments import Department
 from sis.course.leave.constant.leave_type import LeaveType
-from sis.course.leave.modals.leave_form_data.course_leave_form_data import CourseLeaveFormData
-from sis.modals.course import CourseWithDate
 
-from src.models.leave import LeaveRequest
+from src.config import settings
+from src.database import cache_manager
+from src.models.collection import Collection
 
 from sis.student_information_system import StudentInformationSystem as SIS
 
 from src.utils.connect_parser import ConnectionParser
 from src.utils.exception import UnsupportedFileTypeException, OutOfFileSizeException, InvalidFormatException
-
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-TEMP_FILE_DIR = BASE_DIR / "temp"
-TEMP_FILE_DIR.mkdir(parents=True, exist_ok=True)
+from src.utils.time_unit import campus_now
+from src.utils.upstream import Upstream, call_upstream
 
 class LeaveService:
     @staticmethod
@@ -31,12 +29,121 @@ class LeaveService:
         student_id : str,
         start_date: date,
         end_date: date,
-    ) -> List[CourseWithDate]:
-        return SIS.course_leave.info(start_date, end_date, student_id)
+    ) -> List[dict]:
+        """
+        取得可請假課程，以日期為單位快取
+
+        每日課程於學期內固定，不含請假狀態快取於 LEAVE_COURSE；各課程的請假狀態 (course_pending) 會因審核、
+        取消或於 SIS 網站請假而變動，另以較短的快取時間快取於 LEAVE_PENDING，回傳時再合併。
+        僅向校園伺服器查詢任一快取失效的日期（連續日期合併為單次查詢）。
+        """
+        days = [day.isoformat() for day in
+                (start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1))]
+
+        day_courses = await cache_manager.get_keyed_caches(Collection.LEAVE_COURSE, student_id, days)
+        day_pending = await cache_manager.get_keyed_caches(Collection.LEAVE_PENDING, student_id, days)
+
+        # 當日無課程時不會有請假狀態
+        missing = [
+            date.fromisoformat(day) for day in days
+            if day not in day_courses or (day_courses[day] and day not in day_pending)
+        ]
+
+        for range_start, range_end in LeaveService.__group_consecutive_days(missing):
+            courses = jsonable_encoder(
+                await call_upstream(Upstream.SIS, SIS.course_leave.info, range_start, range_end, student_id)
+            ) or []
+
+            fetched = {
+                (range_start + timedelta(days=n)).isoformat(): []
+                for n in range((range_end - range_start).days + 1)
+            }
+
+            for course in courses:
+                course_date = course.get("course_date") if isinstance(course, dict) else None
+                if course_date not in fetched:
+                    # 無法依日期拆分時不快取此區間
+                    fetched = None
+                    break
+                fetched[course_date].append(course)
+
+            if fetched is None:
+                day_courses[range_start.isoformat()] = courses
+                day_pending.pop(range_start.isoformat(), None)
+                continue
+
+            static = {
+                key: [{k: v for k, v in course.items() if k != "course_pending"} for course in value]
+                for key, value in fetched.items()
+            }
+            pending = {
+                key: [LeaveService.__pending_state(course) for course in value]
+                for key, value in fetched.items()
+                if value
+            }
+            day_courses.update(static)
+            day_pending.update(pending)
+
+            await cache_manager.set_keyed_caches(
+                Collection.LEAVE_COURSE,
+                student_id,
+                static,
+                settings.LEAVE_COURSE_CACHE_DURATION
+            )
+            await cache_manager.set_keyed_caches(
+                Collection.LEAVE_PENDING,
+                student_id,
+                pending,
+                settings.LEAVE_PENDING_CACHE_DURATION
+            )
+
+        return [
+            LeaveService.__with_pending_state(course, day_pending.get(day))
+            for day in days
+            for course in day_courses.get(day, [])
+        ]
+
+    @staticmethod
+    def __pending_state(course: dict) -> dict:
+        """課程的請假狀態，以課程編號及節次識別"""
+        return {
+            "course_id": course.get("course_id"),
+            "course_period": course.get("course_period"),
+            "course_pending": course.get("course_pending")
+        }
+
+    @staticmethod
+    def __with_pending_state(course: dict, states: Optional[List[dict]]) -> dict:
+        """合併每日課程與其請假狀態，無法拆分而未快取的課程已含請假狀態"""
+        if states is None:
+            return course
+
+        for state in states:
+            if state["course_id"] == course.get("course_id") and state["course_period"] == course.get("course_period"):
+                return {**course, "course_pending": state["course_pending"]}
+
+        return course
+
+    @staticmethod
+    def __group_consecutive_days(days: List[date]) -> Iterable[Tuple[date, date]]:
+        """將已排序的日期合併為連續區間"""
+        range_start = range_end = None
+
+        for day in days:
+            if range_end is not None and day - range_end == timedelta(days=1):
+                range_end = day
+                continue
+
+            if range_start is not None:
+                yield range_start, range_end
+            range_start = range_end = day
+
+        if range_start is not None:
+            yield range_start, range_end
 
     @staticmethod
     async def get_leave_types():
-        return (
+        return [
             {
                 "id": leave_type.value,
                 "locale" : {
@@ -45,11 +152,11 @@ class LeaveService:
                 }
             }
             for leave_type in LeaveType
-        )
+        ]
 
     @staticmethod
     async def get_school_departments():
-        return (
+        return [
             {
                 "id": department.value,
                 "locale" : {
@@ -58,7 +165,7 @@ class LeaveService:
                 }
             }
             for department in Department
-        )
+        ]
 
     MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
     ALLOWED_FILE_TYPES = {
@@ -70,31 +177,74 @@ class LeaveService:
         "application/octet-stream"
     }
 
-    TEMP_DIR = Path(__file__).resolve().parent.parent.parent / "temp"
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)  # 確保 TEMP 目錄存在
+    READ_CHUNK_SIZE = 64 * 1024  # 64KB
+
+    # 檔案開頭的特徵位元組，以實際內容判斷檔案類型而非信任用戶端宣告
+    FILE_SIGNATURES = (
+        (b"\xff\xd8\xff", "image/jpeg"),
+        (b"\x89PNG\r\n\x1a\n", "image/png"),
+        (b"%PDF-", "application/pdf"),
+        (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/msword"),  # OLE 複合文件 (.doc)
+        (b"PK\x03\x04", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),  # ZIP (.docx)
+    )
 
     @staticmethod
-    async def checking_and_get_contents(file : UploadFile) -> bytes | None:
+    def sniff_content_type(head: bytes) -> Optional[str]:
+        """依檔案開頭的特徵位元組判斷檔案類型，無法辨識時回傳 None"""
+        for signature, content_type in LeaveService.FILE_SIGNATURES:
+            if head.startswith(signature):
+                return content_type
+
+        return None
+
+    @staticmethod
+    async def read_attachment(file : UploadFile) -> BytesIO:
+        """
+        分段讀取上傳檔案至記憶體緩衝區，超過大小上限時立即中止
+
+        緩衝區直接交由 SIS 上傳，不再寫入暫存檔，呼叫端需以 with 確保釋放。
+        """
         if file.content_type not in LeaveService.ALLOWED_FILE_TYPES:
             raise UnsupportedFileTypeException(
                 f"Invalid file type: {file.content_type}. Allowed types: {', '.join(LeaveService.ALLOWED_FILE_TYPES)}"
             )
 
-        contents = await file.read()
-        if len(contents) > LeaveService.MAX_FILE_SIZE:
-            raise OutOfFileSizeException("File size must be less than 2MB.")
+        buffer = BytesIO()
 
-        return contents
+        try:
+            while chunk := await file.read(LeaveService.READ_CHUNK_SIZE):
+                if buffer.tell() == 0:
+                    LeaveService.__check_file_signature(file.content_type, chunk)
+                if buffer.tell() + len(chunk) > LeaveService.MAX_FILE_SIZE:
+                    raise OutOfFileSizeException("File size must be less than 2MB.")
+                buffer.write(chunk)
+
+            if buffer.tell() == 0:
+                raise UnsupportedFileTypeException("File is empty.")
+        except BaseException:
+            buffer.close()
+            raise
+
+        buffer.seek(0)
+        # 上傳時以 name 作為檔名，沿用原本暫存檔的命名方式
+        buffer.name = f"{uuid.uuid4()}{Path(file.filename or '').suffix}"
+
+        return buffer
 
     @staticmethod
-    async def save_contents_and_get_path(filename : str, contents : bytes) -> Path:
-        temp_file_path = LeaveService.TEMP_DIR / f"{uuid.uuid4()}{Path(filename).suffix}"
+    def __check_file_signature(declared_type: str, head: bytes) -> None:
+        detected_type = LeaveService.sniff_content_type(head)
 
-        # 使用 `aiofiles` 非同步存檔
-        async with aiofiles.open(temp_file_path, "wb") as f:
-            await f.write(contents)
+        if detected_type is None:
+            raise UnsupportedFileTypeException(
+                f"Unrecognized file content. Allowed types: {', '.join(LeaveService.ALLOWED_FILE_TYPES)}"
+            )
 
-        return temp_file_path
+        # application/octet-stream 未宣告實際類型，以偵測結果為準
+        if declared_type != "application/octet-stream" and declared_type != detected_type:
+            raise UnsupportedFileTypeException(
+                f"File content ({detected_type}) does not match declared type: {declared_type}."
+            )
 
     @staticmethod
     async def create_leave(
@@ -105,16 +255,9 @@ class LeaveService:
             from_dept: Optional[Department],
             file: Optional[UploadFile],
     ):
-        temp_file_path = None
-
-        if file:
-            contents = await LeaveService.checking_and_get_contents(file)
-
-            # save file to local
-            temp_file_path = await LeaveService.save_contents_and_get_path(
-                file.filename,
-                contents
-            )
+        # 請假表單模型僅送出請假時使用，延後至第一次送出時才載入以縮短啟動時間
+        from sis.course.leave.modals.leave_form_data.course_leave_form_data import CourseLeaveFormData
+        from sis.modals.course import CourseWithDate
 
         # 解析 `course_info` JSON
         try:
@@ -135,46 +278,127 @@ class LeaveService:
             raise InvalidFormatException(f"Invalid course info format: {str(e)}")
 
         # 準備請假表單
-        with contextlib.ExitStack() as stack:
-            file_obj = stack.enter_context(open(temp_file_path, "rb")) if temp_file_path else None
+        file_obj = await LeaveService.read_attachment(file) if file else None
 
+        try:
             form = CourseLeaveFormData(
                 course=courses,
                 leave_type=leave_type,
                 reason=reason,
                 from_dept=from_dept,
-                file=file_obj  # 只有當檔案存在時才打開
+                file=file_obj  # 只有當檔案存在時才附加
             )
 
             # 呼叫 SIS API
-            response_data = SIS.course_leave.send(sis_conn, form)
-
-        # 清理臨時檔案
-        if temp_file_path and temp_file_path.exists():
-            temp_file_path.unlink()
+            response_data = await call_upstream(Upstream.SIS, SIS.course_leave.send, sis_conn, form)
+        finally:
+            if file_obj:
+                file_obj.close()
+
+        # 請假日期的請假狀態已變動，下次查詢時重新向校園伺服器取得
+        await cache_manager.delete_keyed_caches(
+            Collection.LEAVE_PENDING,
+            sis_conn.student_id,
+            sorted({course.course_date.isoformat() for course in courses})
+        )
+        await cache_manager.delete_cache(Collection.LEAVE_HISTORY, sis_conn.student_id)
 
         return response_data
 
     @staticmethod
     async def get_leave_history(
             sis_conn: Connection,
+            refresh: bool = False
     ):
-        return SIS.course_leave.list(sis_conn)
+        cache_data = await cache_manager.get_cache(
+            Collection.LEAVE_HISTORY,
+            sis_conn.student_id,
+            refresh=refresh
+        )
+
+        if cache_data is not None:
+            return cache_data
+
+        async def fetch():
+            data = jsonable_encoder(await call_upstream(Upstream.SIS, SIS.course_leave.list, sis_conn))
+
+            await cache_manager.set_cache(
+                Collection.LEAVE_HISTORY,
+                sis_conn.student_id,
+                data,
+                cache_duration=settings.LEAVE_HISTORY_CACHE_DURATION
+            )
+
+            return data
+
+        return await cache_manager.with_stale_fallback(
+            Collection.LEAVE_HISTORY,
+            sis_conn.student_id,
+            fetch
+        )
 
     @staticmethod
     async def get_leave_details(
             sis_conn: Connection,
             leave_id: str,
             get_message: bool,
+            refresh: bool = False
     ):
-        return SIS.course_leave.detail(sis_conn, leave_id, get_message)
+        key = LeaveService.__detail_key(leave_id, get_message)
+
+        if not refresh:
+            cache_data = await cache_manager.get_keyed_caches(
+                Collection.LEAVE_DETAIL,
+                sis_conn.student_id,
+                [key]
+            )
+            if key in cache_data:
+                return cache_data[key]
+
+        data = jsonable_encoder(
+            await call_upstream(Upstream.SIS, SIS.course_leave.detail, sis_conn, leave_id, get_message)
+        )
+
+        await cache_manager.set_keyed_caches(
+            Collection.LEAVE_DETAIL,
+            sis_conn.student_id,
+            {key: data},
+            settings.LEAVE_HISTORY_CACHE_DURATION
+        )
+
+        return data
+
+    @staticmethod
+    def __detail_key(leave_id: str, get_message: bool) -> str:
+        return f"{leave_id}:{int(get_message)}"
+
+    @staticmethod
+    async def __invalidate_leave(student_id: str, leave_id: str) -> None:
+        """假單經由本服務變更後，使該學生的請假紀錄及該假單詳細資訊快取失效"""
+        await cache_manager.delete_cache(Collection.LEAVE_HISTORY, student_id)
+        await cache_manager.delete_keyed_caches(
+            Collection.LEAVE_DETAIL,
+            student_id,
+            [LeaveService.__detail_key(leave_id, get_message) for get_message in (False, True)]
+        )
 
     @staticmethod
     async def cancel_leave(
             sis_conn : Connection,
             leave_id: str
     ):
-        return SIS.course_leave.cancel(sis_conn, leave_id)
+        response_data = await call_upstream(Upstream.SIS, SIS.course_leave.cancel, sis_conn, leave_id)
+
+        await LeaveService.__invalidate_leave(sis_conn.student_id, leave_id)
+
+        # 無法得知該假單的日期，使今日起的請假狀態快取全部失效，每日課程不受影響
+        await cache_manager.delete_keyed_caches(
+            Collection.LEAVE_PENDING,
+            sis_conn.student_id,
+            min_key=campus_now().date().isoformat()
+        )
+
+        return response_data
 
     @staticmethod
     async def upload_document(
@@ -182,24 +406,9 @@ class LeaveService:
             leave_id: str,
             file: UploadFile,
     ):
-        contents = await LeaveService.checking_and_get_contents(file)
-
-        # save file to local
-        temp_file_path = await LeaveService.save_contents_and_get_path(
-            file.filename,
-            contents
-        )
-
-        if not temp_file_path:
-            raise FileNotFoundError(f"File not found: {file.filename}")
-
-        with contextlib.ExitStack() as stack:
-            file_obj = stack.enter_context(open(temp_file_path, "rb"))
-
-            response_data = SIS.course_leave.submit_document(sis_conn, leave_id, file_obj)
+        with await LeaveService.read_attachment(file) as file_obj:
+            response_data = await call_upstream(Upstream.SIS, SIS.course_leave.submit_document, sis_conn, leave_id, file_obj)
 
-        # 清理臨時檔案
-        if temp_file_path and temp_file_path.exists():
-            temp_file_path.unlink()
+        await LeaveService.__invalidate_leave(sis_conn.student_id, leave_id)
 
         return response_data
\ No newline at end of file
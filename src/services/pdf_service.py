@@ -6,6 +6,7 @@ from icloud.icloud import iCloud
 
 from src.models.api_response import APIResponse
 from src.utils.semester_manager import SemesterManager
+from src.utils.upstream import Upstream, call_upstream
 
 
 class PDFService:
@@ -13,7 +14,9 @@ class PDFService:
     async def graduation(
             sis_conn: Connection
     ):
-        return SIS.personal_info.graduation.pdf(
+        return await call_upstream(
+            Upstream.SIS,
+            SIS.personal_info.graduation.pdf,
             sis_conn
         )
 
@@ -26,13 +29,17 @@ class PDFService:
     ):
         if not year and not seme:
             semester = await SemesterManager.get_current_semester(icloud_conn)
-            return SIS.personal_info.personal_course_list_pdf(
+            return await call_upstream(
+                Upstream.SIS,
+                SIS.personal_info.personal_course_list_pdf,
                 sis_conn.student_id,
                 semester.year,
                 semester.seme
             )
 
-        return SIS.personal_info.personal_course_list_pdf(
+        return await call_upstream(
+                Upstream.SIS,
+                SIS.personal_info.personal_course_list_pdf,
                 sis_conn.student_id,
                 year,
                 seme
@@ -46,13 +53,17 @@ class PDFService:
     ):
         if not year and not seme:
             semester = await SemesterManager.get_current_semester(icloud_conn)
-            return iCloud.personal_information.proof_of_enrollment_pdf(
+            return await call_upstream(
+                Upstream.ICLOUD,
+                iCloud.personal_information.proof_of_enrollment_pdf,
                 icloud_conn,
                 semester.year,
                 semester.seme
             )
 
-        return iCloud.personal_information.proof_of_enrollment_pdf(
+        return await call_upstream(
+            Upstream.ICLOUD,
+            iCloud.personal_information.proof_of_enrollment_pdf,
             icloud_conn,
             year,
             seme
@@ -66,13 +77,17 @@ class PDFService:
     ):
         if not year and not seme:
             semester = await SemesterManager.get_current_semester(icloud_conn)
-            return iCloud.course_information.timetable_pdf(
+            return await call_upstream(
+                Upstream.ICLOUD,
+                iCloud.course_information.timetable_pdf,
                 icloud_conn,
                 semester.year,
                 semester.seme
             )
 
-        return iCloud.course_information.timetable_pdf(
+        return await call_upstream(
+                Upstream.ICLOUD,
+                iCloud.course_information.timetable_pdf,
                 icloud_conn,
                 year,
                 seme
@@ -0,0 +1,184 @@
+import asyncio
+import contextlib
+import os
+import socket
+import time
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from src.config import settings
+from src.database import db, cache_manager, activity_tracker
+from src.services.warmup_service import WarmupService
+from src.utils.connect_parser import ConnectionParser
+from src.utils.exception import UpstreamUnavailableException
+from src.utils.time_unit import campus_now
+
+SCHEDULER_LOCK_COLLECTION = "scheduler_locks"
+
+
+class TokenBucket:
+    """令牌桶，限制背景工作對校園伺服器的全域請求速率"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(float(self.capacity), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RefreshScheduler:
+    """
+    背景批次更新排程
+
+    於離峰時段找出近期活躍學生即將過期的快取，使用其仍有效的 session 提前重新抓取，
+    使尖峰時段的請求幾乎皆能直接命中快取。多個 worker 同時運行時以資料庫租約確保僅一個執行，
+    執行期間每半個租約時間續約一次，受速率限制而執行較久時租約亦不會過期。
+    """
+    LOCK_ID = "cache_refresh"
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.bucket = TokenBucket(settings.REFRESH_RATE_PER_SECOND, settings.REFRESH_RATE_BURST)
+        self._task: Optional[asyncio.Task] = None
+        self._lease_renewed = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    @staticmethod
+    def is_off_peak(hour: int) -> bool:
+        start = settings.REFRESH_OFF_PEAK_START_HOUR
+        end = settings.REFRESH_OFF_PEAK_END_HOUR
+
+        if start <= end:
+            return start <= hour < end
+
+        # 跨越午夜，例如 23 點至 6 點
+        return hour >= start or hour < end
+
+    async def _acquire_lock(self) -> bool:
+        """取得或續約排程租約"""
+        now = int(time.time())
+
+        try:
+            await db[SCHEDULER_LOCK_COLLECTION].find_one_and_update(
+                {
+                    "_id": self.LOCK_ID,
+                    "$or": [{"owner": self.owner}, {"expires_timestamp": {"$lt": now}}]
+                },
+                {"$set": {"owner": self.owner, "expires_timestamp": now + settings.REFRESH_LEASE_DURATION}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # 租約由其他 worker 持有
+            return False
+
+        self._lease_renewed = time.monotonic()
+        return True
+
+    async def _keep_lock(self) -> bool:
+        """執行期間續約租約，距上次續約超過半個租約時間時才寫入資料庫"""
+        if time.monotonic() - self._lease_renewed < settings.REFRESH_LEASE_DURATION / 2:
+            return True
+
+        return await self._acquire_lock()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REFRESH_CHECK_INTERVAL)
+
+            if not self.is_off_peak(campus_now().hour):
+                continue
+
+            try:
+                if await self._acquire_lock():
+                    await self.run_once()
+            except Exception:
+                # 本輪失敗，待下一輪再試
+                pass
+
+    async def run_once(self) -> int:
+        """
+        執行一輪批次更新
+
+        Returns:
+            成功更新的快取數量
+        """
+        sessions = {
+            session["_id"]: session
+            for session in await activity_tracker.get_active_sessions(settings.REFRESH_ACTIVE_WINDOW)
+        }
+        refreshed = 0
+
+        for collection in settings.REFRESH_COLLECTIONS:
+            fetcher = WarmupService.FETCHERS.get(collection)
+            if not fetcher or not sessions:
+                continue
+
+            # 離峰時段結束或租約遭其他 worker 取得時停止
+            if not self.is_off_peak(campus_now().hour) or not await self._acquire_lock():
+                break
+
+            expiring = await cache_manager.get_expiring_student_ids(
+                collection,
+                list(sessions),
+                settings.REFRESH_AHEAD
+            )
+
+            for student_id in expiring:
+                session = sessions.get(student_id)
+                if session is None:
+                    continue
+
+                token = {"s_id": student_id, "sis": session["sis"], "ic": session["ic"]}
+
+                await self.bucket.acquire()
+
+                # 租約遭其他 worker 取得時停止，避免重複更新
+                if not await self._keep_lock():
+                    return refreshed
+
+                try:
+                    await fetcher(
+                        ConnectionParser.parse_connection(token, False),
+                        ConnectionParser.parse_connection(token, True),
+                        True
+                    )
+                    refreshed += 1
+                except KeyError:
+                    # 上游 session 已失效，不再使用
+                    del sessions[student_id]
+                    await activity_tracker.remove(student_id)
+                except UpstreamUnavailableException:
+                    # 上游異常時停止本輪，避免加重負擔
+                    return refreshed
+                except Exception:
+                    continue
+
+        return refreshed
+
+
+refresh_scheduler = RefreshScheduler()
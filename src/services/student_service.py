@@ -7,76 +7,124 @@ from icloud.personal.utils.icloud_utils import iCloudUtils
 from sis.connection import Connection
 from sis.student_information_system import StudentInformationSystem as SIS
 from starlette import status
-from typing import Optional
+from typing import Optional, List, Callable, Awaitable
 
+from src.config import settings
 from src.models.api_response import APIResponse
 from src.models.collection import Collection
 from src.database import cache_manager
 from src.utils.exception import StudentInfoNotFoundException, NotFoundException
+from src.utils.pagination import RecordPageQuery
 from src.utils.semester_manager import SemesterManager
+from src.utils.time_unit import campus_now
+from src.utils.timetable_index import TimetableIndex
+from src.utils.upstream import Upstream, call_upstream
+from src.utils.transform import RecordTransformer, SEMESTER_TERM
+
+TIMETABLE_INDEX = TimetableIndex(settings.TIMETABLE_PERIOD_TIMES)
+SCHOLARSHIP_RECORD = RecordTransformer(
+    nest={"t": {"smye": "year", "smty": "sem"}},
+    drops=("ship_pay",)
+)
+DORM_RECORD = RecordTransformer(
+    nest={"t": {"smye": "year", "smty": "sem"}},
+    drops=("elec_mon", "dorm_elec_money")
+)
+ENROLLMENT_RECORD = RecordTransformer(
+    nest={"t": {"smye": "smye", "smty": "smty"}},
+    casts={"smty": int}
+)
+ANNUAL_GRADE_RECORD = RecordTransformer(
+    nest={"t": {"smye": "year", "smty": "sem"}},
+    casts={"year": int, "sem": int}
+)
 
 
 class StudentService:
     @staticmethod
-    async def get_student_info(sis_conn: Connection, refresh: bool = False) -> APIResponse:
+    async def get_student_info(
+            sis_conn: Connection,
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
+    ) -> APIResponse:
         cache_data = await cache_manager.get_cache(
             Collection.STUDENT_PROFILE,
             sis_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取學生資訊
-        data = SIS.personal_info.privacy(sis_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.SIS, SIS.personal_info.privacy, sis_conn)
 
-        if not data:
-            raise StudentInfoNotFoundException("Failed to fetch student information")
+            if not data:
+                raise StudentInfoNotFoundException("Failed to fetch student information")
+
+            await cache_manager.set_cache(
+                Collection.STUDENT_PROFILE,
+                sis_conn.student_id,
+                data
+            )
 
-        await cache_manager.set_cache(
+            return data
+
+        return await cache_manager.with_stale_fallback(
             Collection.STUDENT_PROFILE,
             sis_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
 
     @staticmethod
     async def get_student_semester(
             icloud_conn: Connection,
             refresh: bool = False,
+            fields: Optional[List[str]] = None
     ) -> APIResponse:
         cache_data = await cache_manager.get_cache(
             Collection.STUDENT_SEMESTER,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 iCloud 系統獲取學期資訊
-        data = iCloudUtils.student_semester(icloud_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloudUtils.student_semester, icloud_conn)
 
-        if not data:
-            raise NotFoundException("Failed to fetch student semester information")
+            if not data:
+                raise NotFoundException("Failed to fetch student semester information")
 
-        await cache_manager.set_cache(
+            await cache_manager.set_cache(
+                Collection.STUDENT_SEMESTER,
+                icloud_conn.student_id,
+                data
+            )
+
+            return data
+
+        return await cache_manager.with_stale_fallback(
             Collection.STUDENT_SEMESTER,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_course_timetable(
             icloud_conn: Connection,
             refresh: bool = False,
             year: Optional[str] = None,
-            seme: Optional[str] = None
+            seme: Optional[str] = None,
+            fields: Optional[List[str]] = None
     ) -> APIResponse:
         """
         取得課程資訊
@@ -88,17 +136,20 @@ class StudentService:
         """
 
         # 如果沒有提供學年學期，則取得當前學期
+        current_semester = None
         if not seme or not year:
             semester = await SemesterManager.get_current_semester(icloud_conn)
             year = semester.year
             seme = semester.seme
+            current_semester = {"year": year, "semester": seme}
             cache_data = await cache_manager.get_cache(
                 Collection.COURSE_TIMETABLE,
                 icloud_conn.student_id,
                 semester={
                     "year": semester.year,
                     "semester": semester.seme
-                }
+                },
+                fields=fields
             )
         else:
             cache_data = await cache_manager.get_cache(
@@ -107,70 +158,178 @@ class StudentService:
                 semester={
                     "year": year,
                     "semester": seme
-                }
+                },
+                fields=fields
             )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程資訊
+        async def fetch():
+            data = await call_upstream(
+                Upstream.ICLOUD,
+                iCloud.course_information.timetable,
+                icloud_conn,
+                year,
+                seme
+            )
 
-        data = iCloud.course_information.timetable(
-            icloud_conn,
-            year,
-            seme
-        )
+            if not data:
+                raise NotFoundException("Failed to fetch course information")
 
-        if not data:
-            raise NotFoundException("Failed to fetch course information")
+            semester_key = current_semester or await SemesterManager.get_current_semester_key(icloud_conn)
+            await cache_manager.set_cache(
+                Collection.COURSE_TIMETABLE,
+                icloud_conn.student_id,
+                data,
+                semester={
+                    "year": year,
+                    "semester": seme
+                },
+                current_semester=semester_key
+            )
+            # 每份課表快取建立一次索引
+            await cache_manager.set_cache(
+                Collection.COURSE_TIMETABLE_INDEX,
+                icloud_conn.student_id,
+                TIMETABLE_INDEX.build(data),
+                semester={
+                    "year": year,
+                    "semester": seme
+                },
+                current_semester=semester_key
+            )
+
+            return data
 
-        await cache_manager.set_cache(
+        return await cache_manager.with_stale_fallback(
             Collection.COURSE_TIMETABLE,
             icloud_conn.student_id,
-            data,
+            fetch,
             semester={
                 "year": year,
                 "semester": seme
-            }
+            },
+            fields=fields
+        )
+
+    @staticmethod
+    async def get_timetable_index(icloud_conn: Connection, refresh: bool = False) -> dict:
+        """
+        取得當前學期的課表索引
+
+        索引於課表自上游取得時一併建立；課表快取早於索引建立時，由課表快取補建。
+        """
+        semester = await SemesterManager.get_current_semester(icloud_conn)
+        target = {"year": semester.year, "semester": semester.seme}
+
+        if not refresh:
+            cache_data = await cache_manager.get_cache(
+                Collection.COURSE_TIMETABLE_INDEX,
+                icloud_conn.student_id,
+                semester=target
+            )
+            if cache_data is not None:
+                return cache_data
+
+        timetable = await StudentService.get_course_timetable(
+            icloud_conn,
+            refresh,
+            year=semester.year,
+            seme=semester.seme
         )
 
+        index = await cache_manager.get_cache(
+            Collection.COURSE_TIMETABLE_INDEX,
+            icloud_conn.student_id,
+            semester=target
+        )
+        if index is None:
+            index = TIMETABLE_INDEX.build(timetable)
+            await cache_manager.set_cache(
+                Collection.COURSE_TIMETABLE_INDEX,
+                icloud_conn.student_id,
+                index,
+                semester=target,
+                current_semester=target
+            )
+
+        return index
+
+    @staticmethod
+    async def get_today_courses(icloud_conn: Connection, week: Optional[int] = None, refresh: bool = False) -> dict:
+        """
+        取得指定星期（預設為校園時區的今天）的課程及空堂
+        """
+        index = await StudentService.get_timetable_index(icloud_conn, refresh)
+        return TIMETABLE_INDEX.today(index, week or campus_now().isoweekday())
+
+    @staticmethod
+    async def get_next_course(icloud_conn: Connection, refresh: bool = False) -> dict:
+        """
+        取得下一堂課
+        """
+        index = await StudentService.get_timetable_index(icloud_conn, refresh)
+        data = TIMETABLE_INDEX.next(index)
+        if data is None:
+            raise NotFoundException("No upcoming course in current timetable")
+
         return data
 
+    @staticmethod
+    async def get_classroom_courses(icloud_conn: Connection, classroom: str, refresh: bool = False) -> list:
+        """
+        取得指定教室於當前學期的課程
+        """
+        index = await StudentService.get_timetable_index(icloud_conn, refresh)
+        return TIMETABLE_INDEX.location(index, classroom)
+
     @staticmethod
     async def get_course_warning(
             sis_conn: Connection,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.COURSE_WARNING,
             sis_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = SIS.personal_info.course_warning(sis_conn)
-        data = [d.__dict__ for d in data]
+        async def fetch():
+            data = await call_upstream(Upstream.SIS, SIS.personal_info.course_warning, sis_conn)
+            data = [d.__dict__ for d in data]
 
-        if not data:
-            raise NotFoundException("Failed to fetch course warning information")
+            if not data:
+                raise NotFoundException("Failed to fetch course warning information")
 
-        await cache_manager.set_cache(
+            await cache_manager.set_cache(
+                Collection.COURSE_WARNING,
+                sis_conn.student_id,
+                data
+            )
+
+            return data
+
+        return await cache_manager.with_stale_fallback(
             Collection.COURSE_WARNING,
             sis_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_barcode(
             sis_conn: Connection,
     ):
         # 從 SIS 系統獲取條碼資訊
-        data = SIS.personal_info.personal_barcode(sis_conn.student_id)
+        data = await call_upstream(Upstream.SIS, SIS.personal_info.personal_barcode, sis_conn.student_id)
 
         if not data:
             raise NotFoundException("Failed to fetch barcode information")
@@ -182,133 +341,180 @@ class StudentService:
             sis_conn: Connection,
     ):
         # 從 SIS 系統獲取條碼資訊
-        data = SIS.personal_info.personal_image(sis_conn.student_id)
+        data = await call_upstream(Upstream.SIS, SIS.personal_info.personal_image, sis_conn.student_id)
 
         if not data:
             raise NotFoundException("Failed to fetch personal image")
 
         return data
 
+    @staticmethod
+    async def get_record_page(
+            collection: Collection,
+            fetch: Callable[[], Awaitable[Optional[list]]],
+            student_id: str,
+            page: RecordPageQuery,
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
+    ) -> dict:
+        """
+        依學年學期篩選並以 cursor 分頁取得紀錄列表
+
+        快取有效時於資料庫端展開列表篩選，僅傳回該頁紀錄；否則經由 fetch 取得完整列表（同時更新快取）後於記憶體中分頁。
+
+        Args:
+            collection: 紀錄列表的快取集合
+            fetch: 取得完整紀錄列表的服務函數
+            student_id: 學生學號
+            page: 篩選及分頁參數
+            refresh: 是否強制更新快取
+            fields: 僅取得紀錄中的指定欄位
+        """
+        records = None
+
+        if not refresh:
+            records = await cache_manager.get_cache_records(
+                collection,
+                student_id,
+                match=page.mongo_match(),
+                after=page.cursor,
+                limit=page.limit + 1 if page.limit is not None else None,
+                fields=fields
+            )
+
+        if records is not None:
+            data, next_cursor = page.split(records)
+        else:
+            data, next_cursor = page.paginate(await fetch())
+
+        return {
+            "data": data,
+            "next_cursor": next_cursor
+        }
+
     @staticmethod
     async def get_injury(
             icloud_conn: Connection,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.INJURY,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.injury_record(icloud_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.injury_record, icloud_conn)
+
+            # 無紀錄時快取空列表，以較短的有效期避免每次請求皆重新向上游查詢
+            data = data or []
+            SEMESTER_TERM(data)
+
+            await cache_manager.set_cache(
+                Collection.INJURY,
+                icloud_conn.student_id,
+                data
+            )
 
-        if not data:
             return data
-        else:
-            for i in data:
-                year = i['year']
-                sem = i['sem']
-                del i['sem']
-                del i['year']
-                i['t'] = {
-                    "smye": year,
-                    "smty": sem
-                }
-
-        await cache_manager.set_cache(
+
+        return await cache_manager.with_stale_fallback(
             Collection.INJURY,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_military(
             icloud_conn: Connection,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.MILITARY,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.military_record(icloud_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.military_record, icloud_conn)
+
+            # 無紀錄時快取空列表，以較短的有效期避免每次請求皆重新向上游查詢
+            data = data or []
+            SEMESTER_TERM(data)
+
+            await cache_manager.set_cache(
+                Collection.MILITARY,
+                icloud_conn.student_id,
+                data
+            )
 
-        if not data:
             return data
-        else:
-            for i in data:
-                year = i['year']
-                sem = i['sem']
-                del i['sem']
-                del i['year']
-                i['t'] = {
-                    "smye": year,
-                    "smty": sem
-                }
-
-        await cache_manager.set_cache(
+
+        return await cache_manager.with_stale_fallback(
             Collection.MILITARY,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_advisors(
             icloud_conn: Connection,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.ADVISORS,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.advisors(icloud_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.advisors, icloud_conn)
+
+            # 無紀錄時快取空列表，以較短的有效期避免每次請求皆重新向上游查詢
+            data = data or []
+            SEMESTER_TERM(data)
+
+            await cache_manager.set_cache(
+                Collection.ADVISORS,
+                icloud_conn.student_id,
+                data
+            )
 
-        if not data:
             return data
-        else:
-            for i in data:
-                year = i['year']
-                sem = i['sem']
-                del i['sem']
-                del i['year']
-                i['t'] = {
-                    "smye": year,
-                    "smty": sem
-                }
-
-        await cache_manager.set_cache(
+
+        return await cache_manager.with_stale_fallback(
             Collection.ADVISORS,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_advisor_info(
             icloud_conn: Connection,
             advisor_id: str,
     ):
-        data = iCloud.advisor_info(icloud_conn, advisor_id)
+        data = await call_upstream(Upstream.ICLOUD, iCloud.advisor_info, icloud_conn, advisor_id)
         if not data or len(data) == 0:
             raise NotFoundException("No advisor data found")
 
@@ -323,179 +529,194 @@ class StudentService:
     @staticmethod
     async def get_rewards_and_penalties(
             icloud_conn: Connection,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.REWARDS_AND_PENALTIES,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.rewards_and_penalties_record(icloud_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.rewards_and_penalties_record, icloud_conn)
 
-        if data:
-            for i in data:
-                year = i['year']
-                sem = i['sem']
-                del i['sem']
-                del i['year']
-                i['t'] = {
-                    "smye": year,
-                    "smty": sem
-                }
+            # 無紀錄時快取空列表，以較短的有效期避免每次請求皆重新向上游查詢
+            data = data or []
+            SEMESTER_TERM(data)
 
+            await cache_manager.set_cache(
+                Collection.REWARDS_AND_PENALTIES,
+                icloud_conn.student_id,
+                data
+            )
+
+            return data
 
-        await cache_manager.set_cache(
+        return await cache_manager.with_stale_fallback(
             Collection.REWARDS_AND_PENALTIES,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_enrollment(
             icloud_conn: Connection,
             lang: Lang = Lang.ZH_TW,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.PROOF_OF_ENROLLMENT,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
            return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.proof_of_enrollment(icloud_conn, lang=lang)
-
-        data = data['detail']
-        if data:
-            for i in data:
-                year = i['smye']
-                sem = i['smty']
-                del i['smye']
-                del i['smty']
-                i['t'] = {
-                    "smye": year,
-                    "smty": int(sem)
-                }
-
-        await cache_manager.set_cache(
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.proof_of_enrollment, icloud_conn, lang=lang)
+
+            data = ENROLLMENT_RECORD(data['detail'])
+
+            await cache_manager.set_cache(
+                Collection.PROOF_OF_ENROLLMENT,
+                icloud_conn.student_id,
+                data
+            )
+
+            return data
+
+        return await cache_manager.with_stale_fallback(
             Collection.PROOF_OF_ENROLLMENT,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     async def get_scholarship(
             icloud_conn: Connection,
-            refresh: bool = False
+            refresh: bool = False,
+            fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.SCHOLARSHIP,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.scholarship_record(icloud_conn)
-
-        if data:
-            for i in data:
-                year = i['year']
-                sem = i['sem']
-                del i['sem']
-                del i['year']
-                i['t'] = {
-                    "smye": year,
-                    "smty": sem
-                }
-                del i['ship_pay']
-
-        await cache_manager.set_cache(
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.scholarship_record, icloud_conn)
+
+            # 無紀錄時快取空列表，以較短的有效期避免每次請求皆重新向上游查詢
+            data = data or []
+            SCHOLARSHIP_RECORD(data)
+
+            await cache_manager.set_cache(
+                Collection.SCHOLARSHIP,
+                icloud_conn.student_id,
+                data
+            )
+
+            return data
+
+        return await cache_manager.with_stale_fallback(
             Collection.SCHOLARSHIP,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
     @staticmethod
     # printer point
     async def get_printer_point(
         icloud_conn: Connection,
-        refresh: bool = False
+        refresh: bool = False,
+        fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.PRINTER_POINTS,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.printer_point(icloud_conn)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.printer_point, icloud_conn)
 
-        await cache_manager.set_cache(
+            await cache_manager.set_cache(
+                Collection.PRINTER_POINTS,
+                icloud_conn.student_id,
+                {"point" : data}
+            )
+
+            return {"point" : data}
+
+        return await cache_manager.with_stale_fallback(
             Collection.PRINTER_POINTS,
             icloud_conn.student_id,
-            {"point" : data}
+            fetch,
+            fields=fields
         )
 
-        return {"point" : data}
-
     @staticmethod
     async def get_dorm(
         icloud_conn: Connection,
-        refresh: bool = False
+        refresh: bool = False,
+        fields: Optional[List[str]] = None
     ):
         cache_data = await cache_manager.get_cache(
             Collection.DORM,
             icloud_conn.student_id,
-            refresh=refresh
+            refresh=refresh,
+            fields=fields
         )
 
-        if cache_data and not refresh:
+        if cache_data is not None and not refresh:
             return cache_data
 
         # 從 SIS 系統獲取課程警告資訊
-        data = iCloud.personal_information.dorm_record(icloud_conn)
-
-        if data:
-            for i in data:
-                year = i['year']
-                sem = i['sem']
-                del i['sem']
-                del i['year']
-                i['t'] = {
-                    "smye": year,
-                    "smty": sem
-                }
-                del i['elec_mon']
-                del i['dorm_elec_money']
-
-        await cache_manager.set_cache(
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.personal_information.dorm_record, icloud_conn)
+
+            # 無紀錄時快取空列表，以較短的有效期避免每次請求皆重新向上游查詢
+            data = data or []
+            DORM_RECORD(data)
+
+            await cache_manager.set_cache(
+                Collection.DORM,
+                icloud_conn.student_id,
+                data
+            )
+
+            return data
+
+        return await cache_manager.with_stale_fallback(
             Collection.DORM,
             icloud_conn.student_id,
-            data
+            fetch,
+            fields=fields
         )
 
-        return data
-
 
     @staticmethod
     async def get_annual_grade(
@@ -504,66 +725,175 @@ class StudentService:
         semester: Optional[str] = None,
         refresh: bool = False
     ):
-        cache_data = await cache_manager.get_cache(
-            Collection.ANNUAL_GRADE,
-            icloud_conn.student_id,
-            refresh=refresh,
-        )
-
-        if (year and semester) and len(cache_data):
-            for data in cache_data:
-                if str(data['t']['smye']) == year and str(data['t']['smty']) == semester:
-                    return data
+        """
+        取得歷年成績
 
-            raise NotFoundException(f"grade of year: {year} and semester: {semester} can not be found")
+        成績依學期分別快取於 ANNUAL_GRADE_SEMESTER，ANNUAL_GRADE 則僅存放學期列表及各學期總成績摘要；
+        指定學年學期時直接查詢該學期快取，強制更新單一學期時亦不會重寫其他學期。
+        """
+        student_id = icloud_conn.student_id
+        target = {"year": year, "semester": semester} if year and semester else None
 
-        if cache_data and not refresh:
+        if target:
+            cache_data = await cache_manager.get_cache(
+                Collection.ANNUAL_GRADE_SEMESTER,
+                student_id,
+                semester=target,
+                refresh=refresh
+            )
+        else:
+            summary = await cache_manager.get_cache(
+                Collection.ANNUAL_GRADE,
+                student_id,
+                refresh=refresh
+            )
+            # 舊版快取格式為完整成績列表，視為無快取
+            cache_data = await cache_manager.get_semester_caches(
+                Collection.ANNUAL_GRADE_SEMESTER,
+                student_id,
+                StudentService.__grade_semesters(summary)
+            ) if isinstance(summary, dict) else None
+
+        if cache_data is not None and not refresh:
             return cache_data
 
-        data = iCloud.course_information.annual_grade(icloud_conn)
-
-        def transform_entry(entry):
-            """Helper function to transform year/sem into 't' and remove them"""
-            entry["t"] = {"smye": int(entry.pop("year")), "smty": int(entry.pop("sem"))}
-
-        if not year and not semester:
-            data = data['score']
-            for entry in data:  # Use .get() to avoid KeyError
-                transform_entry(entry)
-        else:
-            transform_entry(data)
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.course_information.annual_grade, icloud_conn)
+
+            data = ANNUAL_GRADE_RECORD(data['score']) or []
+            # 過去學期的成績標記為不再變動
+            current_semester = await SemesterManager.get_current_semester_key(icloud_conn)
+            entries = [
+                ({"year": str(entry["t"]["smye"]), "semester": str(entry["t"]["smty"])}, entry)
+                for entry in data
+            ]
+
+            if target:
+                matched = [entry for key, entry in entries if key == target]
+                if not matched:
+                    raise NotFoundException(f"grade of year: {year} and semester: {semester} can not be found")
+
+                # 強制更新單一學期時僅寫入該學期
+                if refresh:
+                    await cache_manager.set_cache(
+                        Collection.ANNUAL_GRADE_SEMESTER,
+                        student_id,
+                        matched[0],
+                        semester=target,
+                        current_semester=current_semester
+                    )
+                    return matched[0]
+
+            await cache_manager.set_semester_caches(
+                Collection.ANNUAL_GRADE_SEMESTER,
+                student_id,
+                entries,
+                current_semester=current_semester
+            )
+            await cache_manager.set_cache(
+                Collection.ANNUAL_GRADE,
+                student_id,
+                {"semesters": [{"t": entry["t"], "complex": entry.get("complex")} for entry in data]}
+            )
 
-        await cache_manager.set_cache(
-            Collection.ANNUAL_GRADE,
-            icloud_conn.student_id,
-            data,
+            return matched[0] if target else data
+
+        async def stale():
+            if target:
+                return await cache_manager.get_stale_cache(
+                    Collection.ANNUAL_GRADE_SEMESTER,
+                    student_id,
+                    semester=target
+                )
+
+            summary = await cache_manager.get_stale_cache(Collection.ANNUAL_GRADE, student_id)
+            return await cache_manager.get_semester_caches(
+                Collection.ANNUAL_GRADE_SEMESTER,
+                student_id,
+                StudentService.__grade_semesters(summary),
+                allow_stale=True
+            ) if isinstance(summary, dict) else None
+
+        return await cache_manager.with_stale_fallback(
+            Collection.ANNUAL_GRADE_SEMESTER,
+            student_id,
+            fetch,
+            stale=stale
         )
 
-        return data
+    @staticmethod
+    def __grade_semesters(summary: Optional[dict]) -> list:
+        """由成績摘要取得各學期的快取查詢條件"""
+        if not summary:
+            return []
+
+        return [
+            {"year": str(item["t"]["smye"]), "semester": str(item["t"]["smty"])}
+            for item in summary["semesters"]
+        ]
 
     @staticmethod
     async def get_course_attendance_info(
             icloud_conn : Connection,
             refresh : bool,
             year : str,
-            semester : str
+            semester : str,
+            fields: Optional[List[str]] = None
     ):
-        data = iCloud.course_information.attendance(icloud_conn)
-
-        if not data or len(data) == 0:
-            raise NotFoundException("Failed to fetch course attendance information")
+        """
+        取得課程出席率
 
+        各學期分別快取於 COURSE_ATTENDANCE，因出缺勤變動頻繁，快取時間較短；
+        未指定學年學期時取得當前學期，來源資料無該學期時回應查無資料。
+        """
         if not year or not semester:
-            data = data[0]
+            current = await SemesterManager.get_current_semester(icloud_conn)
+            target = {"year": current.year, "semester": current.seme}
+            current_semester = target
         else:
-            found = False
-            for d in data:
-                if str(d["year"]) == year and str(d["sem"]) == semester:
-                    data = d
-                    found = True
-                    break
-
-            if not found:
+            target = {"year": year, "semester": semester}
+            current_semester = None
+
+        cache_data = await cache_manager.get_cache(
+            Collection.COURSE_ATTENDANCE,
+            icloud_conn.student_id,
+            semester=target,
+            refresh=refresh,
+            fields=fields
+        )
+
+        if cache_data is not None and not refresh:
+            return cache_data
+        async def fetch():
+            data = await call_upstream(Upstream.ICLOUD, iCloud.course_information.attendance, icloud_conn)
+
+            if not data or len(data) == 0:
                 raise NotFoundException("Failed to fetch course attendance information")
 
-        return data
\ No newline at end of file
+            entries = [
+                ({"year": str(d["year"]), "semester": str(d["sem"])}, d)
+                for d in data
+            ]
+
+            await cache_manager.set_semester_caches(
+                Collection.COURSE_ATTENDANCE,
+                icloud_conn.student_id,
+                entries,
+                cache_duration=settings.ATTENDANCE_CACHE_DURATION,
+                current_semester=current_semester or await SemesterManager.get_current_semester_key(icloud_conn)
+            )
+
+            for key, d in entries:
+                if key == target:
+                    return d
+
+            # 不以其他學期的資料代替，否則該資料快取於其學期，之後的請求皆無法命中目標學期的快取
+            raise NotFoundException("Failed to fetch course attendance information")
+
+        return await cache_manager.with_stale_fallback(
+            Collection.COURSE_ATTENDANCE,
+            icloud_conn.student_id,
+            fetch,
+            semester=target,
+            fields=fields
+        )
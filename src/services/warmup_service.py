@@ -0,0 +1,80 @@
+import asyncio
+from typing import Callable, Awaitable, Dict, Iterable, Optional
+
+from sis.connection import Connection
+
+from src.config import settings
+from src.models.GraduationType import GraduationType
+from src.models.collection import Collection
+from src.services.graduation_service import GraduationService
+from src.services.student_service import StudentService
+
+# 各集合對應的抓取函數，參數為 (sis_conn, icloud_conn, refresh)
+CollectionFetcher = Callable[[Connection, Connection, bool], Awaitable]
+
+
+class WarmupService:
+    FETCHERS: Dict[Collection, CollectionFetcher] = {
+        Collection.STUDENT_PROFILE: lambda sis, ic, refresh: StudentService.get_student_info(sis, refresh),
+        Collection.STUDENT_SEMESTER: lambda sis, ic, refresh: StudentService.get_student_semester(ic, refresh),
+        Collection.COURSE_TIMETABLE: lambda sis, ic, refresh: StudentService.get_course_timetable(ic, refresh),
+        Collection.COURSE_WARNING: lambda sis, ic, refresh: StudentService.get_course_warning(sis, refresh),
+        Collection.COURSE_ATTENDANCE: lambda sis, ic, refresh: StudentService.get_course_attendance_info(
+            ic, refresh, None, None
+        ),
+        Collection.ANNUAL_GRADE: lambda sis, ic, refresh: StudentService.get_annual_grade(ic, refresh=refresh),
+        Collection.MILITARY: lambda sis, ic, refresh: StudentService.get_military(ic, refresh),
+        Collection.INJURY: lambda sis, ic, refresh: StudentService.get_injury(ic, refresh),
+        Collection.ADVISORS: lambda sis, ic, refresh: StudentService.get_advisors(ic, refresh),
+        Collection.REWARDS_AND_PENALTIES: lambda sis, ic, refresh: StudentService.get_rewards_and_penalties(ic, refresh),
+        Collection.PROOF_OF_ENROLLMENT: lambda sis, ic, refresh: StudentService.get_enrollment(ic, refresh=refresh),
+        Collection.SCHOLARSHIP: lambda sis, ic, refresh: StudentService.get_scholarship(ic, refresh),
+        Collection.PRINTER_POINTS: lambda sis, ic, refresh: StudentService.get_printer_point(ic, refresh),
+        Collection.DORM: lambda sis, ic, refresh: StudentService.get_dorm(ic, refresh),
+        Collection.GRADUATION: lambda sis, ic, refresh: GraduationService.get_graduation(
+            sis, GraduationType.OVERVIEW, refresh
+        ),
+        Collection.GRADUATION_WORKPLACE: lambda sis, ic, refresh: GraduationService.get_graduation(
+            sis, GraduationType.WORKPLACE_EXP, refresh
+        ),
+        Collection.GRADUATION_ENGLISH: lambda sis, ic, refresh: GraduationService.get_graduation(
+            sis, GraduationType.ENGLISH, refresh
+        ),
+        Collection.GRADUATION_CHINESE: lambda sis, ic, refresh: GraduationService.get_graduation(
+            sis, GraduationType.CHINESE, refresh
+        ),
+        Collection.GRADUATION_COMPUTER: lambda sis, ic, refresh: GraduationService.get_graduation(
+            sis, GraduationType.COMPUTER, refresh
+        ),
+    }
+
+    @staticmethod
+    async def warm_up(
+            sis_conn: Connection,
+            icloud_conn: Connection,
+            collections: Optional[Iterable[Collection]] = None
+    ) -> None:
+        """
+        登入後於背景預先抓取資料，使後續請求直接命中快取
+
+        Args:
+            sis_conn: SIS 連線
+            icloud_conn: iCloud 連線
+            collections: 欲預熱的集合，預設為設定檔 WARMUP_COLLECTIONS
+        """
+        collections = settings.WARMUP_COLLECTIONS if collections is None else collections
+        semaphore = asyncio.Semaphore(settings.WARMUP_CONCURRENCY)
+
+        async def prefetch(collection: Collection):
+            async with semaphore:
+                try:
+                    await WarmupService.FETCHERS[collection](sis_conn, icloud_conn, False)
+                except Exception:
+                    # 預熱失敗不影響使用者，待實際請求時再行抓取
+                    pass
+
+        await asyncio.gather(*(
+            prefetch(collection)
+            for collection in collections
+            if collection in WarmupService.FETCHERS
+        ))
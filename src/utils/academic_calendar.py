@@ -0,0 +1,148 @@
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.models.academic_calendar import CalendarWindow
+from src.utils.time_unit import campus_now
+
+MonthDay = Tuple[int, int]
+
+# 民國紀年
+ROC_YEAR_OFFSET = 1911
+
+
+def _month_day(value: str) -> MonthDay:
+    month, day = value.split("-")
+    return int(month), int(day)
+
+
+class AcademicCalendar:
+    """
+    學年曆
+
+    課表、成績及在學證明等資料幾乎只在加退選、成績公布等固定期間變動。集合位於其變動期間內時使用較短的快取時間，
+    其餘時間使用較長的快取時間，但不超過下一個變動期間的開始；過去學期的資料不再變動，使用極長的快取時間。
+    """
+
+    def __init__(
+            self,
+            windows: Iterable[CalendarWindow],
+            window_duration: int,
+            steady_duration: int,
+            past_semester_duration: int,
+            fall_start: str = "08-01",
+            spring_start: str = "02-01",
+            past_semester_grace_days: int = 45,
+            min_duration: int = 60
+    ):
+        """
+        Args:
+            windows: 變動期間
+            window_duration: 變動期間內的快取時間(秒)
+            steady_duration: 變動期間外的快取時間上限(秒)
+            past_semester_duration: 過去學期的快取時間(秒)
+            fall_start: 上學期開始月日 (MM-DD)
+            spring_start: 下學期開始月日 (MM-DD)
+            past_semester_grace_days: 下一學期開始後經過此天數，前一學期才視為過去學期，保留成績補登的時間
+            min_duration: 快取時間下限(秒)
+        """
+        self.window_duration = window_duration
+        self.steady_duration = steady_duration
+        self.past_semester_duration = past_semester_duration
+        self.fall_start = _month_day(fall_start)
+        self.spring_start = _month_day(spring_start)
+        self.past_semester_grace = timedelta(days=past_semester_grace_days)
+        self.min_duration = min_duration
+
+        self.windows: Dict[str, List[Tuple[MonthDay, MonthDay]]] = {}
+        for window in windows:
+            for collection in window.collections:
+                self.windows.setdefault(collection.value, []).append(
+                    (_month_day(window.start), _month_day(window.end))
+                )
+
+    def current_semester(self, today: Optional[date] = None) -> Tuple[int, int]:
+        """
+        依日期取得目前學年學期
+
+        Returns:
+            (民國學年, 學期)
+        """
+        today = today or campus_now().date()
+        month_day = (today.month, today.day)
+
+        if month_day >= self.fall_start:
+            return today.year - ROC_YEAR_OFFSET, 1
+        if month_day >= self.spring_start:
+            return today.year - ROC_YEAR_OFFSET - 1, 2
+
+        # 一月仍屬前一學年的上學期
+        return today.year - ROC_YEAR_OFFSET - 1, 1
+
+    def is_past_semester(self, semester: Optional[Dict[str, str]], today: Optional[date] = None) -> bool:
+        """學年學期是否早於目前學期且已過寬限期，無法解析者視為否"""
+        if not semester:
+            return False
+
+        try:
+            term = (int(semester["year"]), int(semester["semester"]))
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        return term < self.current_semester((today or campus_now().date()) - self.past_semester_grace)
+
+    @staticmethod
+    def _contains(window: Tuple[MonthDay, MonthDay], month_day: MonthDay) -> bool:
+        start, end = window
+        if start <= end:
+            return start <= month_day <= end
+
+        # 跨年，例如 12-20 至 01-10
+        return month_day >= start or month_day <= end
+
+    def _seconds_until_next_window(self, windows: List[Tuple[MonthDay, MonthDay]], now: datetime) -> float:
+        starts = []
+        for (month, day), _ in windows:
+            for year in (now.year, now.year + 1):
+                try:
+                    start = datetime.combine(date(year, month, day), dt_time.min)
+                except ValueError:
+                    # 非閏年的 02-29
+                    continue
+                if start > now:
+                    starts.append(start)
+                    break
+
+        return (min(starts) - now).total_seconds() if starts else float("inf")
+
+    def cache_duration(
+            self,
+            collection_name: str,
+            semester: Optional[Dict[str, str]] = None,
+            now: Optional[datetime] = None
+    ) -> Optional[int]:
+        """
+        依學年曆取得快取時間
+
+        Args:
+            collection_name: 集合名稱
+            semester: 學年學期資訊 {"year": "112", "semester": "1"}
+            now: 目前時間，預設為校園時區的目前時間
+
+        Returns:
+            快取時間(秒)，集合不受學年曆影響時回傳 None
+        """
+        now = now or campus_now()
+
+        if self.is_past_semester(semester, now.date()):
+            return self.past_semester_duration
+
+        windows = self.windows.get(collection_name)
+        if not windows:
+            return None
+
+        month_day = (now.month, now.day)
+        if any(self._contains(window, month_day) for window in windows):
+            return self.window_duration
+
+        duration = min(self.steady_duration, self._seconds_until_next_window(windows, now))
+        return max(self.min_duration, int(duration))
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.config import settings
+from src.utils.time_unit import TimeUnit
+
+ACTIVE_SESSION_COLLECTION = "active_sessions"
+
+
+class ActivityTracker:
+    """
+    記錄近期活躍學生及其仍有效的 session，供背景批次更新快取使用
+
+    僅於啟用背景批次更新時記錄。同一 session 在 ACTIVITY_TOUCH_INTERVAL 內僅寫入一次資料庫，
+    最近活動時間僅記錄於本行程，超過 ACTIVITY_MAX_ENTRIES 時淘汰最久未活動者。
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[ACTIVE_SESSION_COLLECTION]
+        self._last_touch: OrderedDict[str, Tuple[float, str, str]] = OrderedDict()
+        self._pending: Set[asyncio.Task] = set()
+
+    def touch(self, payload: dict) -> None:
+        """
+        記錄學生活動，於背景寫入資料庫
+
+        Args:
+            payload: JWT payload
+        """
+        student_id = payload.get("s_id")
+        sis_session = self._session_id(payload.get("sis"))
+        ic_session = self._session_id(payload.get("ic"))
+
+        # 格式不符的 token 不記錄，由後續的連線解析回應錯誤
+        if not student_id or not sis_session or not ic_session:
+            return
+
+        now = time.time()
+
+        last = self._last_touch.get(student_id)
+        if last and last[1:] == (sis_session, ic_session) and now - last[0] < settings.ACTIVITY_TOUCH_INTERVAL:
+            return
+
+        self._last_touch[student_id] = (now, sis_session, ic_session)
+        self._last_touch.move_to_end(student_id)
+
+        while len(self._last_touch) > settings.ACTIVITY_MAX_ENTRIES:
+            self._last_touch.popitem(last=False)
+
+        task = asyncio.get_running_loop().create_task(self._upsert(payload, int(now)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    @staticmethod
+    def _session_id(connection) -> Optional[str]:
+        return connection.get("session_id") if isinstance(connection, dict) else None
+
+    async def _upsert(self, payload: dict, now: int) -> None:
+        try:
+            login_timestamp = min(payload["sis"]["login_timestamp"], payload["ic"]["login_timestamp"])
+            await self.collection.update_one(
+                {"_id": payload["s_id"]},
+                {"$set": {
+                    "sis": payload["sis"],
+                    "ic": payload["ic"],
+                    "last_active_timestamp": now,
+                    "expires_timestamp": int(login_timestamp) + settings.ACCESS_TOKEN_EXPIRE_MINUTES * TimeUnit.MINUTE
+                }},
+                upsert=True
+            )
+        except Exception:
+            # 活動紀錄失敗不影響請求
+            self._last_touch.pop(payload["s_id"], None)
+
+    async def get_active_sessions(self, active_window: int) -> List[dict]:
+        """
+        取得活動期間內且 session 尚未過期的學生
+
+        Args:
+            active_window: 活動期間(秒)
+        """
+        now = int(time.time())
+        cursor = self.collection.find({
+            "last_active_timestamp": {"$gte": now - active_window},
+            "expires_timestamp": {"$gt": now}
+        })
+        return await cursor.to_list(length=None)
+
+    async def remove(self, student_id: str) -> None:
+        """移除學生 session 紀錄，例如登出或上游 session 失效時"""
+        self._last_touch.pop(student_id, None)
+        await self.collection.delete_one({"_id": student_id})
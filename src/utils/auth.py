@@ -6,6 +6,7 @@ from jose import JWTError, jwt, ExpiredSignatureError
 from starlette import status
 
 from src.config import settings
+from src.database import activity_tracker
 
 security = HTTPBearer()
 
@@ -21,13 +22,16 @@ def create_jwt_token(data: dict) -> str:
         algorithm=settings.JWT_ALGORITHM
     )
 
-def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+async def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     try:
         payload = jwt.decode(
             credentials.credentials,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
+        # 記錄學生活動，供背景批次更新快取使用
+        if settings.REFRESH_ENABLED:
+            activity_tracker.touch(payload)
         return payload  # 成功解析，回傳 JWT payload
 
     except ExpiredSignatureError:
@@ -1,23 +1,172 @@
 import json
 import time
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
 from src.models.collection import Collection
+from src.utils.academic_calendar import AcademicCalendar
+from src.utils.cache_codec import CacheCodec
+from src.utils.exception import UpstreamUnavailableException
+from src.utils.field_selection import select_fields
+from src.utils.local_cache import LocalCache, CacheInvalidationBus, CacheKey
+from src.utils.write_behind import WriteBehindQueue
 
 
 class CacheManager:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        local_cache: Optional[LocalCache] = None,
+        invalidation_collection_size: int = 1024 * 1024,
+        negative_cache_duration: int = 21600,
+        codec: Optional[CacheCodec] = None,
+        calendar: Optional[AcademicCalendar] = None
+    ):
         self.db = db
         self.default_cache_duration = 259200  # 3天的秒數
+        # 無資料（空列表、空物件）的快取有效期，較短以便新紀錄盡快反映
+        self.negative_cache_duration = negative_cache_duration
+        # 行程內 L1 快取，須啟動 invalidation_bus 後才會使用
+        self.local_cache = local_cache
+        self.invalidation_bus = CacheInvalidationBus(
+            db, local_cache, invalidation_collection_size
+        ) if local_cache is not None else None
+        # 快取延後寫入佇列，由 enable_write_behind 啟用
+        self.write_behind: Optional[WriteBehindQueue] = None
+        # 部分集合的資料以壓縮編碼儲存
+        self.codec = codec
+        # 依學年曆決定快取時間
+        self.calendar = calendar
+
+    def enable_write_behind(
+        self,
+        flush_interval: float,
+        batch_size: int,
+        max_pending: int,
+        max_attempts: int = 5
+    ) -> None:
+        """
+        set_cache 改為放入佇列後立即返回，由背景批次寫入，須於事件迴圈中呼叫 write_behind.start()
+
+        Args:
+            flush_interval: 批次寫入間隔(秒)
+            batch_size: 單次寫入的最大筆數，佇列達此數量時立即寫入
+            max_pending: 佇列上限，已滿時 set_cache 直接寫入
+            max_attempts: 同一筆快取連續寫入失敗達此次數即捨棄
+        """
+        self.write_behind = WriteBehindQueue(
+            self.db,
+            flush_interval,
+            batch_size,
+            max_pending,
+            on_flushed=self._on_flushed,
+            max_attempts=max_attempts
+        )
+
+    def _on_flushed(self, key: CacheKey) -> None:
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.publish_key(key)
+
+    def _cache_duration(
+        self,
+        collection_name: str,
+        data: Any,
+        semester: Optional[Dict[str, str]] = None,
+        cache_duration: Optional[int] = None
+    ) -> int:
+        """
+        決定快取時間：過去學期依學年曆，其次為指定的快取時間、無資料的快取時間，最後為學年曆或預設值
+        """
+        calendar_duration = self.calendar.cache_duration(collection_name, semester) if self.calendar else None
+
+        # 過去學期的資料不再變動，優先於指定的快取時間（例如出缺勤的短快取）
+        if self.calendar is not None and self.calendar.is_past_semester(semester):
+            return calendar_duration
+
+        if cache_duration:
+            return cache_duration
+
+        if isinstance(data, (list, tuple, dict)) and not data:
+            return self.negative_cache_duration
+
+        return calendar_duration or self.default_cache_duration
+
+    def is_immutable_semester(
+        self,
+        semester: Optional[Dict[str, str]],
+        current_semester: Optional[Dict[str, str]]
+    ) -> bool:
+        """
+        學期資料是否不再變動：早於學生目前學期，且已過學年曆的寬限期（保留成績補登的時間）
+
+        Args:
+            semester: 學年學期資訊 {"year": "112", "semester": "1"}
+            current_semester: 學生目前的學年學期資訊
+        """
+        if not semester or not current_semester:
+            return False
+
+        try:
+            is_earlier = (int(semester["year"]), int(semester["semester"])) \
+                < (int(current_semester["year"]), int(current_semester["semester"]))
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        return is_earlier and (self.calendar is None or self.calendar.is_past_semester(semester))
+
+    def _is_encoded(self, collection_name: str) -> bool:
+        return self.codec is not None and self.codec.is_encoded(collection_name)
+
+    def _stored(self, collection_name: str, data: Any) -> Dict[str, Any]:
+        """取得寫入快取文件的 data、codec 及 schema_version 欄位"""
+        schema_version = Collection(collection_name).schema_version
+
+        if self._is_encoded(collection_name):
+            data, codec = self.codec.encode(collection_name, data)
+            return {"data": data, "codec": codec, "schema_version": schema_version}
+
+        # 由壓縮編碼切換回原始資料時須清除 codec 標記
+        return {"data": json.loads(json.dumps(data)), "codec": None, "schema_version": schema_version}
+
+    def _decoded(self, document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """還原壓縮編碼的快取文件，無法解碼時回傳 None，視為無快取"""
+        if not document.get("codec"):
+            return document
+
+        if self.codec is None:
+            return None
+
+        try:
+            return self.codec.decode(document)
+        except ValueError:
+            return None
+
+    def _get_local(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """取得尚未寫入的快取文件或 L1 快取"""
+        if self.write_behind is not None:
+            pending = self.write_behind.get(key)
+            if pending is not None:
+                return self._decoded(pending)
+
+        if self.local_cache is not None:
+            return self.local_cache.get(key)
+
+        return None
+
+    def _invalidate(self, collection_name: str, student_id: str, semester: Optional[Dict[str, str]] = None) -> None:
+        """淘汰 L1 快取並通知其他 worker"""
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.publish(collection_name, student_id, semester)
 
     async def get_cache(
         self, 
         collection: Collection,
         student_id: str,
         semester: Optional[Dict[str, str]] = None,
-        refresh: bool = False
+        refresh: bool = False,
+        fields: Optional[List[str]] = None
     ) -> Optional[Dict]:
         """
         獲取快取資料
@@ -27,7 +176,15 @@ class CacheManager:
             student_id: 學生學號
             semester: 學年學期資訊 {"year": "112", "semester": "1"}
             refresh: 是否強制更新快取
+            fields: 僅取得資料中的指定欄位，於資料庫端投影；壓縮編碼的集合於取得後擷取
         """
+        local_key = LocalCache.key(collection.value, student_id, semester)
+        encoded = self._is_encoded(collection.value)
+        if not refresh:
+            local_data = self._get_local(local_key)
+            if local_data is not None and self._is_valid(local_data, local_key[0]):
+                return select_fields(local_data.get("data"), fields)
+
         collection = self.db[collection.value]
 
 
@@ -43,33 +200,178 @@ class CacheManager:
 
         try:
             # 查詢快取
-            cache_data = await collection.find_one(query)
+            cache_data = await collection.find_one(
+                query,
+                self._data_projection(None if encoded else fields, True)
+            )
         except Exception as e:
             raise RuntimeError(f"Error querying cache: {e}")
 
         if not cache_data:
             return None
 
-        current_time = int(time.time())
-
         # 檢查快取是否過期
-        if not refresh and cache_data.get("updated_timestamp"):
-            cache_duration = cache_data.get("cache_duration", self.default_cache_duration)
-            if current_time - cache_data["updated_timestamp"] < cache_duration:
-                return cache_data["data"]
+        if not refresh and self._is_valid(cache_data, local_key[0]):
+            cache_data = self._decoded(cache_data)
+            if cache_data is None:
+                return None
+
+            if self.local_cache is not None and (encoded or not fields):
+                self.local_cache.put(local_key, cache_data)
+            return select_fields(cache_data.get("data"), fields) if encoded else self._projected_data(cache_data, fields)
 
         return None
 
+    def _is_valid(self, cache_data: Dict[str, Any], collection_name: str) -> bool:
+        """快取未過期（或為不再變動的資料）且資料格式版本與目前相同，未標記版本者視為第 1 版"""
+        if not cache_data.get("updated_timestamp"):
+            return False
+
+        if not self._is_current_schema(cache_data, collection_name):
+            return False
+
+        # 過去學期的資料不再變動，不會過期
+        if cache_data.get("immutable"):
+            return True
+
+        cache_duration = cache_data.get("cache_duration", self.default_cache_duration)
+        return int(time.time()) - cache_data["updated_timestamp"] < cache_duration
+
+    @staticmethod
+    def _is_current_schema(cache_data: Dict[str, Any], collection_name: str) -> bool:
+        """快取資料格式版本與目前相同，未標記版本者視為第 1 版"""
+        return cache_data.get("schema_version", 1) == Collection(collection_name).schema_version
+
+    async def with_stale_fallback(
+        self,
+        collection: Collection,
+        student_id: str,
+        fetch: Callable[[], Awaitable[Any]],
+        semester: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+        stale: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Any:
+        """
+        自上游取得資料，上游無法使用時降級回傳已過期的快取
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            fetch: 自上游取得、轉換並寫入快取的函數，回傳值即為結果
+            semester: 學年學期資訊 {"year": "112", "semester": "1"}
+            fields: 降級回傳快取時僅取得資料中的指定欄位
+            stale: 讀取過期快取的函數，資料分散於多個快取時使用，預設為 get_stale_cache
+
+        Raises:
+            UpstreamUnavailableException: 上游無法使用且無任何快取
+        """
+        try:
+            return await fetch()
+        except UpstreamUnavailableException:
+            if stale is not None:
+                stale_data = await stale()
+            else:
+                stale_data = await self.get_stale_cache(collection, student_id, semester=semester, fields=fields)
+            if stale_data is None:
+                raise
+            return stale_data
+
+    async def get_stale_cache(
+        self,
+        collection: Collection,
+        student_id: str,
+        semester: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Any]:
+        """
+        獲取快取資料，不論是否過期，供上游服務無法使用時降級回傳，資料格式版本不同的快取不予回傳
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            semester: 學年學期資訊 {"year": "112", "semester": "1"}
+            fields: 僅取得資料中的指定欄位，於資料庫端投影
+        """
+        local_data = self._get_local(LocalCache.key(collection.value, student_id, semester))
+        if local_data is not None and self._is_current_schema(local_data, collection.value):
+            return select_fields(local_data.get("data"), fields)
+
+        collection = self.db[collection.value]
+
+        if semester:
+            query = {
+                "student_id": student_id,
+                "year": semester["year"],
+                "semester": semester["semester"]
+            }
+        else:
+            query = {"_id": student_id}
+
+        encoded = self._is_encoded(collection.name)
+
+        try:
+            cache_data = await collection.find_one(
+                query,
+                self._data_projection(None if encoded else fields, False)
+            )
+        except Exception as e:
+            raise RuntimeError(f"Error querying cache: {e}")
+
+        if not cache_data or not self._is_current_schema(cache_data, collection.name):
+            return None
+
+        cache_data = self._decoded(cache_data)
+        if cache_data is None:
+            return None
+
+        return select_fields(cache_data.get("data"), fields) if encoded else self._projected_data(cache_data, fields)
+
+    @staticmethod
+    def _projected_data(cache_data: Dict[str, Any], fields: Optional[List[str]]) -> Any:
+        """
+        取得投影後的資料
+
+        指定的欄位皆不存在時 MongoDB 投影結果不含 data，此時快取仍有效，回傳空物件而非 None，
+        避免呼叫端將有效的快取視為未命中而重新向上游取得
+        """
+        if fields and "data" not in cache_data:
+            return {}
+        return cache_data.get("data")
+
+    @staticmethod
+    def _data_projection(fields: Optional[List[str]], with_timestamps: bool) -> Optional[Dict[str, int]]:
+        """建立僅取出資料指定欄位的投影，未指定欄位時取出整份資料"""
+        projection = {
+            "updated_timestamp": 1,
+            "cache_duration": 1,
+            "immutable": 1
+        } if with_timestamps else {}
+        projection["codec"] = 1
+        projection["schema_version"] = 1
+
+        if fields:
+            projection.update({f"data.{field}": 1 for field in fields})
+        elif with_timestamps:
+            return None
+        else:
+            projection["data"] = 1
+
+        return projection
+
     async def set_cache(
         self,
         collection: Collection,
         student_id: str,
         data: Dict[str, Any],
         semester: Optional[Dict[str, str]] = None,
-        cache_duration: int = None
+        cache_duration: int = None,
+        current_semester: Optional[Dict[str, str]] = None
     ) -> None:
         """
         設置快取資料
+
+        上游查無資料時亦應快取空列表或空物件（negative cache），未指定 cache_duration 時
+        以 negative_cache_duration 為有效期，避免每次請求皆重新向上游查詢。
         
         Args:
             collection: 集合
@@ -77,17 +379,20 @@ class CacheManager:
             data: 要快取的資料
             semester: 學年學期資訊 {"year": "112", "semester": "1"}
             cache_duration: 快取持續時間(秒)
+            current_semester: 學生目前的學年學期資訊，早於此學期的資料標記為不再變動 (immutable)
         """
         collection = self.db[collection.value]
         current_time = int(time.time())
 
-        data = json.loads(json.dumps(data))
+        negative = isinstance(data, (list, tuple, dict)) and not data
 
         # 建構快取文件
         cache_document = {
             "updated_timestamp": current_time,
-            "cache_duration": cache_duration or self.default_cache_duration,
-            "data": data
+            "cache_duration": self._cache_duration(collection.name, data, semester, cache_duration),
+            "negative": negative,
+            "immutable": self.is_immutable_semester(semester, current_semester),
+            **self._stored(collection.name, data)
         }
 
         # 根據是否有學期資訊決定 _id
@@ -106,6 +411,11 @@ class CacheManager:
             cache_document["_id"] = student_id
             query = {"_id": student_id}
 
+        # 延後寫入時立即返回，寫入後才通知其他 worker
+        local_key = LocalCache.key(collection.name, student_id, semester)
+        if self.write_behind is not None and self.write_behind.enqueue(local_key, query, cache_document):
+            return
+
         try:
             # 使用 upsert 更新或插入快取
             await collection.update_one(
@@ -116,6 +426,346 @@ class CacheManager:
         except Exception as e:
             raise RuntimeError(f"Error setting cache: {e}")
 
+        self._invalidate(collection.name, student_id, semester)
+
+    async def get_semester_caches(
+        self,
+        collection: Collection,
+        student_id: str,
+        semesters: List[Dict[str, str]],
+        allow_stale: bool = False
+    ) -> Optional[List[Any]]:
+        """
+        以單次查詢獲取多個學期的快取資料，依 semesters 順序回傳
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            semesters: 學年學期資訊列表 [{"year": "112", "semester": "1"}, ...]
+            allow_stale: 是否接受已過期的快取，資料格式版本不同者仍不予採用
+
+        Returns:
+            任一學期無快取或已過期時回傳 None，未指定學期時回傳空列表
+        """
+        if not semesters:
+            return []
+
+        def usable(document: Dict[str, Any]) -> bool:
+            if allow_stale:
+                return self._is_current_schema(document, collection.value)
+            return self._is_valid(document, collection.value)
+
+        # 尚未寫入資料庫的快取文件較資料庫中的新，優先採用
+        cached = {}
+        for semester in semesters:
+            local_data = self._get_local(LocalCache.key(collection.value, student_id, semester))
+            if local_data is not None and usable(local_data):
+                cached[(semester["year"], semester["semester"])] = local_data["data"]
+
+        missing = [
+            semester for semester in semesters
+            if (semester["year"], semester["semester"]) not in cached
+        ]
+        if not missing:
+            return [cached[(semester["year"], semester["semester"])] for semester in semesters]
+
+        query = {
+            "student_id": student_id,
+            "$or": [
+                {"year": semester["year"], "semester": semester["semester"]}
+                for semester in missing
+            ]
+        }
+
+        try:
+            documents = await self.db[collection.value].find(query).to_list(length=None)
+        except Exception as e:
+            raise RuntimeError(f"Error querying cache: {e}")
+
+        for document in documents:
+            if not usable(document):
+                continue
+            document = self._decoded(document)
+            if document is not None:
+                cached.setdefault((document["year"], document["semester"]), document["data"])
+
+        try:
+            return [cached[(semester["year"], semester["semester"])] for semester in semesters]
+        except KeyError:
+            return None
+
+    async def set_semester_caches(
+        self,
+        collection: Collection,
+        student_id: str,
+        entries: List[Tuple[Dict[str, str], Any]],
+        cache_duration: int = None,
+        current_semester: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        以單次批次寫入設置多個學期的快取資料
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            entries: [(學年學期資訊, 資料), ...]
+            cache_duration: 快取持續時間(秒)
+            current_semester: 學生目前的學年學期資訊，早於此學期的資料標記為不再變動 (immutable)
+        """
+        if not entries:
+            return
+
+        collection = self.db[collection.value]
+        current_time = int(time.time())
+
+        if self.write_behind is not None:
+            # 避免佇列中較舊的文件於之後覆蓋本次寫入
+            for semester, _ in entries:
+                await self.write_behind.discard(LocalCache.key(collection.name, student_id, semester))
+
+        operations = [
+            UpdateOne(
+                {
+                    "student_id": student_id,
+                    "year": semester["year"],
+                    "semester": semester["semester"]
+                },
+                {"$set": {
+                    "updated_timestamp": current_time,
+                    "cache_duration": self._cache_duration(collection.name, data, semester, cache_duration),
+                    "year": semester["year"],
+                    "semester": semester["semester"],
+                    "immutable": self.is_immutable_semester(semester, current_semester),
+                    **self._stored(collection.name, data)
+                }},
+                upsert=True
+            )
+            for semester, data in entries
+        ]
+
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            raise RuntimeError(f"Error setting cache: {e}")
+
+        for semester, _ in entries:
+            self._invalidate(collection.name, student_id, semester)
+
+    async def get_cache_records(
+        self,
+        collection: Collection,
+        student_id: str,
+        match: Optional[Dict[str, Any]] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Optional[List[Tuple[int, Any]]]:
+        """
+        於資料庫端展開列表快取，依條件篩選並分頁取得紀錄
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            match: 單筆紀錄的篩選條件，例如 {"t.smye": "113"}
+            after: 僅取得索引大於此值的紀錄
+            limit: 最多取得筆數
+            fields: 僅取得紀錄中的指定欄位
+
+        Returns:
+            [(紀錄於列表中的索引, 紀錄)]，快取不存在、已過期或尚有未寫入的文件時回傳 None
+        """
+        # 佇列中尚未寫入的文件較資料庫中的新，資料庫端展開會讀到舊資料，交由呼叫端經 get_cache 取得
+        if self.write_behind is not None and self.write_behind.get(LocalCache.key(collection.value, student_id)):
+            return None
+
+        collection = self.db[collection.value]
+
+        try:
+            cache_data = await collection.find_one(
+                {"_id": student_id},
+                {"updated_timestamp": 1, "cache_duration": 1, "schema_version": 1, "codec": 1}
+            )
+        except Exception as e:
+            raise RuntimeError(f"Error querying cache: {e}")
+
+        if not cache_data or not self._is_valid(cache_data, collection.name):
+            return None
+
+        # 壓縮編碼的資料無法於資料庫端展開，由呼叫端取得整份資料後處理
+        if cache_data.get("codec"):
+            return None
+
+        record_match: Dict[str, Any] = {f"data.{key}": value for key, value in (match or {}).items()}
+        if after is not None:
+            record_match["index"] = {"$gt": after}
+
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {"_id": student_id}},
+            {"$project": {"data": 1}},
+            {"$unwind": {"path": "$data", "includeArrayIndex": "index"}},
+        ]
+        if record_match:
+            pipeline.append({"$match": record_match})
+        if fields:
+            pipeline.append({"$project": {"index": 1, **{f"data.{field}": 1 for field in fields}}})
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+
+        try:
+            documents = await collection.aggregate(pipeline).to_list(length=None)
+        except Exception as e:
+            raise RuntimeError(f"Error querying cache: {e}")
+
+        return [(document["index"], document.get("data", {})) for document in documents]
+
+    async def get_keyed_caches(
+        self,
+        collection: Collection,
+        student_id: str,
+        keys: List[str]
+    ) -> Dict[str, Any]:
+        """
+        以單次查詢獲取多個鍵值（例如日期）的快取資料
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            keys: 鍵值列表
+
+        Returns:
+            {鍵值: 資料}，僅包含有效的快取
+        """
+        if not keys:
+            return {}
+
+        # 鍵值快取由 set_keyed_caches 直接寫入資料庫，不經延後寫入佇列，無尚未寫入的文件需檢查
+        collection = self.db[collection.value]
+
+        try:
+            documents = await collection.find(
+                {"student_id": student_id, "key": {"$in": keys}}
+            ).to_list(length=None)
+        except Exception as e:
+            raise RuntimeError(f"Error querying cache: {e}")
+
+        cached = {}
+        for document in documents:
+            if not self._is_valid(document, collection.name):
+                continue
+            document = self._decoded(document)
+            if document is not None:
+                cached[document["key"]] = document["data"]
+
+        return cached
+
+    async def set_keyed_caches(
+        self,
+        collection: Collection,
+        student_id: str,
+        entries: Dict[str, Any],
+        cache_duration: int = None
+    ) -> None:
+        """
+        以單次批次寫入設置多個鍵值的快取資料
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            entries: {鍵值: 資料}
+            cache_duration: 快取持續時間(秒)
+        """
+        if not entries:
+            return
+
+        collection = self.db[collection.value]
+        current_time = int(time.time())
+
+        operations = [
+            UpdateOne(
+                {"student_id": student_id, "key": key},
+                {"$set": {
+                    "updated_timestamp": current_time,
+                    "cache_duration": cache_duration or self.default_cache_duration,
+                    **self._stored(collection.name, data)
+                }},
+                upsert=True
+            )
+            for key, data in entries.items()
+        ]
+
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            raise RuntimeError(f"Error setting cache: {e}")
+
+    async def delete_keyed_caches(
+        self,
+        collection: Collection,
+        student_id: str,
+        keys: Optional[List[str]] = None,
+        min_key: Optional[str] = None
+    ) -> None:
+        """
+        刪除多個鍵值的快取資料
+
+        Args:
+            collection: 集合
+            student_id: 學生學號
+            keys: 欲刪除的鍵值，未指定則不限
+            min_key: 僅刪除大於等於此鍵值者，未指定則不限
+        """
+        collection = self.db[collection.value]
+
+        query: Dict[str, Any] = {"student_id": student_id}
+        if keys is not None:
+            query["key"] = {"$in": keys}
+        if min_key is not None:
+            query.setdefault("key", {})["$gte"] = min_key
+
+        await collection.delete_many(query)
+
+    async def get_expiring_student_ids(
+        self,
+        collection: Collection,
+        student_ids: List[str],
+        within: int
+    ) -> List[str]:
+        """
+        取得快取將於指定時間內過期或資料格式版本不符的學號，僅檢查以學號為 _id 的快取
+
+        Args:
+            collection: 集合
+            student_ids: 欲檢查的學號
+            within: 距離過期的秒數
+        """
+        schema_version = collection.schema_version
+        collection = self.db[collection.value]
+        threshold = int(time.time()) + within
+
+        cursor = collection.find(
+            {
+                "_id": {"$in": student_ids},
+                "$expr": {
+                    "$or": [
+                        {"$lt": [
+                            {"$add": [
+                                "$updated_timestamp",
+                                {"$ifNull": ["$cache_duration", self.default_cache_duration]}
+                            ]},
+                            threshold
+                        ]},
+                        {"$ne": [{"$ifNull": ["$schema_version", 1]}, schema_version]}
+                    ]
+                }
+            },
+            {"_id": 1}
+        )
+
+        try:
+            return [document["_id"] async for document in cursor]
+        except Exception as e:
+            raise RuntimeError(f"Error querying cache: {e}")
+
     async def delete_cache(
         self,
         collection: Collection,
@@ -131,16 +781,23 @@ class CacheManager:
             semester: 學年學期資訊 {"year": "112", "semester": "1"}
         """
         collection = self.db[collection.value]
-        
-        query = {"student_id": student_id}
+
         if semester:
-            query.update({
+            query = {
+                "student_id": student_id,
                 "year": semester["year"],
                 "semester": semester["semester"]
-            })
-            
+            }
+        else:
+            query = {"_id": student_id}
+
+        if self.write_behind is not None:
+            await self.write_behind.discard(LocalCache.key(collection.name, student_id, semester))
+
         await collection.delete_one(query)
 
+        self._invalidate(collection.name, student_id, semester)
+
     async def clear_expired_cache(self, collection: Collection) -> None:
         """
         清理過期的快取資料
@@ -151,9 +808,10 @@ class CacheManager:
         collection = self.db[collection.value]
         current_time = int(time.time())
         
-        # 刪除所有過期的快取
+        # 刪除所有過期的快取，不再變動的過去學期資料除外
         await collection.delete_many({
             "updated_timestamp": {
                 "$lt": current_time - self.default_cache_duration
-            }
+            },
+            "immutable": {"$ne": True}
         })
\ No newline at end of file
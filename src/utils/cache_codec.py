@@ -0,0 +1,64 @@
+import json
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from bson import Binary
+
+
+class CacheCodec:
+    """
+    快取資料壓縮編碼
+
+    將資料序列化為精簡 JSON 後以 zlib 壓縮，存為 BSON Binary，快取文件另以 codec 欄位記錄編碼名稱及版本。
+    讀取時依 codec 欄位解碼，未標記者視為未編碼的原始資料，因此可逐一集合切換而不必清除既有快取。
+    編碼後的資料無法於資料庫端投影或展開，僅適合整份讀取的集合。
+    """
+    NAME = "zlib-json"
+    VERSION = 1
+
+    def __init__(self, collections: Iterable[str], level: int = 6):
+        """
+        Args:
+            collections: 使用壓縮編碼的集合名稱
+            level: zlib 壓縮等級 (1-9)
+        """
+        self.collections = frozenset(collections)
+        self.level = level
+
+    @property
+    def tag(self) -> str:
+        return f"{self.NAME}:{self.VERSION}"
+
+    def is_encoded(self, collection_name: str) -> bool:
+        return collection_name in self.collections
+
+    def encode(self, collection_name: str, data: Any) -> Tuple[Any, Optional[str]]:
+        """
+        Returns:
+            (儲存的資料, codec 標記)，集合未使用壓縮編碼時原樣回傳且標記為 None
+        """
+        if not self.is_encoded(collection_name):
+            return data, None
+
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return Binary(zlib.compress(payload, self.level)), self.tag
+
+    def decode(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        還原快取文件中的資料，未編碼的文件原樣回傳
+
+        Raises:
+            ValueError: 不支援的 codec 版本
+        """
+        tag = document.get("codec")
+        if not tag:
+            return document
+
+        if tag != self.tag:
+            raise ValueError(f"Unsupported cache codec: {tag}")
+
+        return {
+            **document,
+            "codec": None,
+            "data": json.loads(zlib.decompress(document["data"]).decode("utf-8"))
+        }
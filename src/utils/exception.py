@@ -11,4 +11,10 @@ class OutOfFileSizeException(Exception):
     pass
 
 class InvalidFormatException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class UpstreamUnavailableException(Exception):
+    pass
+
+class CredentialsRequiredException(Exception):
+    pass
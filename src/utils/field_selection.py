@@ -0,0 +1,150 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Type, get_args
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from starlette import status
+
+FIELD_PATTERN = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+MAX_FIELDS = 20
+
+
+def parse_fields(
+        fields: Optional[str] = Query(
+            None,
+            description="僅回傳指定欄位，以逗號分隔，可使用 . 指定巢狀欄位，例如 name,education.department"
+        )
+) -> Optional[List[str]]:
+    """
+    解析 fields 查詢參數
+
+    巢狀欄位的上層欄位亦被指定時僅保留上層欄位，避免 MongoDB 投影路徑衝突。
+    """
+    if not fields:
+        return None
+
+    paths = sorted({path.strip() for path in fields.split(",") if path.strip()})
+
+    if len(paths) > MAX_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_FIELDS} fields can be selected."
+        )
+
+    for path in paths:
+        if not FIELD_PATTERN.match(path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid field: {path}"
+            )
+
+    selected: List[str] = []
+    for path in paths:
+        if not any(path.startswith(f"{parent}.") for parent in selected):
+            selected.append(path)
+
+    return selected or None
+
+
+def selectable_fields(*models: Type[BaseModel]) -> Callable[..., Optional[List[str]]]:
+    """
+    建立僅接受回應模型中已宣告欄位的 fields 查詢參數
+
+    未宣告的欄位於查詢快取前即回應 400，避免欄位名稱錯誤使投影結果為空而被視為快取未命中。
+    巢狀欄位於上層欄位為回應模型時逐層檢查，其餘型別的下層欄位不檢查。
+
+    Args:
+        models: 回應資料的模型，回應可能為多種模型時皆列出
+    """
+    def dependency(
+            fields: Optional[str] = Query(
+                None,
+                description="僅回傳指定欄位，以逗號分隔，可使用 . 指定巢狀欄位，例如 name,education.department"
+            )
+    ) -> Optional[List[str]]:
+        selected = parse_fields(fields)
+
+        for path in selected or []:
+            if not _is_declared(list(models), path.split(".")):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown field: {path}"
+                )
+
+        return selected
+
+    return dependency
+
+
+def _is_declared(models: List[Type[BaseModel]], keys: List[str]) -> bool:
+    if not keys:
+        return True
+
+    found = False
+    nested: List[Type[BaseModel]] = []
+    for model in models:
+        field = next(
+            (field for name, field in model.model_fields.items() if keys[0] in (name, field.alias)),
+            None
+        )
+        if field is None:
+            continue
+
+        found = True
+        children = _models_in(field.annotation)
+        # 下層不是回應模型時無法檢查，視為已宣告
+        if not children:
+            return True
+        nested.extend(children)
+
+    return found and _is_declared(nested, keys[1:])
+
+
+def _models_in(annotation: Any) -> List[Type[BaseModel]]:
+    """取得型別標註中的模型，例如 Optional[List[Semester]] 取得 Semester"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+
+    return [model for arg in get_args(annotation) for model in _models_in(arg)]
+
+
+def select_fields(data: Any, fields: Optional[List[str]]) -> Any:
+    """
+    依欄位路徑擷取資料，規則與 MongoDB 投影相同：列表會逐筆擷取，不存在的欄位略過
+
+    Args:
+        data: 回應資料
+        fields: 欄位路徑，None 表示不擷取
+    """
+    if not fields:
+        return data
+
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        node = tree
+        keys = path.split(".")
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = None
+
+    return _project(data, tree)
+
+
+def _project(value: Any, tree: Dict[str, Any]) -> Any:
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value if isinstance(item, (dict, list))]
+
+    if not isinstance(value, dict):
+        return value
+
+    result = {}
+    for key, subtree in tree.items():
+        if key not in value:
+            continue
+
+        if subtree is None:
+            result[key] = value[key]
+        elif isinstance(value[key], (dict, list)):
+            result[key] = _project(value[key], subtree)
+
+    return result
@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import os
+import socket
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+INVALIDATION_COLLECTION = "cache_invalidations"
+
+CacheKey = Tuple[str, str, Optional[str], Optional[str]]
+
+
+class LocalCache:
+    """
+    行程內 L1 快取
+
+    存放 get_cache 自 MongoDB 取得的完整快取文件，命中時不必再查詢資料庫。每個 worker 各自持有，
+    須由 CacheInvalidationBus 同步其他 worker 的寫入後才會啟用；另以 ttl 限制單筆存放時間，
+    即使漏接失效通知，過時資料亦僅會存在 ttl 秒。回傳的資料由所有請求共用，呼叫端不得修改。
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.active = False
+        self._entries: OrderedDict[CacheKey, Tuple[Dict[str, Any], float]] = OrderedDict()
+
+    @staticmethod
+    def key(collection_name: str, student_id: str, semester: Optional[Dict[str, str]] = None) -> CacheKey:
+        if semester:
+            return collection_name, student_id, str(semester["year"]), str(semester["semester"])
+        return collection_name, student_id, None, None
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """取得快取文件，未啟用、無紀錄或已超過 ttl 時回傳 None"""
+        if not self.active:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry[1] >= self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: CacheKey, document: Dict[str, Any]) -> None:
+        if not self.active:
+            return
+
+        self._entries[key] = (document, time.monotonic())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheInvalidationBus:
+    """
+    跨 worker 的快取失效通道
+
+    寫入或刪除快取後，於固定大小（capped）的 cache_invalidations 集合新增一筆通知，
+    各 worker 以 tailable cursor 持續接收其他 worker 的通知並淘汰本地 L1 快取。
+    capped 集合不需 replica set，單機 MongoDB 亦可使用；監聽中斷期間停用 L1 快取，恢復後清空重新累積。
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, local_cache: LocalCache, size: int):
+        self.db = db
+        self.local_cache = local_cache
+        self.size = size
+        self.collection = db[INVALIDATION_COLLECTION]
+        self.origin = ""
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        # 各 worker 於自己的行程中啟動，此時才取得行程編號
+        self.origin = f"{socket.gethostname()}:{os.getpid()}"
+
+        try:
+            await self.db.create_collection(INVALIDATION_COLLECTION, capped=True, size=self.size)
+        except CollectionInvalid:
+            # 已由其他 worker 建立
+            pass
+
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        self.local_cache.active = False
+        self.local_cache.clear()
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def publish(self, collection_name: str, student_id: str, semester: Optional[Dict[str, str]] = None) -> None:
+        """
+        淘汰本地 L1 快取，並於背景通知其他 worker
+
+        須於快取寫入資料庫完成後呼叫，確保其他 worker 淘汰後重新讀取的是新資料。
+        """
+        self.publish_key(LocalCache.key(collection_name, student_id, semester))
+
+    def publish_key(self, key: CacheKey) -> None:
+        self.local_cache.evict(key)
+
+        if self._task is None:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._insert(key))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _insert(self, key: CacheKey) -> None:
+        collection, student_id, year, semester = key
+
+        try:
+            await self.collection.insert_one({
+                "origin": self.origin,
+                "timestamp": time.time(),
+                "collection": collection,
+                "student_id": student_id,
+                "year": year,
+                "semester": semester,
+            })
+        except Exception:
+            # 通知失敗時其他 worker 的 L1 快取最多於 ttl 後過期
+            pass
+
+    async def _listen(self) -> None:
+        since = time.time()
+
+        while True:
+            cursor = self.collection.find(
+                {"timestamp": {"$gte": since}},
+                cursor_type=CursorType.TAILABLE_AWAIT
+            )
+
+            try:
+                self.local_cache.active = True
+
+                while cursor.alive:
+                    async for message in cursor:
+                        since = max(since, message["timestamp"])
+                        if message["origin"] != self.origin:
+                            self.local_cache.evict((
+                                message["collection"],
+                                message["student_id"],
+                                message["year"],
+                                message["semester"]
+                            ))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 監聽中斷期間可能漏接通知，清空 L1 快取
+                self.local_cache.active = False
+                self.local_cache.clear()
+            finally:
+                await cursor.close()
+
+            # 集合無符合的通知時 cursor 立即結束，稍後重新建立
+            await asyncio.sleep(1)
@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from fastapi import Query
+
+
+class RecordPageQuery:
+    """
+    紀錄列表的學年學期篩選及 cursor 分頁參數
+
+    cursor 為紀錄於完整列表中的索引，下一頁由上一頁最後一筆之後開始；
+    快取於翻頁期間更新時，索引可能對應到不同紀錄。
+    """
+
+    def __init__(
+            self,
+            year: Optional[str] = Query(None, description="學年，例如 113"),
+            semester: Optional[str] = Query(None, description="學期 (1 或 2)"),
+            cursor: Optional[int] = Query(None, ge=0, description="分頁 cursor，請使用上一頁回傳的 next_cursor"),
+            limit: Optional[int] = Query(None, ge=1, le=100, description="每頁筆數，未指定則回傳全部"),
+    ):
+        self.year = year
+        self.semester = semester
+        self.cursor = cursor
+        self.limit = limit
+
+    @property
+    def is_requested(self) -> bool:
+        return any(value is not None for value in (self.year, self.semester, self.cursor, self.limit))
+
+    def mongo_match(self) -> Dict[str, Any]:
+        """單筆紀錄的篩選條件，學年學期可能以字串或數字儲存"""
+        match = {}
+
+        if self.year is not None:
+            match["t.smye"] = self.__term_value(self.year)
+        if self.semester is not None:
+            match["t.smty"] = self.__term_value(self.semester)
+
+        return match
+
+    def matches(self, record: Any) -> bool:
+        term = record.get("t") if isinstance(record, dict) else None
+        term = term if isinstance(term, dict) else {}
+
+        return (
+            (self.year is None or str(term.get("smye")) == self.year)
+            and (self.semester is None or str(term.get("smty")) == self.semester)
+        )
+
+    def paginate(self, records: Optional[List[Any]]) -> Tuple[List[Any], Optional[int]]:
+        """
+        於記憶體中篩選並分頁，規則與資料庫端相同
+
+        Returns:
+            (紀錄列表, 下一頁 cursor)
+        """
+        page: List[Tuple[int, Any]] = []
+
+        for index, record in enumerate(records or []):
+            if self.cursor is not None and index <= self.cursor:
+                continue
+            if not self.matches(record):
+                continue
+
+            page.append((index, record))
+            if self.limit is not None and len(page) > self.limit:
+                break
+
+        return self.split(page)
+
+    def split(self, page: List[Tuple[int, Any]]) -> Tuple[List[Any], Optional[int]]:
+        """由多取一筆的 (索引, 紀錄) 列表取得本頁紀錄及下一頁 cursor"""
+        if self.limit is not None and len(page) > self.limit:
+            page = page[:self.limit]
+            return [record for _, record in page], page[-1][0]
+
+        return [record for _, record in page], None
+
+    @staticmethod
+    def __term_value(value: str) -> Union[str, Dict[str, list]]:
+        return {"$in": [value, int(value)]} if value.isdigit() else value
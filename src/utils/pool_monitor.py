@@ -0,0 +1,88 @@
+from collections import defaultdict
+from typing import Dict
+
+from pymongo import monitoring
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    記錄 MongoDB 連線池使用狀況
+
+    由 pymongo 的背景執行緒呼叫，僅做計數，供 readiness 端點回報連線池使用率。
+    """
+
+    def __init__(self):
+        self.connections: Dict[str, int] = defaultdict(int)
+        self.checked_out: Dict[str, int] = defaultdict(int)
+        self.waiting: Dict[str, int] = defaultdict(int)
+        self.check_out_failures: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def _key(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def stats(self, max_pool_size: int) -> Dict[str, Dict[str, float]]:
+        """
+        Args:
+            max_pool_size: 每個伺服器的連線池上限
+
+        Returns:
+            {伺服器位址: 使用狀況}
+        """
+        # 計數由其他執行緒更新，先複製再走訪
+        addresses = set().union(
+            self.connections.copy(), self.checked_out.copy(), self.waiting.copy(), self.check_out_failures.copy()
+        )
+
+        return {
+            address: {
+                "connections": self.connections.get(address, 0),
+                "checked_out": self.checked_out.get(address, 0),
+                "waiting": self.waiting.get(address, 0),
+                "check_out_failures": self.check_out_failures.get(address, 0),
+                "utilization": round(self.checked_out.get(address, 0) / max_pool_size, 4) if max_pool_size else 0,
+            }
+            for address in addresses
+        }
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        key = self._key(event)
+        self.connections.pop(key, None)
+        self.checked_out.pop(key, None)
+        self.waiting.pop(key, None)
+        self.check_out_failures.pop(key, None)
+
+    def connection_created(self, event):
+        self.connections[self._key(event)] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.connections[self._key(event)] -= 1
+
+    def connection_check_out_started(self, event):
+        self.waiting[self._key(event)] += 1
+
+    def connection_check_out_failed(self, event):
+        key = self._key(event)
+        self.waiting[key] -= 1
+        self.check_out_failures[key] += 1
+
+    def connection_checked_out(self, event):
+        key = self._key(event)
+        self.waiting[key] -= 1
+        self.checked_out[key] += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out[self._key(event)] -= 1
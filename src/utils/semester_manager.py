@@ -1,11 +1,13 @@
 import json
+from typing import Dict, Optional
 
 from icloud.personal.utils.icloud_utils import iCloudUtils
 from sis.connection import Connection
 
 from src.database import cache_manager
 from src.models.collection import Collection
-from src.utils.exception import NotFoundException
+from src.utils.exception import NotFoundException, UpstreamUnavailableException
+from src.utils.upstream import Upstream, call_upstream
 
 
 class Semester:
@@ -30,11 +32,19 @@ class SemesterManager:
             )
 
             if not semester_cache_data:
-                semester = iCloudUtils.student_semester(icloud_conn)
-                await cache_manager.set_cache(
+                async def fetch():
+                    data = await call_upstream(Upstream.ICLOUD, iCloudUtils.student_semester, icloud_conn)
+                    await cache_manager.set_cache(
+                        Collection.STUDENT_SEMESTER,
+                        icloud_conn.student_id,
+                        data
+                    )
+                    return data
+
+                semester = await cache_manager.with_stale_fallback(
                     Collection.STUDENT_SEMESTER,
                     icloud_conn.student_id,
-                    semester
+                    fetch
                 )
             else:
                 semester = semester_cache_data
@@ -46,3 +56,28 @@ class SemesterManager:
         seme = first_semester["smty"]
 
         return Semester(str(year), str(seme))
+
+    @staticmethod
+    async def get_current_semester_key(icloud_conn: Connection) -> Optional[Dict[str, str]]:
+        """
+        取得當前學期的快取查詢條件 {"year": "113", "semester": "1"}，無法取得時回傳 None
+        """
+        try:
+            semester = await SemesterManager.get_current_semester(icloud_conn)
+        except (NotFoundException, UpstreamUnavailableException):
+            return None
+
+        return {"year": semester.year, "semester": semester.seme}
+
+    @staticmethod
+    async def is_immutable_semester(icloud_conn: Connection, year: Optional[str], seme: Optional[str]) -> bool:
+        """
+        指定的學年學期是否為不再變動的過去學期
+        """
+        if not year or not seme:
+            return False
+
+        return cache_manager.is_immutable_semester(
+            {"year": year, "semester": seme},
+            await SemesterManager.get_current_semester_key(icloud_conn)
+        )
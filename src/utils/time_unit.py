@@ -1,3 +1,10 @@
+from datetime import datetime, timedelta, timezone
+
+from src.config import settings
+
+CAMPUS_TIMEZONE = timezone(timedelta(hours=settings.CAMPUS_UTC_OFFSET_HOURS))
+
+
 class TimeUnit:
     SECOND = 1
     MINUTE = 60 * SECOND
@@ -5,4 +12,8 @@ class TimeUnit:
     DAY = 24 * HOUR
     WEEK = 7 * DAY
     MONTH = 30 * DAY
-    YEAR = 365 * DAY
\ No newline at end of file
+    YEAR = 365 * DAY
+
+def campus_now() -> datetime:
+    """取得校園時區的目前時間，不受伺服器時區設定影響"""
+    return datetime.now(CAMPUS_TIMEZONE).replace(tzinfo=None)
@@ -0,0 +1,148 @@
+from datetime import datetime, time as dt_time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.time_unit import campus_now
+
+PeriodTime = Tuple[dt_time, dt_time]
+
+# 課表索引保留的課程欄位
+SLOT_FIELDS = ("scheduleName", "abbScheduleName", "courseId", "courseCode", "classroom", "teacher")
+
+
+def _period_time(value: str) -> PeriodTime:
+    start, end = value.split("-")
+    return dt_time.fromisoformat(start.strip()), dt_time.fromisoformat(end.strip())
+
+
+class TimetableIndex:
+    """
+    課表索引
+
+    每份課表快取建立一次索引，依星期分組並合併同一課程的連續節次，另依教室分組，
+    「今日課程」、「下一堂課」及教室查詢只需讀取索引中對應星期或教室的資料，不必傳回並掃描整份課表。
+    索引僅記錄節次，各節上下課時間於查詢時由 period_times 對應，調整節次時間不必重建索引。
+    """
+
+    def __init__(self, period_times: Dict[int, str]):
+        """
+        Args:
+            period_times: 各節次的上下課時間 {1: "08:10-09:00", ...}
+        """
+        self.period_times: Dict[int, PeriodTime] = {
+            int(period): _period_time(value) for period, value in period_times.items()
+        }
+
+    def build(self, timetable: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        由課表建立索引
+
+        Returns:
+            {"days": {"1": [課程, ...], ...}, "locations": [{"classroom": 教室, "courses": [課程, ...]}, ...]}
+            課程為 {"week": 星期, "periods": [節次, ...], 課程欄位...}，依節次排序
+        """
+        entries = [
+            entry for entry in (timetable or {}).get("schedule") or []
+            if self._as_int(entry.get("week")) is not None and self._as_int(entry.get("period")) is not None
+        ]
+        entries.sort(key=lambda entry: (self._as_int(entry["week"]), self._as_int(entry["period"])))
+
+        days: Dict[str, List[Dict[str, Any]]] = {}
+        locations: Dict[str, List[Dict[str, Any]]] = {}
+
+        for entry in entries:
+            week = self._as_int(entry["week"])
+            period = self._as_int(entry["period"])
+            day = days.setdefault(str(week), [])
+
+            previous = day[-1] if day else None
+            if previous and previous["periods"][-1] == period - 1 \
+                    and previous.get("courseId") == entry.get("courseId") \
+                    and previous.get("classroom") == entry.get("classroom"):
+                previous["periods"].append(period)
+                continue
+
+            slot = {
+                "week": week,
+                "periods": [period],
+                **{field: entry[field] for field in SLOT_FIELDS if field in entry}
+            }
+            day.append(slot)
+
+            if slot.get("classroom"):
+                locations.setdefault(str(slot["classroom"]), []).append(slot)
+
+        # 教室名稱可能含有「.」，不適合作為 MongoDB 文件的鍵值
+        return {
+            "days": days,
+            "locations": [
+                {"classroom": classroom, "courses": courses}
+                for classroom, courses in locations.items()
+            ]
+        }
+
+    def today(self, index: Dict[str, Any], week: int) -> Dict[str, Any]:
+        """
+        取得指定星期的課程及空堂
+
+        Args:
+            index: 課表索引
+            week: 星期 (1-7)
+        """
+        courses = [self._with_time(slot) for slot in index["days"].get(str(week), [])]
+        occupied = {period for slot in courses for period in slot["periods"]}
+
+        return {
+            "week": week,
+            "courses": courses,
+            "free_periods": [period for period in sorted(self.period_times) if period not in occupied]
+        }
+
+    def next(self, index: Dict[str, Any], now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        取得下一堂課，當日已無課程時往後找，最多一週
+
+        Returns:
+            課程並附上 days_ahead（距今天數），課表無課程時回傳 None
+            未指定 now 時以校園時區的目前時間計算
+        """
+        now = now or campus_now()
+        today = now.isoweekday()
+
+        for days_ahead in range(8):
+            week = (today - 1 + days_ahead) % 7 + 1
+            for slot in index["days"].get(str(week), []):
+                if days_ahead == 0 and not self._starts_after(slot, now.time()):
+                    continue
+                return {**self._with_time(slot), "days_ahead": days_ahead}
+
+        return None
+
+    def location(self, index: Dict[str, Any], classroom: str) -> List[Dict[str, Any]]:
+        """取得指定教室的課程"""
+        for location in index["locations"]:
+            if location["classroom"] == classroom:
+                return [self._with_time(slot) for slot in location["courses"]]
+
+        return []
+
+    def _starts_after(self, slot: Dict[str, Any], moment: dt_time) -> bool:
+        period_time = self.period_times.get(slot["periods"][0])
+        # 未設定時間的節次無法判斷，視為尚未開始
+        return period_time is None or period_time[0] > moment
+
+    def _with_time(self, slot: Dict[str, Any]) -> Dict[str, Any]:
+        start = self.period_times.get(slot["periods"][0])
+        end = self.period_times.get(slot["periods"][-1])
+
+        return {
+            **slot,
+            "start": start[0].strftime("%H:%M") if start else None,
+            "end": end[1].strftime("%H:%M") if end else None
+        }
+
+    @staticmethod
+    def _as_int(value: Any) -> Optional[int]:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
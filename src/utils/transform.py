@@ -0,0 +1,97 @@
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+NestSpec = Dict[str, Dict[str, str]]
+
+
+class RecordTransformer:
+    """
+    宣告式紀錄轉換器
+
+    於建構時將轉換規格編譯為專用函數，套用時每筆紀錄僅走訪一次並原地修改，
+    不需逐筆解讀規格，也不會額外複製紀錄。
+
+    轉換順序：巢狀合併 → 欄位改名 → 型別轉換 → 刪除欄位。
+    """
+
+    def __init__(
+            self,
+            nest: Optional[NestSpec] = None,
+            renames: Optional[Dict[str, str]] = None,
+            casts: Optional[Dict[str, Callable]] = None,
+            drops: Iterable[str] = ()
+    ):
+        """
+        Args:
+            nest: 巢狀合併 {新欄位: {子欄位: 來源欄位}}，來源欄位會自紀錄中移除
+            renames: 欄位改名 {舊欄位: 新欄位}
+            casts: 型別轉換 {來源欄位: 轉換函數}，套用於巢狀合併及改名前的原始欄位
+            drops: 欲刪除的欄位，欄位不存在時忽略
+        """
+        self.nest = nest or {}
+        self.renames = renames or {}
+        self.casts = casts or {}
+        self.drops = tuple(drops)
+
+        self._apply_one, self._apply_all = self._compile()
+
+    def _compile(self):
+        namespace: Dict[str, Callable] = {}
+        cast_names: Dict[str, str] = {}
+
+        for index, (field, cast) in enumerate(self.casts.items()):
+            cast_names[field] = f"_cast_{index}"
+            namespace[cast_names[field]] = cast
+
+        def take(field: str) -> str:
+            expression = f"record.pop({field!r})"
+            if field in cast_names:
+                expression = f"{cast_names[field]}({expression})"
+            return expression
+
+        consumed = set(self.renames)
+        body: List[str] = []
+
+        for target, fields in self.nest.items():
+            items = ", ".join(f"{key!r}: {take(source)}" for key, source in fields.items())
+            body.append(f"record[{target!r}] = {{{items}}}")
+            consumed.update(fields.values())
+
+        for old, new in self.renames.items():
+            body.append(f"record[{new!r}] = {take(old)}")
+
+        for field, cast_name in cast_names.items():
+            if field not in consumed:
+                body.append(f"record[{field!r}] = {cast_name}(record[{field!r}])")
+
+        for field in self.drops:
+            body.append(f"record.pop({field!r}, None)")
+
+        body = body or ["pass"]
+        source = "\n".join([
+            "def _apply_one(record):",
+            *(f"    {line}" for line in body),
+            "    return record",
+            "",
+            "def _apply_all(records):",
+            "    for record in records:",
+            *(f"        {line}" for line in body),
+            "    return records",
+        ])
+
+        exec(compile(source, f"<RecordTransformer {id(self):x}>", "exec"), namespace)
+        return namespace["_apply_one"], namespace["_apply_all"]
+
+    def apply(self, record: dict) -> dict:
+        """轉換單筆紀錄"""
+        return self._apply_one(record)
+
+    def __call__(self, records: Union[List[dict], None]) -> Union[List[dict], None]:
+        """轉換整個紀錄列表，空值原樣回傳"""
+        if not records:
+            return records
+
+        return self._apply_all(records)
+
+
+# 將 year/sem 合併為學期欄位 t
+SEMESTER_TERM = RecordTransformer(nest={"t": {"smye": "year", "smty": "sem"}})
@@ -0,0 +1,250 @@
+import asyncio
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Any, Dict, Iterable, Optional, Tuple
+
+from requests import RequestException
+from sis.exception import ConnectionException, HTTPRequestException, UnexpectedResponseException
+
+from src.config import settings
+from src.utils.exception import UpstreamUnavailableException
+
+# 視為上游服務異常的例外，其餘例外（如 session 失效的 KeyError）代表上游仍有回應
+UPSTREAM_FAILURES = (
+    RequestException,
+    ConnectionException,
+    HTTPRequestException,
+    UnexpectedResponseException,
+)
+
+
+class Upstream(Enum):
+    """上游校園系統"""
+    SIS = "sis"
+    ICLOUD = "icloud"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    斷路器
+
+    連續失敗次數達門檻後開路，開路期間直接拒絕請求；
+    冷卻時間過後進入半開狀態，僅放行一個試探請求，成功則閉路，失敗則重新開路。
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probing = False
+
+        # 半開狀態僅允許一個試探請求
+        if self._probing:
+            return False
+
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failure_count += 1
+        self._probing = False
+
+        if self.state == CircuitState.HALF_OPEN or self.failure_count >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 自適應併發上限
+
+    請求成功且延遲低於門檻時，上限約每個視窗加一（加法增加）；
+    逾時、失敗或延遲過高時，上限乘上退避比例（乘法減少）。
+    """
+
+    def __init__(
+            self,
+            min_limit: int,
+            max_limit: int,
+            latency_threshold: float,
+            backoff_ratio: float = 0.5
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(max_limit)
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def cancel(self) -> None:
+        """釋放未實際執行的名額，不調整上限"""
+        self.in_flight -= 1
+
+    def release(self, latency: float, dropped: bool) -> None:
+        self.in_flight -= 1
+
+        if dropped or latency > self.latency_threshold:
+            self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+
+class SessionLiveness:
+    """
+    上游 session 存活紀錄
+
+    記錄每個 session 最近一次上游呼叫的結果：成功代表 session 仍有效，KeyError 代表已失效。
+    於新鮮時間內可直接採用紀錄，不必再向上游確認。僅記錄於本行程，超過上限時淘汰最久未更新者。
+    """
+
+    def __init__(self, freshness: float, max_entries: int):
+        self.freshness = freshness
+        self.max_entries = max_entries
+        self._verdicts: OrderedDict[Tuple[Upstream, str], Tuple[bool, float]] = OrderedDict()
+
+    def mark(self, upstream: Upstream, session_id: str, alive: bool) -> None:
+        key = (upstream, session_id)
+        self._verdicts[key] = (alive, time.monotonic())
+        self._verdicts.move_to_end(key)
+
+        while len(self._verdicts) > self.max_entries:
+            self._verdicts.popitem(last=False)
+
+    def mark_args(self, upstream: Upstream, args: Iterable, alive: bool) -> None:
+        """依呼叫參數中的連線物件記錄 session 狀態"""
+        for arg in args:
+            session_id = getattr(arg, "php_session_id", None)
+            if isinstance(session_id, str):
+                self.mark(upstream, session_id, alive)
+
+    def get(self, upstream: Upstream, session_id: str) -> Optional[bool]:
+        """取得新鮮時間內的存活紀錄，無紀錄或已過期時回傳 None"""
+        verdict = self._verdicts.get((upstream, session_id))
+
+        if verdict is None or time.monotonic() - verdict[1] >= self.freshness:
+            return None
+
+        return verdict[0]
+
+
+session_liveness = SessionLiveness(settings.SESSION_LIVENESS_FRESHNESS, settings.SESSION_LIVENESS_MAX_ENTRIES)
+
+
+class UpstreamGuard:
+    """
+    上游呼叫保護
+
+    將阻塞的上游呼叫移至執行緒池執行，並以斷路器及自適應併發上限保護，
+    避免上游變慢時 worker 被堆積的請求拖垮。
+    """
+
+    def __init__(self, upstream: Upstream):
+        self.upstream = upstream
+        self.timeout = settings.UPSTREAM_TIMEOUT
+        self.breaker = CircuitBreaker(
+            settings.CIRCUIT_FAILURE_THRESHOLD,
+            settings.CIRCUIT_RECOVERY_TIMEOUT
+        )
+        self.limiter = AdaptiveConcurrencyLimiter(
+            settings.UPSTREAM_MIN_CONCURRENCY,
+            settings.UPSTREAM_MAX_CONCURRENCY,
+            settings.UPSTREAM_LATENCY_THRESHOLD
+        )
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        呼叫上游函數
+
+        Raises:
+            UpstreamUnavailableException: 斷路器開路、超過併發上限、逾時或上游異常
+        """
+        if not self.limiter.try_acquire():
+            raise UpstreamUnavailableException(f"{self.upstream} is overloaded, please try again later.")
+
+        if not self.breaker.allow_request():
+            self.limiter.cancel()
+            raise UpstreamUnavailableException(f"{self.upstream} is temporarily unavailable.")
+
+        started = time.monotonic()
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+
+        # 名額在執行緒實際結束時才釋放，逾時的呼叫仍佔用名額
+        def on_done(f: asyncio.Future):
+            dropped = f.cancelled() or isinstance(f.exception(), UPSTREAM_FAILURES)
+            self.limiter.release(time.monotonic() - started, dropped)
+
+        future.add_done_callback(on_done)
+
+        # 等待的請求被取消（用戶端斷線、關閉服務）時，執行緒仍會繼續執行，
+        # 由執行緒結束時的結果更新斷路器，避免半開狀態的試探請求永遠未結束而持續拒絕請求
+        def on_abandoned_done(f: asyncio.Future):
+            if f.cancelled() or isinstance(f.exception(), UPSTREAM_FAILURES):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.CancelledError:
+            future.add_done_callback(on_abandoned_done)
+            raise
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise UpstreamUnavailableException(f"{self.upstream} request timed out.")
+        except UPSTREAM_FAILURES as e:
+            self.breaker.record_failure()
+            raise UpstreamUnavailableException(f"{self.upstream} request failed: {e}") from e
+        except KeyError:
+            # 上游有回應但 session 已失效
+            self.breaker.record_success()
+            session_liveness.mark_args(self.upstream, args, False)
+            raise
+        except Exception:
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+        session_liveness.mark_args(self.upstream, args, True)
+        return result
+
+
+upstream_guards: Dict[Upstream, UpstreamGuard] = {upstream: UpstreamGuard(upstream) for upstream in Upstream}
+
+
+async def call_upstream(upstream: Upstream, func: Callable, *args, **kwargs) -> Any:
+    """經由對應上游的保護呼叫阻塞函數"""
+    return await upstream_guards[upstream].call(func, *args, **kwargs)
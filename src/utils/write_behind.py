@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.utils.local_cache import CacheKey
+
+# (查詢條件, 快取文件)
+PendingWrite = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+class WriteBehindQueue:
+    """
+    快取延後寫入佇列
+
+    set_cache 將快取文件放入佇列後立即返回，由背景工作定期以 bulk_write 批次寫入 MongoDB，
+    使快取寫入不佔用回應時間。同一筆快取在寫入前再次更新時僅保留最新的文件；
+    寫入前的讀取由 get 取得佇列中的文件，本行程內不會讀到舊資料。
+    佇列已滿或未啟動時 enqueue 回傳 False，由呼叫端直接寫入。
+    寫入失敗的快取放回佇列重試，連續失敗達 max_attempts 次（例如文件過大）即捨棄，避免阻擋其他快取。
+    """
+
+    def __init__(
+            self,
+            db: AsyncIOMotorDatabase,
+            flush_interval: float,
+            batch_size: int,
+            max_pending: int,
+            on_flushed: Optional[Callable[[CacheKey], None]] = None,
+            max_attempts: int = 5
+    ):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.on_flushed = on_flushed
+        self.max_attempts = max_attempts
+        self._pending: OrderedDict[CacheKey, PendingWrite] = OrderedDict()
+        self._inflight: Dict[CacheKey, PendingWrite] = {}
+        self._attempts: Dict[CacheKey, int] = {}
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def enqueue(self, key: CacheKey, query: Dict[str, Any], document: Dict[str, Any]) -> bool:
+        """
+        Args:
+            key: 快取鍵值 (集合名稱, 學號, 學年, 學期)
+            query: 寫入時的查詢條件
+            document: 快取文件
+
+        Returns:
+            是否已放入佇列
+        """
+        if not self.running:
+            return False
+
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            return False
+
+        self._pending[key] = (query, document)
+        self._pending.move_to_end(key)
+        # 新的文件重新計算失敗次數
+        self._attempts.pop(key, None)
+
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+        return True
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """取得尚未寫入的快取文件"""
+        pending = self._pending.get(key) or self._inflight.get(key)
+        return pending[1] if pending else None
+
+    async def discard(self, key: CacheKey) -> None:
+        """移除尚未寫入的快取，等待進行中的寫入完成，避免刪除後又被寫回"""
+        async with self._lock:
+            self._pending.pop(key, None)
+            self._attempts.pop(key, None)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float) -> None:
+        """停止背景工作並寫入剩餘的快取，最多等待 timeout 秒"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        # 逾時或寫入失敗時放棄剩餘的快取，僅影響命中率
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self._flush_all(), timeout)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                # 寫入失敗的快取已放回佇列，待下一輪再試
+                pass
+
+    async def _flush_all(self) -> None:
+        while self._pending:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """寫入佇列中最多 batch_size 筆快取"""
+        async with self._lock:
+            batch: List[Tuple[CacheKey, PendingWrite]] = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popitem(last=False))
+
+            self._inflight = dict(batch)
+
+            grouped: Dict[str, List[Tuple[CacheKey, PendingWrite]]] = defaultdict(list)
+            for key, pending in batch:
+                grouped[key[0]].append((key, pending))
+
+            try:
+                results = await asyncio.gather(*(
+                    self._write(collection_name, entries)
+                    for collection_name, entries in grouped.items()
+                ), return_exceptions=True)
+            except BaseException:
+                # 被取消時放回佇列，不計入失敗次數
+                self._requeue(batch)
+                raise
+            finally:
+                self._inflight = {}
+
+            flushed: List[CacheKey] = []
+            failed: List[Tuple[CacheKey, PendingWrite]] = []
+            error: Optional[BaseException] = None
+            for entries, result in zip(grouped.values(), results):
+                if isinstance(result, BaseException):
+                    failed.extend(entries)
+                    error = result
+                    continue
+
+                failed_indexes = result
+                for index, (key, pending) in enumerate(entries):
+                    if index in failed_indexes:
+                        failed.append((key, pending))
+                    else:
+                        flushed.append(key)
+                        self._attempts.pop(key, None)
+
+            dropped = self._retry_or_drop(failed)
+
+        if self.on_flushed is not None:
+            for key in flushed + dropped:
+                self.on_flushed(key)
+
+        if error is not None:
+            raise error
+
+    async def _write(self, collection_name: str, entries: List[Tuple[CacheKey, PendingWrite]]) -> Set[int]:
+        """
+        以無序 bulk_write 寫入同一集合的快取
+
+        Returns:
+            寫入失敗的操作索引，其餘操作已寫入
+        """
+        operations = [UpdateOne(query, {"$set": document}, upsert=True) for _, (query, document) in entries]
+
+        try:
+            await self.db[collection_name].bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            # 無個別錯誤時（例如 write concern 錯誤）整批重試
+            return failed or set(range(len(entries)))
+
+        return set()
+
+    def _retry_or_drop(self, failed: List[Tuple[CacheKey, PendingWrite]]) -> List[CacheKey]:
+        """
+        寫入失敗的快取放回佇列，連續失敗達上限者捨棄
+
+        Returns:
+            捨棄的快取鍵值
+        """
+        retry: List[Tuple[CacheKey, PendingWrite]] = []
+        dropped: List[CacheKey] = []
+
+        for key, pending in failed:
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_attempts:
+                self._attempts.pop(key, None)
+                dropped.append(key)
+            else:
+                self._attempts[key] = attempts
+                retry.append((key, pending))
+
+        if dropped:
+            print(f"Write-behind dropped {len(dropped)} cache write(s) after {self.max_attempts} failed attempts: "
+                  f"{', '.join(str(key) for key in dropped[:5])}")
+
+        self._requeue(retry)
+        return dropped
+
+    def _requeue(self, entries: List[Tuple[CacheKey, PendingWrite]]) -> None:
+        """放回佇列前端，寫入期間已有更新者保留較新的文件"""
+        for key, pending in reversed(entries):
+            if key not in self._pending:
+                self._pending[key] = pending
+                self._pending.move_to_end(key, last=False)
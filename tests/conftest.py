@@ -0,0 +1,12 @@
+import os
+
+# 測試不連線資料庫，僅提供載入設定所需的必填值，已於環境或 .env 設定者不覆蓋
+for name, value in {
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DB_NAME": "dyu_sis_api_test",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "CACHE_DURATION": "3600",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,106 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.models.academic_calendar import CalendarWindow
+from src.models.collection import Collection
+from src.utils import academic_calendar
+from src.utils.academic_calendar import AcademicCalendar
+
+WINDOW = 6 * 3600
+STEADY = 14 * 86400
+PAST = 365 * 86400
+
+
+@pytest.fixture
+def calendar():
+    return AcademicCalendar(
+        windows=[
+            CalendarWindow(name="加退選", start="08-20", end="10-10", collections=[Collection.COURSE_TIMETABLE]),
+            CalendarWindow(name="寒假", start="12-20", end="01-10", collections=[Collection.COURSE_WARNING]),
+        ],
+        window_duration=WINDOW,
+        steady_duration=STEADY,
+        past_semester_duration=PAST,
+        past_semester_grace_days=45,
+        min_duration=60
+    )
+
+
+@pytest.mark.parametrize("today, expected", [
+    (date(2024, 8, 1), (113, 1)),
+    (date(2024, 7, 31), (112, 2)),
+    (date(2024, 2, 1), (112, 2)),
+    (date(2024, 1, 31), (112, 1)),
+])
+def test_current_semester_boundaries(calendar, today, expected):
+    assert calendar.current_semester(today) == expected
+
+
+def test_past_semester_after_grace_period(calendar):
+    semester = {"year": "112", "semester": "2"}
+
+    # 113-1 於 08-01 開始，45 天寬限期至 09-14
+    assert not calendar.is_past_semester(semester, date(2024, 9, 14))
+    assert calendar.is_past_semester(semester, date(2024, 9, 15))
+
+
+def test_current_and_future_semester_not_past(calendar):
+    today = date(2024, 12, 1)
+
+    assert not calendar.is_past_semester({"year": "113", "semester": "1"}, today)
+    assert not calendar.is_past_semester({"year": "113", "semester": "2"}, today)
+
+
+@pytest.mark.parametrize("semester", [None, {}, {"year": "abc", "semester": "1"}, {"year": "112"}])
+def test_unparsable_semester_not_past(calendar, semester):
+    assert not calendar.is_past_semester(semester, date(2030, 1, 1))
+
+
+def test_cache_duration_inside_window_inclusive(calendar):
+    name = Collection.COURSE_TIMETABLE.value
+
+    assert calendar.cache_duration(name, now=datetime(2024, 8, 20, 0, 0)) == WINDOW
+    assert calendar.cache_duration(name, now=datetime(2024, 10, 10, 23, 59)) == WINDOW
+
+
+def test_cache_duration_capped_by_next_window(calendar):
+    name = Collection.COURSE_TIMETABLE.value
+
+    assert calendar.cache_duration(name, now=datetime(2024, 8, 19, 12, 0)) == 12 * 3600
+    assert calendar.cache_duration(name, now=datetime(2024, 10, 11, 0, 0)) == STEADY
+
+
+def test_cache_duration_has_lower_bound(calendar):
+    name = Collection.COURSE_TIMETABLE.value
+
+    assert calendar.cache_duration(name, now=datetime(2024, 8, 19, 23, 59, 30)) == 60
+
+
+def test_cache_duration_window_across_new_year(calendar):
+    name = Collection.COURSE_WARNING.value
+
+    assert calendar.cache_duration(name, now=datetime(2024, 12, 31)) == WINDOW
+    assert calendar.cache_duration(name, now=datetime(2025, 1, 10, 12, 0)) == WINDOW
+    assert calendar.cache_duration(name, now=datetime(2025, 1, 11)) == STEADY
+
+
+def test_cache_duration_past_semester(calendar):
+    semester = {"year": "111", "semester": "1"}
+    now = datetime(2024, 8, 25)
+
+    assert calendar.cache_duration(Collection.COURSE_TIMETABLE.value, semester, now) == PAST
+    assert calendar.cache_duration(Collection.INJURY.value, semester, now) == PAST
+
+
+def test_cache_duration_unaffected_collection(calendar):
+    assert calendar.cache_duration(Collection.INJURY.value, now=datetime(2024, 8, 25)) is None
+
+
+def test_defaults_use_campus_time(calendar, monkeypatch):
+    # 伺服器時間（UTC）仍為前一天，校園時間已是 08-01 及 08-20
+    monkeypatch.setattr(academic_calendar, "campus_now", lambda: datetime(2024, 8, 1, 7, 30))
+    assert calendar.current_semester() == (113, 1)
+
+    monkeypatch.setattr(academic_calendar, "campus_now", lambda: datetime(2024, 8, 20, 0, 30))
+    assert calendar.cache_duration(Collection.COURSE_TIMETABLE.value) == WINDOW
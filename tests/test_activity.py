@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+
+from src.config import settings
+from src.utils import activity
+from src.utils.activity import ActivityTracker
+
+
+class FakeCollection:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.updates = []
+
+    async def update_one(self, query, update, upsert=False):
+        if self.fail:
+            raise RuntimeError("write failed")
+        self.updates.append((query["_id"], update["$set"]))
+
+
+def make_tracker(fail=False):
+    return ActivityTracker({activity.ACTIVE_SESSION_COLLECTION: FakeCollection(fail)})
+
+
+def payload(student_id="F1234567", session="s1"):
+    return {
+        "s_id": student_id,
+        "sis": {"session_id": f"sis-{session}", "login_timestamp": 1000},
+        "ic": {"session_id": f"ic-{session}", "login_timestamp": 2000},
+    }
+
+
+def touch_all(tracker, *payloads):
+    async def scenario():
+        for item in payloads:
+            tracker.touch(item)
+        await asyncio.gather(*tracker._pending)
+    asyncio.run(scenario())
+
+
+def test_records_session_and_expiry_from_oldest_login():
+    tracker = make_tracker()
+
+    touch_all(tracker, payload())
+
+    [(student_id, fields)] = tracker.collection.updates
+    assert student_id == "F1234567"
+    assert fields["sis"]["session_id"] == "sis-s1"
+    assert fields["expires_timestamp"] == 1000 + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+def test_same_session_written_once_per_interval():
+    tracker = make_tracker()
+
+    touch_all(tracker, payload(), payload(), payload(session="s2"))
+
+    assert [fields["sis"]["session_id"] for _, fields in tracker.collection.updates] == ["sis-s1", "sis-s2"]
+
+
+def test_ignores_malformed_payloads():
+    tracker = make_tracker()
+
+    touch_all(tracker, {"s_id": "F1234567"}, {**payload(), "ic": "broken"})
+
+    assert tracker.collection.updates == []
+
+
+def test_failed_write_is_retried_on_next_touch():
+    tracker = make_tracker(fail=True)
+    touch_all(tracker, payload())
+
+    tracker.collection.fail = False
+    touch_all(tracker, payload())
+
+    assert len(tracker.collection.updates) == 1
+
+
+def test_forgets_least_recently_active(monkeypatch):
+    monkeypatch.setattr(settings, "ACTIVITY_MAX_ENTRIES", 2)
+    tracker = make_tracker()
+
+    touch_all(tracker, payload("A"), payload("B"), payload("C"))
+
+    assert list(tracker._last_touch) == ["B", "C"]
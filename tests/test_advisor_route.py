@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("motor")
+pytest.importorskip("jose")
+pytest.importorskip("sis")
+pytest.importorskip("icloud")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import student
+from src.services import student_service
+from src.utils.auth import verify_jwt_token
+
+TOKEN = {
+    "s_id": "F1234567",
+    "ic": {"session_id": "icloud-session", "login_timestamp": 0},
+    "sis": {"session_id": "sis-session", "login_timestamp": 0},
+}
+
+# iCloud.advisor_info 回傳單一導師的列表
+ADVISOR_INFO = [{
+    "teno": "T001",
+    "epno": "E001",
+    "name": "王老師",
+    "email": "teacher@example.edu.tw",
+    "tel": "04-8511888",
+    "ext": "1234",
+    "img": "",
+    "room": "行政大樓 301",
+}]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(student_service.iCloud, "advisor_info", lambda conn, advisor_id: ADVISOR_INFO)
+
+    app = FastAPI()
+    app.include_router(student.router, prefix="/student")
+    app.dependency_overrides[verify_jwt_token] = lambda: TOKEN
+
+    return TestClient(app)
+
+
+def test_advisor_info_returns_single_object(client):
+    response = client.get("/student/advisor/T001")
+
+    assert response.status_code == 200
+    # 宣告及未宣告的欄位皆原樣回傳
+    assert response.json() == {"data": ADVISOR_INFO[0]}
+
+
+def test_advisor_info_not_found(client, monkeypatch):
+    monkeypatch.setattr(student_service.iCloud, "advisor_info", lambda conn, advisor_id: [])
+
+    assert client.get("/student/advisor/T404").status_code == 404
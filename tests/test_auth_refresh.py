@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("motor")
+pytest.importorskip("jose")
+pytest.importorskip("sis")
+pytest.importorskip("icloud")
+
+from jose import jwt
+
+from src.config import settings
+from src.models.auth import LoginRequest
+from src.services import auth_service
+from src.services.auth_service import AuthService
+from src.utils.exception import CredentialsRequiredException
+from src.utils.upstream import SessionLiveness
+
+
+def payload():
+    return {
+        "s_id": "F1234567",
+        "sis": {"session_id": "sis-old", "login_timestamp": 1.0},
+        "ic": {"session_id": "ic-old", "login_timestamp": 1.0},
+    }
+
+
+def decode(response):
+    return jwt.decode(response.access_token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    state = {"sis": True, "ic": True, "logins": [], "release": threading.Event()}
+    state["release"].set()
+
+    def login(name):
+        def fake_login(username, password):
+            state["release"].wait(5)
+            state["logins"].append(name)
+            return SimpleNamespace(php_session_id=f"{name}-new", last_login_timestamp=2.0)
+        return fake_login
+
+    # 每個測試使用獨立的 session 存活紀錄與合併表，避免互相影響
+    monkeypatch.setattr(auth_service, "session_liveness", SessionLiveness(60, 100))
+    monkeypatch.setattr(AuthService, "_pending_refreshes", {})
+    monkeypatch.setattr(settings, "REFRESH_ENABLED", False)
+    monkeypatch.setattr(auth_service.SIS, "is_logged_in", lambda conn: state["sis"])
+    monkeypatch.setattr(auth_service.iCloud, "is_logged_in", lambda conn: state["ic"])
+    monkeypatch.setattr(auth_service.SIS, "login", login("sis"))
+    monkeypatch.setattr(auth_service.iCloud, "login", login("ic"))
+    return state
+
+
+def test_refresh_without_credentials_when_sessions_alive(upstream):
+    token = payload()
+
+    refreshed = decode(asyncio.run(AuthService.refresh(token)))
+
+    assert refreshed["sis"] == token["sis"]
+    assert refreshed["ic"] == token["ic"]
+    assert upstream["logins"] == []
+
+
+def test_refresh_without_credentials_rejected_when_session_expired(upstream):
+    upstream["sis"] = False
+
+    with pytest.raises(CredentialsRequiredException):
+        asyncio.run(AuthService.refresh(payload()))
+
+
+def test_refresh_relogs_only_expired_session(upstream):
+    upstream["sis"] = False
+    token = payload()
+
+    refreshed = decode(asyncio.run(AuthService.refresh(token, LoginRequest(username="f1234567", password="pw"))))
+
+    assert upstream["logins"] == ["sis"]
+    assert refreshed["sis"]["session_id"] == "sis-new"
+    assert refreshed["ic"] == token["ic"]
+
+
+def test_refresh_rejects_other_username(upstream):
+    with pytest.raises(ValueError):
+        asyncio.run(AuthService.refresh(payload(), LoginRequest(username="F7654321", password="pw")))
+
+
+def test_concurrent_refreshes_share_one_relogin(upstream):
+    upstream["ic"] = False
+    upstream["release"].clear()
+    token = payload()
+    login_data = LoginRequest(username="F1234567", password="pw")
+
+    async def scenario():
+        first = asyncio.create_task(AuthService.refresh(token, login_data))
+        second = asyncio.create_task(AuthService.refresh(token, login_data))
+        await asyncio.sleep(0.05)
+        upstream["release"].set()
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(scenario())
+
+    assert upstream["logins"] == ["ic"]
+    assert first.access_token == second.access_token
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("bson")
+
+from bson import BSON, Binary
+
+from src.utils.cache_codec import CacheCodec
+
+DATA = {"courses": [{"name": "資料結構", "credit": 3, "room": None}], "total": 1}
+
+
+def test_round_trips_through_bson():
+    codec = CacheCodec(["course_timetable"])
+
+    stored, tag = codec.encode("course_timetable", DATA)
+    document = BSON(BSON.encode({"_id": "F1234567", "data": stored, "codec": tag})).decode()
+
+    assert isinstance(stored, Binary)
+    assert tag == "zlib-json:1"
+    assert codec.decode(document) == {"_id": "F1234567", "data": DATA, "codec": None}
+
+
+def test_other_collections_stay_raw():
+    codec = CacheCodec(["course_timetable"])
+
+    assert codec.encode("student_info", DATA) == (DATA, None)
+
+
+def test_untagged_documents_pass_through():
+    codec = CacheCodec(["course_timetable"])
+    document = {"_id": "F1234567", "data": DATA}
+
+    assert codec.decode(document) is document
+
+
+def test_compresses_repetitive_data():
+    codec = CacheCodec(["course_timetable"])
+    data = {"courses": [{"name": "資料結構", "teacher": "王老師", "room": "H301"}] * 50}
+
+    stored, _ = codec.encode("course_timetable", data)
+
+    assert len(stored) < len(BSON.encode({"data": data})) / 5
+
+
+def test_rejects_unknown_codec_version():
+    codec = CacheCodec(["course_timetable"])
+
+    with pytest.raises(ValueError):
+        codec.decode({"data": b"", "codec": "zlib-json:2"})
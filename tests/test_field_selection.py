@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+
+from src.models.graduation import GRADUATION_MODELS
+from src.models.student import EnrollmentRecord, StudentProfile
+from src.utils.field_selection import parse_fields, select_fields, selectable_fields, MAX_FIELDS
+
+
+def test_parse_fields_keeps_parent_over_nested_path():
+    assert parse_fields("name, education.department,education,name") == ["education", "name"]
+
+
+def test_parse_fields_empty():
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+
+
+@pytest.mark.parametrize("fields", ["name;drop", "$where", "a..b", ",".join(f"f{n}" for n in range(MAX_FIELDS + 1))])
+def test_parse_fields_rejects_invalid_input(fields):
+    with pytest.raises(HTTPException) as error:
+        parse_fields(fields)
+    assert error.value.status_code == 400
+
+
+def test_select_fields_follows_mongo_projection_rules():
+    data = {
+        "name": "王小明",
+        "education": {"department": "資工系", "program": "日間部"},
+        "records": [{"a": 1, "b": 2}, {"b": 3}, "scalar"],
+    }
+
+    assert select_fields(data, ["name", "education.department", "records.a"]) == {
+        "name": "王小明",
+        "education": {"department": "資工系"},
+        "records": [{"a": 1}, {}],
+    }
+    assert select_fields(data, None) is data
+
+
+def test_select_fields_missing_fields_yield_empty_object():
+    assert select_fields({"name": "王小明"}, ["nickname"]) == {}
+
+
+def test_selectable_fields_accepts_declared_and_nested_fields():
+    dependency = selectable_fields(StudentProfile)
+
+    assert dependency("name,education.department,education.class.teacher") == [
+        "education.class.teacher", "education.department", "name"
+    ]
+    assert dependency(None) is None
+
+
+@pytest.mark.parametrize("fields", ["nickname", "education.nickname", "education.class.nickname"])
+def test_selectable_fields_rejects_unknown_fields(fields):
+    with pytest.raises(HTTPException) as error:
+        selectable_fields(StudentProfile)(fields)
+    assert error.value.status_code == 400
+
+
+def test_selectable_fields_accepts_aliases():
+    assert selectable_fields(EnrollmentRecord)("class") == ["class"]
+
+
+def test_selectable_fields_accepts_fields_of_any_model():
+    dependency = selectable_fields(*GRADUATION_MODELS.values())
+    names = {name for model in GRADUATION_MODELS.values() for name in model.model_fields}
+
+    for name in names:
+        assert dependency(name) == [name]
+
+
+def test_selectable_fields_checks_nested_fields_across_models():
+    dependency = selectable_fields(*GRADUATION_MODELS.values())
+
+    assert dependency("data.year,data.t.smye") == ["data.t.smye", "data.year"]
+    with pytest.raises(HTTPException):
+        dependency("data.nickname")
+
+
+def test_cache_projection_without_matching_fields_is_still_a_hit():
+    pytest.importorskip("motor")
+    from src.utils.cache import CacheManager
+
+    assert CacheManager._projected_data({"_id": "F1234567"}, ["nickname"]) == {}
+    assert CacheManager._projected_data({"data": {"name": "王小明"}}, ["name"]) == {"name": "王小明"}
+    assert CacheManager._projected_data({"data": None}, None) is None
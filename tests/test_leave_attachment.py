@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("motor")
+pytest.importorskip("sis")
+
+from src.services.leave_service import LeaveService
+from src.utils.exception import OutOfFileSizeException, UnsupportedFileTypeException
+
+PNG = b"\x89PNG\r\n\x1a\n"
+PDF = b"%PDF-1.7\n"
+
+
+class FakeUpload:
+    """僅提供 read_attachment 使用的 UploadFile 介面"""
+
+    def __init__(self, content_type, content, filename="proof.png"):
+        self.content_type = content_type
+        self.filename = filename
+        self._content = content
+        self._offset = 0
+
+    async def read(self, size=-1):
+        end = len(self._content) if size < 0 else self._offset + size
+        chunk = self._content[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+
+def read(upload):
+    return asyncio.run(LeaveService.read_attachment(upload))
+
+
+def test_reads_matching_file():
+    content = PNG + b"\x00" * 1000
+
+    with read(FakeUpload("image/png", content)) as buffer:
+        assert buffer.read() == content
+        assert buffer.name.endswith(".png")
+
+
+def test_octet_stream_accepts_detected_type():
+    with read(FakeUpload("application/octet-stream", PDF + b"body", "proof.pdf")) as buffer:
+        assert buffer.read().startswith(PDF)
+
+
+def test_rejects_declared_type_not_allowed():
+    with pytest.raises(UnsupportedFileTypeException):
+        read(FakeUpload("text/plain", b"hello", "proof.txt"))
+
+
+def test_rejects_mismatched_signature():
+    with pytest.raises(UnsupportedFileTypeException):
+        read(FakeUpload("image/jpeg", PNG + b"\x00" * 10))
+
+
+def test_rejects_unrecognized_signature():
+    with pytest.raises(UnsupportedFileTypeException):
+        read(FakeUpload("application/octet-stream", b"MZ\x90\x00", "proof.exe"))
+
+
+def test_rejects_empty_file():
+    with pytest.raises(UnsupportedFileTypeException):
+        read(FakeUpload("image/png", b""))
+
+
+def test_accepts_file_at_size_limit():
+    content = PNG + b"\x00" * (LeaveService.MAX_FILE_SIZE - len(PNG))
+
+    with read(FakeUpload("image/png", content)) as buffer:
+        assert len(buffer.getvalue()) == LeaveService.MAX_FILE_SIZE
+
+
+def test_rejects_file_over_size_limit():
+    content = PNG + b"\x00" * (LeaveService.MAX_FILE_SIZE - len(PNG) + 1)
+
+    with pytest.raises(OutOfFileSizeException):
+        read(FakeUpload("image/png", content))
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+
+from pymongo.errors import CollectionInvalid
+
+from src.utils import local_cache as local_cache_module
+from src.utils.local_cache import CacheInvalidationBus, LocalCache
+
+KEY = LocalCache.key("course_timetable", "F1234567", {"year": 113, "semester": 1})
+OTHER = LocalCache.key("course_timetable", "F7654321")
+
+
+class FakeCursor:
+    def __init__(self, messages, error=None):
+        self.messages = list(messages)
+        self.error = error
+        self.alive = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.messages:
+            return self.messages.pop(0)
+        if self.error is not None:
+            raise self.error
+        self.alive = False
+        raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+
+class FakeCollection:
+    def __init__(self, cursors):
+        self.cursors = list(cursors)
+        self.inserted = []
+
+    def find(self, query, cursor_type=None):
+        return self.cursors.pop(0) if self.cursors else FakeCursor([])
+
+    async def insert_one(self, document):
+        self.inserted.append(document)
+
+
+class FakeDatabase(dict):
+    async def create_collection(self, name, capped=False, size=None):
+        raise CollectionInvalid(name)
+
+
+def make_bus(cursors=()):
+    cache = LocalCache(max_entries=2, ttl=60)
+    db = FakeDatabase({local_cache_module.INVALIDATION_COLLECTION: FakeCollection(cursors)})
+    return CacheInvalidationBus(db, cache, size=1024), cache
+
+
+def message(key, origin):
+    collection, student_id, year, semester = key
+    return {
+        "origin": origin,
+        "timestamp": 1.0,
+        "collection": collection,
+        "student_id": student_id,
+        "year": year,
+        "semester": semester,
+    }
+
+
+def test_key_normalizes_semester():
+    assert KEY == ("course_timetable", "F1234567", "113", "1")
+    assert OTHER == ("course_timetable", "F7654321", None, None)
+
+
+def test_inactive_cache_stores_nothing():
+    cache = LocalCache(max_entries=2, ttl=60)
+
+    cache.put(KEY, {"data": 1})
+    cache.active = True
+
+    assert cache.get(KEY) is None
+
+
+def test_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2, ttl=60)
+    cache.active = True
+    third = LocalCache.key("course_timetable", "F0000000")
+
+    cache.put(KEY, {"data": 1})
+    cache.put(OTHER, {"data": 2})
+    cache.get(KEY)
+    cache.put(third, {"data": 3})
+
+    assert cache.get(KEY) == {"data": 1}
+    assert cache.get(OTHER) is None
+    assert cache.get(third) == {"data": 3}
+
+
+def test_expires_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(local_cache_module.time, "monotonic", lambda: now[0])
+    cache = LocalCache(max_entries=2, ttl=5)
+    cache.active = True
+
+    cache.put(KEY, {"data": 1})
+    now[0] += 5
+
+    assert cache.get(KEY) is None
+
+
+def test_publish_before_start_evicts_locally():
+    bus, cache = make_bus()
+    cache.active = True
+    cache.put(KEY, {"data": 1})
+
+    bus.publish("course_timetable", "F1234567", {"year": "113", "semester": "1"})
+
+    assert cache.get(KEY) is None
+    assert bus.collection.inserted == []
+
+
+def test_listener_evicts_entries_written_by_other_workers():
+    async def scenario():
+        bus, cache = make_bus()
+        await bus.start()
+        await asyncio.sleep(0)
+        cache.put(KEY, {"data": 1})
+        cache.put(OTHER, {"data": 2})
+
+        bus.collection.cursors.append(FakeCursor([message(KEY, "other:1"), message(OTHER, bus.origin)]))
+        # 目前的 cursor 結束後，監聽迴圈於一秒後重新建立 cursor
+        await asyncio.sleep(1.1)
+        result = cache.get(KEY), cache.get(OTHER)
+
+        bus.publish_key(OTHER)
+        await bus.stop()
+        return result, bus.collection.inserted, cache.active
+
+    (remote, own), inserted, active = asyncio.run(scenario())
+
+    assert remote is None
+    assert own == {"data": 2}
+    assert [(doc["collection"], doc["student_id"]) for doc in inserted] == [OTHER[:2]]
+    assert active is False
+
+
+def test_listener_failure_disables_and_clears_cache():
+    async def scenario():
+        bus, cache = make_bus([FakeCursor([], error=RuntimeError("cursor killed"))])
+        cache.active = True
+        cache.put(KEY, {"data": 1})
+        await bus.start()
+        await asyncio.sleep(0.1)
+        state = cache.active, cache.get(KEY)
+        await bus.stop()
+        return state
+
+    assert asyncio.run(scenario()) == (False, None)
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from src.utils.pagination import RecordPageQuery
+
+
+def page_query(year=None, semester=None, cursor=None, limit=None):
+    return RecordPageQuery(year=year, semester=semester, cursor=cursor, limit=limit)
+
+
+def records():
+    return [
+        {"id": n, "t": {"smye": "112" if n < 3 else 113, "smty": n % 2 + 1}}
+        for n in range(6)
+    ]
+
+
+def collect_pages(make_query):
+    """依 next_cursor 逐頁取得，直到沒有下一頁"""
+    pages, cursor = [], None
+    while True:
+        data, cursor = make_query(cursor).paginate(records())
+        pages.append([record["id"] for record in data])
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_covers_every_record_once():
+    pages = collect_pages(lambda cursor: page_query(cursor=cursor, limit=2))
+
+    assert pages == [[0, 1], [2, 3], [4, 5]]
+
+
+def test_cursor_round_trip_with_filter():
+    pages = collect_pages(lambda cursor: page_query(semester="1", cursor=cursor, limit=2))
+
+    assert pages == [[0, 2], [4]]
+
+
+def test_year_filter_matches_string_and_int_terms():
+    data, cursor = page_query(year="113").paginate(records())
+
+    assert [record["id"] for record in data] == [3, 4, 5]
+    assert cursor is None
+
+
+def test_split_matches_paginate():
+    query = page_query(semester="2", cursor=0, limit=1)
+    # 資料庫端回傳的 (索引, 紀錄)，多取一筆用以判斷是否有下一頁
+    fetched = [(index, record) for index, record in enumerate(records())
+               if index > 0 and query.matches(record)][:query.limit + 1]
+
+    assert query.split(fetched) == query.paginate(records())
+
+
+def test_mongo_match_accepts_string_or_int():
+    assert page_query(year="113", semester="1").mongo_match() == {
+        "t.smye": {"$in": ["113", 113]},
+        "t.smty": {"$in": ["1", 1]},
+    }
+    assert page_query().mongo_match() == {}
+    assert not page_query().is_requested
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+pytest.importorskip("sis")
+pytest.importorskip("icloud")
+
+from pymongo.errors import DuplicateKeyError
+
+from src.config import settings
+from src.services import refresh_scheduler as scheduler_module
+from src.services.refresh_scheduler import RefreshScheduler, SCHEDULER_LOCK_COLLECTION
+
+
+class FakeLocks:
+    def __init__(self):
+        self.holder = None
+        self.expires = 0
+        self.writes = 0
+
+    async def find_one_and_update(self, query, update, upsert=False):
+        # 模擬 MongoDB：條件不符且 upsert 時以相同 _id 新增而衝突
+        self.writes += 1
+        fields = update["$set"]
+        now = fields["expires_timestamp"] - settings.REFRESH_LEASE_DURATION
+        if self.holder not in (None, fields["owner"]) and self.expires >= now:
+            raise DuplicateKeyError("lease held")
+        self.holder = fields["owner"]
+        self.expires = fields["expires_timestamp"]
+
+
+@pytest.fixture
+def locks(monkeypatch):
+    locks = FakeLocks()
+    monkeypatch.setattr(scheduler_module, "db", {SCHEDULER_LOCK_COLLECTION: locks})
+    return locks
+
+
+def scheduler(owner):
+    instance = RefreshScheduler()
+    instance.owner = owner
+    return instance
+
+
+@pytest.mark.parametrize("start, end, hour, expected", [
+    (1, 6, 1, True),
+    (1, 6, 6, False),
+    (23, 6, 23, True),
+    (23, 6, 3, True),
+    (23, 6, 12, False),
+])
+def test_off_peak_window(monkeypatch, start, end, hour, expected):
+    monkeypatch.setattr(settings, "REFRESH_OFF_PEAK_START_HOUR", start)
+    monkeypatch.setattr(settings, "REFRESH_OFF_PEAK_END_HOUR", end)
+
+    assert RefreshScheduler.is_off_peak(hour) is expected
+
+
+def test_only_one_worker_holds_the_lease(locks):
+    first, second = scheduler("a:1"), scheduler("b:2")
+
+    async def scenario():
+        return await first._acquire_lock(), await second._acquire_lock(), await first._acquire_lock()
+
+    assert asyncio.run(scenario()) == (True, False, True)
+
+
+def test_keep_lock_renews_only_after_half_the_lease(locks, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    worker = scheduler("a:1")
+
+    async def scenario():
+        await worker._acquire_lock()
+        kept = [await worker._keep_lock()]
+        now[0] += settings.REFRESH_LEASE_DURATION / 2
+        kept.append(await worker._keep_lock())
+        return kept
+
+    assert asyncio.run(scenario()) == [True, True]
+    assert locks.writes == 2
+
+
+def test_keep_lock_fails_once_lease_is_taken(locks, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    worker = scheduler("a:1")
+
+    async def scenario():
+        await worker._acquire_lock()
+        locks.holder, locks.expires = "b:2", 10 ** 12
+        now[0] += settings.REFRESH_LEASE_DURATION
+        return await worker._keep_lock()
+
+    assert asyncio.run(scenario()) is False
@@ -0,0 +1,44 @@
+import warnings
+from typing import List
+
+import pytest
+
+from src.models.response_data import DataResponse
+from src.models.student import DormRecord, PrinterPoint, RewardPenaltyRecord
+
+
+def dump(model):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        return model.model_dump(mode="json", exclude_unset=True, by_alias=True)
+
+
+@pytest.mark.parametrize("value", [92.5, "95%", "A"])
+def test_unconvertible_values_pass_through(value):
+    assert dump(PrinterPoint.model_validate({"point": value})) == {"point": value}
+
+
+def test_values_converted_to_declared_types():
+    record = RewardPenaltyRecord.model_validate({
+        "frequency": "2",
+        "reason": 123,
+        "t": {"smye": "112", "smty": "1"}
+    })
+
+    assert dump(record) == {"frequency": 2, "reason": "123", "t": {"smye": 112, "smty": 1}}
+
+
+def test_blank_numbers_become_null():
+    assert dump(PrinterPoint.model_validate({"point": " "})) == {"point": None}
+
+
+def test_undeclared_fields_are_kept():
+    record = DormRecord.model_validate({"dorm_space": "A 棟", "bed_no": "3", "extra": {"nested": [1]}})
+
+    assert dump(record) == {"dorm_space": "A 棟", "bed_no": "3", "extra": {"nested": [1]}}
+
+
+def test_response_wrapper_keeps_raw_list_items():
+    response = DataResponse[List[PrinterPoint]].model_validate({"data": [{"point": 92.5, "unit": "點"}]})
+
+    assert dump(response) == {"data": [{"point": 92.5, "unit": "點"}]}
@@ -0,0 +1,121 @@
+from datetime import datetime
+
+from src.utils.timetable_index import TimetableIndex
+
+PERIOD_TIMES = {
+    1: "08:10-09:00",
+    2: "09:10-10:00",
+    3: "10:10-11:00",
+    4: "11:10-12:00",
+}
+
+# 2024-01-01 為星期一
+MONDAY = datetime(2024, 1, 1)
+
+
+def course(week, period, course_id, classroom="A101", **fields):
+    return {"week": str(week), "period": str(period), "courseId": course_id, "classroom": classroom, **fields}
+
+
+def build(*entries):
+    return TimetableIndex(PERIOD_TIMES).build({"schedule": list(entries)})
+
+
+def test_build_merges_consecutive_periods_of_same_course():
+    index = build(
+        course(1, 2, "C1", scheduleName="微積分"),
+        course(1, 1, "C1", scheduleName="微積分"),
+        course(1, 3, "C2"),
+    )
+
+    assert [slot["periods"] for slot in index["days"]["1"]] == [[1, 2], [3]]
+    assert index["days"]["1"][0]["scheduleName"] == "微積分"
+
+
+def test_build_does_not_merge_across_gap_or_classroom():
+    index = build(
+        course(2, 1, "C1"),
+        course(2, 3, "C1"),
+        course(2, 4, "C1", classroom="B202"),
+    )
+
+    assert [slot["periods"] for slot in index["days"]["2"]] == [[1], [3], [4]]
+
+
+def test_build_skips_entries_without_week_or_period():
+    index = build(
+        course(1, 1, "C1"),
+        {"week": None, "period": "2", "courseId": "C2"},
+        {"week": "1", "period": "", "courseId": "C3"},
+    )
+
+    assert [slot["courseId"] for slot in index["days"]["1"]] == ["C1"]
+
+
+def test_build_groups_locations():
+    index = build(course(1, 1, "C1"), course(3, 2, "C2"), course(2, 1, "C3", classroom="B202"))
+
+    locations = {location["classroom"]: location["courses"] for location in index["locations"]}
+    assert [slot["courseId"] for slot in locations["A101"]] == ["C1", "C2"]
+    assert [slot["courseId"] for slot in locations["B202"]] == ["C3"]
+
+
+def test_build_empty_timetable():
+    assert TimetableIndex(PERIOD_TIMES).build(None) == {"days": {}, "locations": []}
+
+
+def test_today_lists_courses_and_free_periods():
+    timetable = TimetableIndex(PERIOD_TIMES)
+    index = build(course(1, 1, "C1"), course(1, 2, "C1"))
+
+    today = timetable.today(index, 1)
+
+    assert today["courses"][0]["start"] == "08:10"
+    assert today["courses"][0]["end"] == "10:00"
+    assert today["free_periods"] == [3, 4]
+
+
+def test_next_returns_later_course_today():
+    timetable = TimetableIndex(PERIOD_TIMES)
+    index = build(course(1, 1, "C1"), course(1, 3, "C2"))
+
+    upcoming = timetable.next(index, MONDAY.replace(hour=9, minute=30))
+
+    assert upcoming["courseId"] == "C2"
+    assert upcoming["days_ahead"] == 0
+
+
+def test_next_skips_course_already_started():
+    timetable = TimetableIndex(PERIOD_TIMES)
+    index = build(course(1, 1, "C1"), course(2, 1, "C2"))
+
+    upcoming = timetable.next(index, MONDAY.replace(hour=8, minute=10))
+
+    assert upcoming["courseId"] == "C2"
+    assert upcoming["days_ahead"] == 1
+
+
+def test_next_wraps_around_the_week():
+    timetable = TimetableIndex(PERIOD_TIMES)
+    index = build(course(1, 1, "C1"))
+
+    # 星期六，下一堂為下週一
+    upcoming = timetable.next(index, datetime(2024, 1, 6, 10, 0))
+    assert upcoming["courseId"] == "C1"
+    assert upcoming["days_ahead"] == 2
+
+    # 星期一的課已開始，下一堂為下週同一天
+    upcoming = timetable.next(index, MONDAY.replace(hour=12))
+    assert upcoming["days_ahead"] == 7
+
+
+def test_next_without_courses():
+    assert TimetableIndex(PERIOD_TIMES).next(build(), MONDAY) is None
+
+
+def test_location_lookup():
+    timetable = TimetableIndex(PERIOD_TIMES)
+    index = build(course(1, 4, "C1", classroom="B202"))
+
+    assert [slot["start"] for slot in timetable.location(index, "B202")] == ["11:10"]
+    assert timetable.location(index, "Z999") == []
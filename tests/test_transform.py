@@ -0,0 +1,138 @@
+import copy
+
+from src.utils.transform import RecordTransformer, SEMESTER_TERM
+
+
+# 改用 RecordTransformer 前於各服務中手寫的轉換迴圈
+
+def legacy_semester_term(data):
+    for i in data:
+        year = i['year']
+        sem = i['sem']
+        del i['sem']
+        del i['year']
+        i['t'] = {
+            "smye": year,
+            "smty": sem
+        }
+    return data
+
+
+def legacy_scholarship(data):
+    for i in data:
+        year = i['year']
+        sem = i['sem']
+        del i['sem']
+        del i['year']
+        i['t'] = {
+            "smye": year,
+            "smty": sem
+        }
+        del i['ship_pay']
+    return data
+
+
+def legacy_dorm(data):
+    for i in data:
+        year = i['year']
+        sem = i['sem']
+        del i['sem']
+        del i['year']
+        i['t'] = {
+            "smye": year,
+            "smty": sem
+        }
+        del i['elec_mon']
+        del i['dorm_elec_money']
+    return data
+
+
+def legacy_enrollment(data):
+    for i in data:
+        year = i['smye']
+        sem = i['smty']
+        del i['smye']
+        del i['smty']
+        i['t'] = {
+            "smye": year,
+            "smty": int(sem)
+        }
+    return data
+
+
+def legacy_graduation(data):
+    for i in data:
+        year = i['year']
+        sem = i['semester']
+        del i['year']
+        del i['semester']
+        i['t'] = {
+            "smye": int(year),
+            "smty": int(sem)
+        }
+    return data
+
+
+def assert_same(legacy, transformer, records):
+    expected = legacy(copy.deepcopy(records))
+    actual = transformer(copy.deepcopy(records))
+
+    assert actual == expected
+    # 欄位順序亦與原本相同，序列化結果不變
+    assert [list(record) for record in actual] == [list(record) for record in expected]
+
+
+def test_semester_term_matches_legacy():
+    records = [
+        {"name": "扭傷", "year": "112", "sem": "1"},
+        {"name": "擦傷", "year": "113", "sem": "2"},
+    ]
+    assert_same(legacy_semester_term, SEMESTER_TERM, records)
+
+
+def test_scholarship_matches_legacy():
+    transformer = RecordTransformer(nest={"t": {"smye": "year", "smty": "sem"}}, drops=("ship_pay",))
+    records = [{"ship_name": "獎學金", "ship_amount": 5000, "ship_pay": "Y", "year": "112", "sem": "1"}]
+    assert_same(legacy_scholarship, transformer, records)
+
+
+def test_dorm_matches_legacy():
+    transformer = RecordTransformer(
+        nest={"t": {"smye": "year", "smty": "sem"}},
+        drops=("elec_mon", "dorm_elec_money")
+    )
+    records = [{"dorm": "A101", "elec_mon": 3, "dorm_elec_money": 120, "year": "112", "sem": "2"}]
+    assert_same(legacy_dorm, transformer, records)
+
+
+def test_enrollment_cast_matches_legacy():
+    transformer = RecordTransformer(nest={"t": {"smye": "smye", "smty": "smty"}}, casts={"smty": int})
+    records = [{"status": "在學", "smye": "113", "smty": "1"}]
+    assert_same(legacy_enrollment, transformer, records)
+
+
+def test_graduation_casts_match_legacy():
+    transformer = RecordTransformer(
+        nest={"t": {"smye": "year", "smty": "semester"}},
+        casts={"year": int, "semester": int}
+    )
+    records = [{"title": "多益", "score": "800", "year": "111", "semester": "2"}]
+    assert_same(legacy_graduation, transformer, records)
+
+
+def test_renames_casts_and_drops():
+    transformer = RecordTransformer(renames={"old": "new"}, casts={"count": int}, drops=("missing", "secret"))
+
+    record = transformer.apply({"old": 1, "count": "3", "secret": "x"})
+
+    assert record == {"new": 1, "count": 3}
+
+
+def test_empty_records_returned_as_is():
+    assert SEMESTER_TERM(None) is None
+    assert SEMESTER_TERM([]) == []
+
+
+def test_records_modified_in_place():
+    records = [{"year": "112", "sem": "1"}]
+    assert SEMESTER_TERM(records) is records
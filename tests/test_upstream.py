@@ -0,0 +1,164 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("sis")
+
+from requests import RequestException
+
+from src.utils.upstream import AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitState, Upstream, UpstreamGuard
+
+
+def test_breaker_opens_after_failure_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_breaker_half_open_allows_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+
+    # 模擬冷卻時間已過
+    breaker.opened_at -= 31
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_probe_success_closes():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.opened_at -= 31
+
+    assert breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_breaker_half_open_probe_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    breaker.opened_at -= 31
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_limiter_rejects_beyond_limit():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=2, latency_threshold=1.0)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.cancel()
+    assert limiter.in_flight == 1
+    assert limiter.limit == 2
+
+
+def test_limiter_multiplicative_decrease_on_drop_or_slow_call():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=2, max_limit=16, latency_threshold=1.0)
+
+    limiter.try_acquire()
+    limiter.release(latency=0.1, dropped=True)
+    assert limiter.limit == 8
+
+    limiter.try_acquire()
+    limiter.release(latency=2.0, dropped=False)
+    assert limiter.limit == 4
+
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release(latency=0.1, dropped=True)
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+def test_limiter_additive_increase_up_to_max():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=4, latency_threshold=1.0)
+    limiter.limit = 2.0
+
+    # 約每個視窗（limit 次成功）加一
+    for _ in range(2):
+        limiter.try_acquire()
+        limiter.release(latency=0.1, dropped=False)
+    assert limiter.limit == pytest.approx(2.9)
+
+    for _ in range(100):
+        limiter.try_acquire()
+        limiter.release(latency=0.1, dropped=False)
+    assert limiter.limit == 4
+
+
+async def _cancel_half_open_probe(func):
+    """於半開狀態送出試探請求後取消等待，回傳執行緒結束後的斷路器"""
+    guard = UpstreamGuard(Upstream.SIS)
+    guard.breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    guard.breaker.record_failure()
+    guard.breaker.opened_at -= 31
+
+    release = threading.Event()
+    task = asyncio.create_task(guard.call(func, release))
+    await asyncio.sleep(0.05)
+    assert guard.breaker.state == CircuitState.HALF_OPEN
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    release.set()
+    for _ in range(100):
+        if guard.breaker.state != CircuitState.HALF_OPEN:
+            break
+        await asyncio.sleep(0.01)
+
+    return guard.breaker
+
+
+def test_cancelled_probe_success_closes_breaker():
+    def probe(release):
+        release.wait(5)
+        return "ok"
+
+    breaker = asyncio.run(_cancel_half_open_probe(probe))
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_cancelled_probe_failure_reopens_breaker():
+    def probe(release):
+        release.wait(5)
+        raise RequestException("connection reset")
+
+    breaker = asyncio.run(_cancel_half_open_probe(probe))
+
+    assert breaker.state == CircuitState.OPEN
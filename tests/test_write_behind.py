@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+
+from pymongo.errors import BulkWriteError
+
+from src.utils.write_behind import WriteBehindQueue
+
+
+class FakeCollection:
+    def __init__(self):
+        self.written = []
+        self.failures = []
+
+    async def bulk_write(self, operations, ordered=True):
+        failure = self.failures.pop(0) if self.failures else None
+        if isinstance(failure, Exception):
+            raise failure
+        failed = failure or set()
+        self.written.extend(operation for index, operation in enumerate(operations) if index not in failed)
+        if failed:
+            raise BulkWriteError({
+                "writeErrors": [{"index": index, "code": 10334, "errmsg": "document too large"} for index in failed]
+            })
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+def key(student_id):
+    return "course_timetable", student_id, None, None
+
+
+def make_queue(**kwargs):
+    flushed = []
+    queue = WriteBehindQueue(
+        FakeDatabase(),
+        flush_interval=60,
+        batch_size=10,
+        max_pending=kwargs.pop("max_pending", 100),
+        on_flushed=flushed.append,
+        **kwargs
+    )
+    return queue, flushed
+
+
+def run(scenario):
+    async def wrapper():
+        return await scenario()
+    return asyncio.run(wrapper())
+
+
+def enqueue(queue, student_id, value=1):
+    return queue.enqueue(key(student_id), {"_id": student_id}, {"data": value})
+
+
+def test_enqueue_requires_running_queue():
+    queue, _ = make_queue()
+
+    assert not enqueue(queue, "A")
+
+
+def test_pending_documents_readable_until_flushed():
+    async def scenario():
+        queue, flushed = make_queue()
+        queue.start()
+
+        assert enqueue(queue, "A", 1)
+        assert enqueue(queue, "A", 2)
+        assert queue.get(key("A")) == {"data": 2}
+
+        await queue.flush()
+
+        assert queue.get(key("A")) is None
+        assert flushed == [key("A")]
+        assert len(queue.db["course_timetable"].written) == 1
+        await queue.stop(1)
+
+    run(scenario)
+
+
+def test_full_queue_rejects_new_keys():
+    async def scenario():
+        queue, _ = make_queue(max_pending=1)
+        queue.start()
+
+        assert enqueue(queue, "A")
+        assert not enqueue(queue, "B")
+        # 已在佇列中的快取仍可更新
+        assert enqueue(queue, "A", 2)
+        await queue.stop(1)
+
+    run(scenario)
+
+
+def test_failed_operation_retried_then_dropped():
+    async def scenario():
+        queue, flushed = make_queue(max_attempts=3)
+        queue.start()
+        collection = queue.db["course_timetable"]
+        collection.failures = [{0}, {0}, {0}]
+
+        enqueue(queue, "A")
+        enqueue(queue, "B")
+
+        await queue.flush()
+        # 同批次的其他快取已寫入，失敗者留在佇列
+        assert flushed == [key("B")]
+        assert queue.get(key("A")) == {"data": 1}
+
+        await queue.flush()
+        assert queue.get(key("A")) == {"data": 1}
+
+        await queue.flush()
+        assert queue.get(key("A")) is None
+        assert flushed == [key("B"), key("A")]
+        assert len(collection.written) == 1
+        await queue.stop(1)
+
+    run(scenario)
+
+
+def test_transient_failure_requeued_and_raised():
+    async def scenario():
+        queue, flushed = make_queue()
+        queue.start()
+        queue.db["course_timetable"].failures = [ConnectionError("network down")]
+
+        enqueue(queue, "A")
+
+        with pytest.raises(ConnectionError):
+            await queue.flush()
+        assert queue.get(key("A")) == {"data": 1}
+
+        await queue.flush()
+        assert flushed == [key("A")]
+        await queue.stop(1)
+
+    run(scenario)
+
+
+def test_newer_document_resets_attempts():
+    async def scenario():
+        queue, _ = make_queue(max_attempts=2)
+        queue.start()
+        collection = queue.db["course_timetable"]
+        collection.failures = [{0}, {0}]
+
+        enqueue(queue, "A", 1)
+        await queue.flush()
+
+        # 新的文件重新計算失敗次數，不因舊文件的失敗而被捨棄
+        enqueue(queue, "A", 2)
+        await queue.flush()
+        assert queue.get(key("A")) == {"data": 2}
+
+        await queue.flush()
+        assert queue.get(key("A")) is None
+        assert len(collection.written) == 1
+        await queue.stop(1)
+
+    run(scenario)
+
+
+def test_stop_flushes_remaining():
+    async def scenario():
+        queue, flushed = make_queue()
+        queue.start()
+        enqueue(queue, "A")
+        enqueue(queue, "B")
+
+        await queue.stop(1)
+
+        assert sorted(flushed) == [key("A"), key("B")]
+        assert not queue.running
+
+    run(scenario)